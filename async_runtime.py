@@ -0,0 +1,230 @@
+import asyncio
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import tkinter as tk
+
+# Seconds between Tk event pumps (well under a frame, so input stays responsive)
+TK_PUMP_INTERVAL = 0.004
+
+# Number of recent frame timings kept by FrameScheduler
+FRAME_HISTORY = 600
+
+
+class FrameScheduler:
+    """Paces a coroutine game loop to a fixed frame rate
+
+    Frames are scheduled against absolute deadlines (start + n * period)
+    rather than "period after the last frame finished", so the time a frame
+    takes to simulate and draw doesn't push every later frame back. If the
+    loop falls more than a frame behind it resynchronizes instead of
+    running a burst of catch-up frames.
+    """
+
+    def __init__(self, fps=30):
+        """
+        Initialize the scheduler
+
+        Args:
+            fps: Target frames per second
+        """
+        self.period = 1.0 / fps
+        self.next_deadline = None
+
+        # Seconds each frame woke up after its deadline, and frames that missed it entirely
+        self.wake_delays = deque(maxlen=FRAME_HISTORY)
+        self.dropped_frames = 0
+
+    def reset(self):
+        """Start pacing from now (call after the loop has been stopped for a while)"""
+        self.next_deadline = None
+
+    async def next_frame(self):
+        """Wait for the next frame deadline"""
+        now = time.perf_counter()
+        if self.next_deadline is None:
+            self.next_deadline = now
+        self.next_deadline += self.period
+
+        delay = self.next_deadline - now
+        if delay < -self.period:
+            # Too far behind - drop the missed frames and start over from now
+            self.dropped_frames += int(-delay / self.period)
+            self.next_deadline = now
+            await asyncio.sleep(0)
+        elif delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+
+        self.wake_delays.append(max(0.0, time.perf_counter() - self.next_deadline))
+
+    def get_stats(self):
+        """
+        Summarize frame pacing
+
+        Returns:
+            dict: Frames measured, mean and max wake-up delay in milliseconds,
+                  and frames dropped
+        """
+        delays = [d * 1000 for d in self.wake_delays]
+        return {
+            'frames': len(delays),
+            'mean_delay_ms': sum(delays) / len(delays) if delays else 0.0,
+            'max_delay_ms': max(delays) if delays else 0.0,
+            'dropped_frames': self.dropped_frames
+        }
+
+
+class BackgroundJobs:
+    """Runs blocking work (file writes, model training) off the event loop
+
+    Jobs run on a dedicated worker thread by default (max_workers=1), so
+    they finish in submission order. An optional on_done callback is
+    called with the result on the loop thread, so it can safely swap the
+    result into objects the game loop is using. submit() may be called
+    from any thread (e.g. a SimulationWorker ending a game); asyncio
+    futures are only created on the loop thread.
+    """
+
+    def __init__(self, loop, max_workers=1):
+        """
+        Initialize the job runner
+
+        Args:
+            loop: asyncio event loop that owns the results
+            max_workers: Worker threads; with the default of one, jobs run
+                         in the order they were submitted
+        """
+        self.loop = loop
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='jobs')
+        self.pending = 0
+        self._pending_lock = threading.Lock()
+
+        # (job name, seconds) for recently finished jobs
+        self.job_times = deque(maxlen=100)
+
+    def submit(self, func, *args, on_done=None):
+        """
+        Run func(*args) on a worker thread
+
+        Args:
+            func: Blocking callable
+            *args: Arguments for func
+            on_done: Optional callable given the result on the loop thread
+                     (not called if the job raises)
+
+        Returns:
+            asyncio.Future resolving to func's result when called on the loop
+            thread; otherwise the concurrent.futures.Future of the job (wrap it
+            with asyncio.wrap_future on the loop to await it)
+        """
+        name = getattr(func, '__qualname__', repr(func))
+
+        def run():
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.job_times.append((name, time.perf_counter() - start))
+
+        with self._pending_lock:
+            self.pending += 1
+        job = self.executor.submit(run)
+        job.add_done_callback(lambda finished: self.loop.call_soon_threadsafe(
+            self._finish, name, finished, on_done))
+        if not self._on_loop_thread():
+            # asyncio futures aren't thread-safe: only the loop may create one
+            return job
+        return asyncio.wrap_future(job, loop=self.loop)
+
+    def _on_loop_thread(self):
+        """True if called from the thread running self.loop"""
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def _finish(self, name, job, on_done):
+        """Report a finished job on the loop thread"""
+        with self._pending_lock:
+            self.pending -= 1
+        error = job.exception()
+        if error is not None:
+            print(f"Error in background job {name}: {error}")
+            traceback.print_exception(type(error), error, error.__traceback__)
+        elif on_done is not None:
+            try:
+                on_done(job.result())
+            except Exception as e:
+                print(f"Error handling result of {name}: {e}")
+                traceback.print_exc()
+
+    def shutdown(self):
+        """Wait for every submitted job to finish"""
+        self.executor.shutdown(wait=True)
+
+
+class TkAsyncRuntime:
+    """Runs Tk inside an asyncio event loop on the main thread
+
+    A pump task processes pending Tk events every few milliseconds, so
+    root.after() callbacks, key bindings and redraws keep working while
+    coroutines (the presenter's game loop) and background jobs share the
+    same loop. Closing the window or calling stop() ends run().
+    """
+
+    def __init__(self, root, pump_interval=TK_PUMP_INTERVAL):
+        """
+        Initialize the runtime
+
+        Args:
+            root: Tk root window
+            pump_interval: Seconds between Tk event pumps
+        """
+        self.root = root
+        self.pump_interval = pump_interval
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.jobs = BackgroundJobs(self.loop)
+        self._stopped = None
+
+        self.root.protocol('WM_DELETE_WINDOW', self.stop)
+
+    def create_task(self, coro):
+        """Schedule a coroutine on the runtime's loop"""
+        return self.loop.create_task(coro)
+
+    def run(self):
+        """Run until the window is closed, then finish background jobs"""
+        try:
+            self.loop.run_until_complete(self._main())
+        finally:
+            self.jobs.shutdown()
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            self.loop.run_until_complete(asyncio.sleep(0))
+            self.loop.close()
+
+    def stop(self):
+        """Stop the runtime (safe to call from Tk callbacks)"""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def _main(self):
+        """Pump Tk events until stopped or the window goes away"""
+        self._stopped = asyncio.Event()
+        while not self._stopped.is_set():
+            try:
+                self.root.update()
+            except tk.TclError:
+                # Window destroyed
+                return
+            await asyncio.sleep(self.pump_interval)
+        try:
+            self.root.destroy()
+        except tk.TclError:
+            pass
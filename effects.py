@@ -1,141 +1,281 @@
-import pygame
 import math
-import random
+import numpy as np
+
+# Effects degrade to no-ops without pygame (state still updates, nothing is drawn)
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+# Particle palette - particles store an index into this list
+PARTICLE_COLORS = [
+    (255, 215, 0),   # Gold (coins)
+    (255, 68, 68)    # Red (obstacles)
+]
+COIN_PARTICLE_COLOR = 0
+OBSTACLE_PARTICLE_COLOR = 1
+
+# Sprite cache resolution
+MAX_PARTICLE_SIZE = 8    # Largest radius bucket in pixels
+ALPHA_BUCKETS = 16       # Number of distinct alpha levels
+
 
 class ParticleSystem:
-    """Handles particle effects for the game"""
+    """Handles particle effects for the game
+
+    Particles live in a fixed-capacity pool of parallel NumPy arrays. Live
+    particles are kept packed at the front of the arrays, so updates are a
+    handful of vectorized operations and expired particles are removed by
+    compacting the arrays in one pass. Drawing blits pre-rendered sprites
+    cached by (size bucket, color, alpha bucket) instead of creating a new
+    Surface per particle.
+    """
     
-    def __init__(self):
-        """Initialize the particle system"""
-        self.particles = []
-        pygame.init()
+    def __init__(self, capacity=16384, rng=None):
+        """
+        Initialize the particle system
+        
+        Args:
+            capacity: Maximum number of live particles; new particles are
+                      dropped once the pool is full
+            rng: NumPy Generator for particle randomness, e.g. the game's
+                 GameRNG.numpy('effects') stream; defaults to a fresh one
+        """
+        self.capacity = capacity
+        self.count = 0  # Live particles occupy indices [0, count)
+        
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.dx = np.zeros(capacity, dtype=np.float32)
+        self.dy = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.max_lifetime = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        self._arrays = (self.x, self.y, self.dx, self.dy, self.size,
+                        self.lifetime, self.max_lifetime, self.color)
+        
+        self.rng = rng if rng is not None else np.random.default_rng()
+        
+        # Pre-rendered sprites indexed by _sprite_key
+        self.sprites = [None] * (MAX_PARTICLE_SIZE * len(PARTICLE_COLORS) * ALPHA_BUCKETS)
+    
+    def __len__(self):
+        return self.count
     
     def create_coin_particles(self, x, y, count=10):
         """Create particles for coin collection effect"""
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 3)
-            size = random.uniform(2, 5)
-            lifetime = random.uniform(20, 40)
-            color = (255, 215, 0)  # Gold color
-            
-            particle = {
-                'x': x,
-                'y': y,
-                'dx': math.cos(angle) * speed,
-                'dy': math.sin(angle) * speed,
-                'size': size,
-                'lifetime': lifetime,
-                'max_lifetime': lifetime,
-                'color': color
-            }
-            self.particles.append(particle)
+        self._emit(x, y, count, (1, 3), (2, 5), (20, 40), COIN_PARTICLE_COLOR)
     
     def create_obstacle_particles(self, x, y, count=15):
         """Create particles for obstacle collision effect"""
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            size = random.uniform(3, 7)
-            lifetime = random.uniform(15, 30)
-            color = (255, 68, 68)  # Red color
-            
-            particle = {
-                'x': x,
-                'y': y,
-                'dx': math.cos(angle) * speed,
-                'dy': math.sin(angle) * speed,
-                'size': size,
-                'lifetime': lifetime,
-                'max_lifetime': lifetime,
-                'color': color
-            }
-            self.particles.append(particle)
+        self._emit(x, y, count, (2, 5), (3, 7), (15, 30), OBSTACLE_PARTICLE_COLOR)
+    
+    def _emit(self, x, y, count, speed_range, size_range, lifetime_range, color_index):
+        """Append a burst of particles to the pool with vectorized random draws"""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        
+        start = self.count
+        end = start + count
+        rng = self.rng
+        
+        angle = rng.uniform(0, 2 * math.pi, count)
+        speed = rng.uniform(speed_range[0], speed_range[1], count)
+        lifetime = rng.uniform(lifetime_range[0], lifetime_range[1], count)
+        
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.dx[start:end] = np.cos(angle) * speed
+        self.dy[start:end] = np.sin(angle) * speed
+        self.size[start:end] = rng.uniform(size_range[0], size_range[1], count)
+        self.lifetime[start:end] = lifetime
+        self.max_lifetime[start:end] = lifetime
+        self.color[start:end] = color_index
+        
+        self.count = end
     
     def update(self):
         """Update all particles"""
-        for particle in self.particles[:]:
-            particle['x'] += particle['dx']
-            particle['y'] += particle['dy']
-            particle['lifetime'] -= 1
+        n = self.count
+        if n == 0:
+            return
+        
+        self.x[:n] += self.dx[:n]
+        self.y[:n] += self.dy[:n]
+        self.lifetime[:n] -= 1
+        
+        # Compact the pool if any particles have expired
+        alive = self.lifetime[:n] > 0
+        live_count = int(np.count_nonzero(alive))
+        if live_count != n:
+            for array in self._arrays:
+                array[:live_count] = array[:n][alive]
+            self.count = live_count
+    
+    def clear(self):
+        """Remove all particles"""
+        self.count = 0
+    
+    def _get_sprite(self, key):
+        """Get (rendering on first use) the sprite for a cache key"""
+        sprite = self.sprites[key]
+        if sprite is None:
+            alpha_bucket = key % ALPHA_BUCKETS
+            color_index = (key // ALPHA_BUCKETS) % len(PARTICLE_COLORS)
+            radius = key // (ALPHA_BUCKETS * len(PARTICLE_COLORS)) + 1
+            alpha = min(255, alpha_bucket * (256 // ALPHA_BUCKETS) + (128 // ALPHA_BUCKETS))
             
-            # Remove particles that have expired
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*PARTICLE_COLORS[color_index], alpha), (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
     
     def draw(self, surface):
         """Draw all particles to the given surface"""
-        for particle in self.particles:
-            # Calculate alpha based on remaining lifetime
-            alpha = int(255 * (particle['lifetime'] / particle['max_lifetime']))
-            
-            # Create a surface for the particle with alpha
-            particle_surface = pygame.Surface((int(particle['size'] * 2), int(particle['size'] * 2)), pygame.SRCALPHA)
-            
-            # Draw the particle with alpha
-            pygame.draw.circle(
-                particle_surface, 
-                (*particle['color'], alpha), 
-                (int(particle['size']), int(particle['size'])), 
-                int(particle['size'])
-            )
-            
-            # Blit the particle surface to the main surface
-            surface.blit(particle_surface, (int(particle['x'] - particle['size']), int(particle['y'] - particle['size'])))
+        n = self.count
+        if n == 0 or pygame is None:
+            return
+        
+        # Calculate alpha based on remaining lifetime and bucket everything
+        alpha = self.lifetime[:n] / self.max_lifetime[:n]
+        alpha_bucket = np.minimum((alpha * ALPHA_BUCKETS).astype(np.int32), ALPHA_BUCKETS - 1)
+        radius = np.clip(self.size[:n].astype(np.int32), 1, MAX_PARTICLE_SIZE)
+        keys = ((radius - 1) * len(PARTICLE_COLORS) + self.color[:n]) * ALPHA_BUCKETS + alpha_bucket
+        
+        left = (self.x[:n] - radius).astype(np.int32)
+        top = (self.y[:n] - radius).astype(np.int32)
+        
+        get_sprite = self._get_sprite
+        surface.blits(
+            [(get_sprite(key), (px, py)) for key, px, py in zip(keys.tolist(), left.tolist(), top.tolist())],
+            doreturn=False
+        )
+
+
+class _Animation:
+    """State of one registered animation"""
+    __slots__ = ('name', 'frames', 'frame_duration', 'frame_count',
+                 'current_frame', 'timer', 'playing', 'loop')
+    
+    def __init__(self, name, frames, frame_duration):
+        self.name = name
+        self.frames = frames
+        self.frame_duration = max(1, frame_duration)
+        self.frame_count = len(frames)
+        self.current_frame = 0
+        self.timer = 0
+        self.playing = False
+        self.loop = True
 
 
 class AnimationManager:
-    """Manages animations for game elements"""
+    """Manages animations for game elements
+    
+    Animations are stored in a list and addressed by integer handles;
+    add_animation() returns the handle, and get_handle() resolves a name
+    once so per-frame calls skip the name lookup (names are still
+    accepted everywhere). Only playing animations are kept in the active
+    set, and update(steps) advances each of them by any number of
+    simulation steps in a single pass, so a render that follows several
+    fixed-timestep updates catches up in one call.
+    """
     
     def __init__(self):
         """Initialize the animation manager"""
-        self.animations = {}
+        self.animations = []  # Indexed by handle
+        self.handles = {}     # Name -> handle
+        self.active = set()   # Handles of playing animations
         
     def add_animation(self, name, frames, frame_duration=5):
-        """Add a new animation"""
-        self.animations[name] = {
-            'frames': frames,
-            'frame_duration': frame_duration,
-            'current_frame': 0,
-            'timer': 0,
-            'playing': False
-        }
-    
-    def play(self, name, loop=True):
-        """Start playing an animation"""
-        if name in self.animations:
-            self.animations[name]['playing'] = True
-            self.animations[name]['loop'] = loop
-    
-    def stop(self, name):
-        """Stop an animation"""
-        if name in self.animations:
-            self.animations[name]['playing'] = False
-            self.animations[name]['current_frame'] = 0
-            self.animations[name]['timer'] = 0
+        """
+        Add a new animation (or replace the frames of an existing one)
+        
+        Returns:
+            int: Handle for the animation
+        """
+        handle = self.handles.get(name)
+        animation = _Animation(name, frames, frame_duration)
+        if handle is None:
+            handle = len(self.animations)
+            self.animations.append(animation)
+            self.handles[name] = handle
+        else:
+            self.animations[handle] = animation
+            self.active.discard(handle)
+        return handle
     
-    def update(self):
-        """Update all animations"""
-        for name, anim in self.animations.items():
-            if anim['playing']:
-                anim['timer'] += 1
-                
-                if anim['timer'] >= anim['frame_duration']:
-                    anim['timer'] = 0
-                    anim['current_frame'] += 1
-                    
-                    if anim['current_frame'] >= len(anim['frames']):
-                        if anim['loop']:
-                            anim['current_frame'] = 0
-                        else:
-                            anim['playing'] = False
-                            anim['current_frame'] = len(anim['frames']) - 1
-    
-    def get_current_frame(self, name):
-        """Get the current frame of an animation"""
-        if name in self.animations and self.animations[name]['playing']:
-            frame_index = self.animations[name]['current_frame']
-            return self.animations[name]['frames'][frame_index]
+    def get_handle(self, name):
+        """Get the integer handle for an animation name, or None"""
+        return self.handles.get(name)
+    
+    def _resolve(self, animation):
+        """Turn a name or handle into a handle (None if unknown)"""
+        if isinstance(animation, int):
+            return animation if 0 <= animation < len(self.animations) else None
+        return self.handles.get(animation)
+    
+    def play(self, animation, loop=True):
+        """Start playing an animation (by name or handle)"""
+        handle = self._resolve(animation)
+        if handle is not None:
+            state = self.animations[handle]
+            state.playing = True
+            state.loop = loop
+            self.active.add(handle)
+    
+    def stop(self, animation):
+        """Stop an animation (by name or handle)"""
+        handle = self._resolve(animation)
+        if handle is not None:
+            state = self.animations[handle]
+            state.playing = False
+            state.current_frame = 0
+            state.timer = 0
+            self.active.discard(handle)
+    
+    def update(self, steps=1):
+        """
+        Advance all playing animations
+        
+        Args:
+            steps: Number of simulation steps elapsed since the last update
+        """
+        if steps <= 0 or not self.active:
+            return
+        
+        animations = self.animations
+        finished = None
+        for handle in self.active:
+            state = animations[handle]
+            elapsed = state.timer + steps
+            advance, state.timer = divmod(elapsed, state.frame_duration)
+            if not advance:
+                continue
+            
+            frame = state.current_frame + advance
+            if frame >= state.frame_count:
+                if state.loop:
+                    frame %= state.frame_count
+                else:
+                    frame = state.frame_count - 1
+                    state.playing = False
+                    state.timer = 0
+                    if finished is None:
+                        finished = []
+                    finished.append(handle)
+            state.current_frame = frame
+        
+        if finished:
+            self.active.difference_update(finished)
+    
+    def get_current_frame(self, animation):
+        """Get the current frame of a playing animation (by name or handle)"""
+        handle = self._resolve(animation)
+        if handle is not None and handle in self.active:
+            state = self.animations[handle]
+            return state.frames[state.current_frame]
         return None
 
 
@@ -174,7 +314,7 @@ class TransitionEffect:
     
     def draw(self, surface):
         """Draw the transition effect"""
-        if not self.active:
+        if not self.active or pygame is None:
             return
             
         progress_ratio = self.progress / self.duration
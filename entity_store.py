@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class EntityStore:
+    """Structure-of-arrays storage for obstacles or coins
+
+    Live entities occupy indices [0, count) of parallel id, lane and y
+    arrays, so movement, collision checks and removal are vectorized.
+    Iterating the store still yields (id, lane, y) tuples for code that
+    wants one entity at a time (the views, for example).
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Initialize an empty store
+
+        Args:
+            capacity: Initial capacity; the arrays grow automatically when full
+        """
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.lanes = np.zeros(capacity, dtype=np.int8)
+        self.ys = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        n = self.count
+        return zip(self.ids[:n].tolist(), self.lanes[:n].tolist(), self.ys[:n].tolist())
+
+    def _reserve(self, extra):
+        """Grow the arrays so that extra more entities fit"""
+        needed = self.count + extra
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('ids', 'lanes', 'ys'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def append(self, entity_id, lane, y):
+        """Add a single entity"""
+        self._reserve(1)
+        n = self.count
+        self.ids[n] = entity_id
+        self.lanes[n] = lane
+        self.ys[n] = y
+        self.count = n + 1
+
+    def bulk_insert(self, ids, lanes, ys):
+        """
+        Add several entities with one slice assignment per array
+
+        Args:
+            ids: Array of entity ids
+            lanes: Array of lanes
+            ys: Array of y positions
+        """
+        k = len(ids)
+        if k == 0:
+            return
+        self._reserve(k)
+        start = self.count
+        end = start + k
+        self.ids[start:end] = ids
+        self.lanes[start:end] = lanes
+        self.ys[start:end] = ys
+        self.count = end
+
+    def advance(self, dy):
+        """Move every entity down by dy"""
+        self.ys[:self.count] += dy
+
+    def keep(self, mask):
+        """
+        Keep only the entities where mask is True, preserving order
+
+        Args:
+            mask: Boolean array with one entry per live entity
+        """
+        kept = int(np.count_nonzero(mask))
+        if kept == self.count:
+            return
+        for array in (self.ids, self.lanes, self.ys):
+            array[:kept] = array[:self.count][mask]
+        self.count = kept
+
+    def clear(self):
+        """Remove all entities"""
+        self.count = 0
+
+    def copy(self):
+        """Return an independent copy of the store"""
+        clone = EntityStore(max(1, len(self.ids)))
+        clone.bulk_insert(self.ids[:self.count], self.lanes[:self.count], self.ys[:self.count])
+        return clone
@@ -0,0 +1,151 @@
+# Event types (indices into EVENT_NAMES)
+COIN_COLLECTED = 0
+COIN_MISSED = 1
+NEAR_MISS = 2
+COLLISION = 3
+OBSTACLE_AVOIDED = 4
+OBSTACLE_SPAWNED = 5
+COIN_SPAWNED = 6
+GAME_OVER = 7
+
+EVENT_NAMES = ('coin_collected', 'coin_missed', 'near_miss', 'collision',
+               'obstacle_avoided', 'obstacle_spawned', 'coin_spawned', 'game_over')
+
+
+class EventBuffer:
+    """One tick's worth of game events
+
+    Events are stored column-wise in preallocated parallel lists (type,
+    entity id, lane, value) plus a fill count, so emitting an event writes
+    four slots instead of creating an object, and the same lists are
+    reused every tick. Subscribers read the columns directly for indices
+    in range(len(buffer)). The meaning of value depends on the type (near
+    miss distance, coin value, ...) and is 0 otherwise.
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Initialize the buffer
+
+        Args:
+            capacity: Initial number of event slots (grows by doubling)
+        """
+        self.types = [0] * capacity
+        self.entity_ids = [0] * capacity
+        self.lanes = [0] * capacity
+        self.values = [0.0] * capacity
+        self.count = 0
+        self.tick = 0
+
+        # Events of each type in the buffer, so subscribers can skip quiet ticks
+        self.type_counts = [0] * len(EVENT_NAMES)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """Double the number of slots"""
+        extra = len(self.types)
+        self.types.extend([0] * extra)
+        self.entity_ids.extend([0] * extra)
+        self.lanes.extend([0] * extra)
+        self.values.extend([0.0] * extra)
+
+    def emit(self, event_type, entity_id=0, lane=0, value=0.0):
+        """Append one event"""
+        n = self.count
+        if n == len(self.types):
+            self._grow()
+        self.types[n] = event_type
+        self.entity_ids[n] = entity_id
+        self.lanes[n] = lane
+        self.values[n] = value
+        self.count = n + 1
+        self.type_counts[event_type] += 1
+
+    def emit_many(self, event_type, entity_ids, lanes, values=None):
+        """Append a batch of events of one type from parallel sequences"""
+        for i in range(len(entity_ids)):
+            self.emit(event_type, entity_ids[i], lanes[i], values[i] if values is not None else 0.0)
+
+    def has(self, event_type):
+        """True if the buffer holds at least one event of a type"""
+        return self.type_counts[event_type] > 0
+
+    def copy(self):
+        """Detached copy of the buffered events (for handing to another thread)"""
+        copied = EventBuffer(max(1, self.count))
+        n = self.count
+        copied.types[:n] = self.types[:n]
+        copied.entity_ids[:n] = self.entity_ids[:n]
+        copied.lanes[:n] = self.lanes[:n]
+        copied.values[:n] = self.values[:n]
+        copied.count = n
+        copied.tick = self.tick
+        copied.type_counts[:] = self.type_counts
+        return copied
+
+    def clear(self):
+        """Empty the buffer, keeping its slots for the next tick"""
+        self.count = 0
+        type_counts = self.type_counts
+        for i in range(len(type_counts)):
+            type_counts[i] = 0
+
+
+class EventBus:
+    """Collects a tick's events and hands them to subscribers in one batch
+
+    The model emits into the bus while it updates and calls dispatch()
+    once at the end of the tick; each subscriber is called once with the
+    whole EventBuffer rather than once per event. Subscribers run on
+    whichever thread steps the model, and must not keep a reference to the
+    buffer after returning since it is cleared and reused.
+    """
+
+    def __init__(self):
+        """Initialize the bus with an empty buffer and no subscribers"""
+        self.buffer = EventBuffer()
+        self.subscribers = []  # (handler, event types or None for all)
+        self.emit = self.buffer.emit
+        self.emit_many = self.buffer.emit_many
+
+    def subscribe(self, handler, event_types=None):
+        """
+        Register a handler for event batches
+
+        Args:
+            handler: Callable taking the EventBuffer
+            event_types: Types the handler cares about; it is only called on
+                         ticks that produced at least one of them. None means
+                         every tick with any events.
+        """
+        self.subscribers.append((handler, tuple(event_types) if event_types is not None else None))
+
+    def unsubscribe(self, handler):
+        """Remove a handler registered with subscribe()"""
+        self.subscribers = [(h, types) for h, types in self.subscribers if h != handler]
+
+    def dispatch(self, tick=0):
+        """
+        Deliver the buffered events to subscribers and clear the buffer
+
+        Args:
+            tick: Tick the events belong to (available as buffer.tick)
+        """
+        buffer = self.buffer
+        if not buffer.count:
+            return
+        buffer.tick = tick
+
+        type_counts = buffer.type_counts
+        try:
+            for handler, event_types in self.subscribers:
+                if event_types is not None and not any(type_counts[t] for t in event_types):
+                    continue
+                try:
+                    handler(buffer)
+                except Exception as e:
+                    print(f"Error in event handler {handler}: {e}")
+        finally:
+            buffer.clear()
@@ -3,236 +3,172 @@ import os
 import time
 
 from model import GameModel
-from view import GameView
+from view import GameView, BG_COLOR, UI_TEXT_COLOR
 from presenter import GamePresenter
+from screen_manager import ScreenManager
+from ui_manager import ModernUIManager
+from transition_pipeline import TransitionPipeline, blend_color
+from async_runtime import TkAsyncRuntime, FrameScheduler
+from sound_manager import SoundManager, PROCEDURAL_MUSIC
+
+IMAGES_DIR = os.path.join("assets", "images")
 
 class SwipeChaserGame:
-    def __init__(self):
+    def __init__(self, data_dir=None, persist=True):
+        """
+        Build the window, the screens and the one model, view and presenter
+
+        Args:
+            data_dir: Directory for player data (GameModel's default when None)
+            persist: Record finished games (off for benchmarks and tests)
+        """
         # Create the root window with custom styling
         self.root = tk.Tk()
         self.root.title('Swipe Chaser')
         self.root.resizable(False, False)
         self.root.configure(bg='#121212')  # Dark background
-        
+
         # Game state
         self.current_screen = "main_menu"
         self.game_running = False
-        
+
+        # All widgets come from the UI manager, which sets up the ttk styles once
+        # and starts decoding the bundled images in the background
+        self.ui = ModernUIManager(self.root)
+        self.ui.preload_directory(IMAGES_DIR)
+
+        # Every screen is built once up front and raised when needed
+        self.screens = ScreenManager(self.root)
+        self.screens.add_screen('main_menu', lambda parent: self.ui.create_main_menu(
+            parent, self.start_game, exit_callback=self.quit))
+        self.screens.add_screen('countdown', self.ui.create_countdown)
+        self.screens.add_screen('game', self._build_game_screen)
+        self.screens.add_overlay('pause', 'game', lambda parent: self.ui.create_pause_menu(
+            parent, self.toggle_pause, self.show_main_menu),
+                                 relx=0.5, rely=0.5, anchor=tk.CENTER, relwidth=0.8, relheight=0.6)
+        self.countdown_label = self.ui.labels['countdown']
+
+        # Tk runs inside an asyncio loop so saves and training can run as background jobs
+        self.runtime = TkAsyncRuntime(self.root)
+
+        # One model, view and presenter for the whole process
+        self.model = GameModel(persist=persist, data_dir=data_dir)
+        self.model.use_background_jobs(self.runtime.jobs)
+        self.view = GameView(self.root, canvas=self.canvas)
+        # Sound effects and procedural music (silent when there is no audio device)
+        self.sound = SoundManager()
+        self.sound.create_default_sounds()
+        self.presenter = GamePresenter(self.model, self.view, self.root, sound_manager=self.sound,
+                                       on_menu=self.show_main_menu,
+                                       frame_scheduler=FrameScheduler(fps=30), loop=self.runtime.loop)
+
+        # Key bindings (the presenter binds the game keys itself; games start
+        # from the menu's Play button, so it doesn't bind Space)
+        self.root.bind('<Escape>', lambda e: self.toggle_pause())
+
+        # Countdown -> fade -> game start
+        self.transition = TransitionPipeline(self.root, on_countdown=self._set_countdown_text,
+                                             on_fade=self._fade_countdown,
+                                             on_complete=self.prepare_game_screen)
+
         # Create main menu
         self.show_main_menu()
-    
+
+    def _build_game_screen(self, parent):
+        """Build the game screen around the single game canvas"""
+        game_frame, self.canvas = self.ui.create_game_screen(parent)
+        return game_frame
+
     def show_main_menu(self):
         """Display the main menu"""
         self.current_screen = "main_menu"
         self.game_running = False
-        
-        # Clear the root window
-        for widget in self.root.winfo_children():
-            widget.destroy()
-            
-        # Create a frame for the menu
-        menu_frame = tk.Frame(self.root, bg='#121212', padx=20, pady=20)
-        menu_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Title
-        title_label = tk.Label(menu_frame, text="SWIPE CHASER", 
-                             font=("Arial", 24, "bold"),
-                             fg="#FFD700", bg="#121212")
-        title_label.pack(pady=(30, 50))
-        
-        # Buttons container
-        button_frame = tk.Frame(menu_frame, bg='#121212')
-        button_frame.pack(pady=10)
-        
-        # Create styled buttons
-        button_style = {
-            'font': ('Arial', 12, 'bold'),
-            'width': 20,
-            'bd': 1,
-            'relief': tk.RAISED,
-            'padx': 10,
-            'pady': 5
-        }
-        
-        start_button = tk.Button(button_frame, text="START GAME", 
-                               bg='#FFD700', fg='#000000',
-                               activebackground='#D4AF37', activeforeground='#000000',
-                               command=self.start_game, **button_style)
-        start_button.pack(pady=10)
-        
-        exit_button = tk.Button(button_frame, text="EXIT", 
-                              bg='#FFD700', fg='#000000',
-                              activebackground='#D4AF37', activeforeground='#000000',
-                              command=self.root.quit, **button_style)
-        exit_button.pack(pady=10)
-        
-        # Version info
-        version_label = tk.Label(menu_frame, text="v1.0.0", 
-                               font=("Arial", 10),
-                               fg="#FFD700", bg="#121212")
-        version_label.pack(side=tk.BOTTOM, pady=10)
-    
+
+        # Stop the game loop and drop any game in progress
+        self.transition.cancel()
+        self.presenter.stop()
+        self.presenter.paused = False
+        self.model.quit_to_menu()
+        self.sound.stop_music()
+
+        self.screens.show('main_menu')
+
     def start_game(self):
-        """Initialize the game components"""
-        # Clear the root window
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
-        # Create game canvas
-        self.canvas = tk.Canvas(self.root, width=400, height=600, bg='#121212')
-        self.canvas.pack()
-        
-        # Create the MVP components
-        self.model = GameModel()
-        self.view = GameView(self.root, canvas=self.canvas)
-        
-        # Create presenter
-        self.presenter = GamePresenter(
-            self.model, 
-            self.view, 
-            self.root
-        )
-        
-        # Start the game loop
-        self.presenter.update()
-    
-    def show_countdown(self, callback):
-        """Show a countdown on a separate screen"""
-        # Clear the entire window first
-        for widget in self.root.winfo_children():
-            widget.destroy()
-            
-        # Create a full-screen canvas for the countdown
-        countdown_canvas = tk.Canvas(self.root, width=400, height=600, bg='#121212')
-        countdown_canvas.pack(fill=tk.BOTH, expand=True)
-        
-        # Create a large centered countdown label
-        countdown_label = tk.Label(self.root, text="3", 
-                                 font=("Arial", 120, "bold"),
-                                 fg="#FFD700", bg="#121212")
-        countdown_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
-        
-        # Make sure the countdown is visible on top
-        self.root.update()
-        
-        def update_countdown(count):
-            if count > 0:
-                countdown_label.config(text=str(count))
-                self.root.after(1000, update_countdown, count-1)
-            else:
-                countdown_label.config(text="GO!")
-                self.root.after(800, lambda: self.prepare_game_screen(callback))
-        
-        # Start the countdown
-        update_countdown(3)
-        
-    def prepare_game_screen(self, callback):
-        """Prepare the game screen after countdown"""
-        # Clear the countdown screen
-        for widget in self.root.winfo_children():
-            widget.destroy()
-            
-        # Create game canvas
-        self.canvas = tk.Canvas(self.root, width=400, height=600, bg='#121212')
-        self.canvas.pack()
-        
-        # Create the MVP components
-        self.model = GameModel()
-        self.view = GameView(self.root, canvas=self.canvas)
-        self.presenter = GamePresenter(self.model, self.view, self.root)
-        
-        # Set up key bindings
-        self.root.bind('<Left>', self.presenter.handle_left)
-        self.root.bind('<Right>', self.presenter.handle_right)
-        self.root.bind('r', self.presenter.handle_restart)
-        self.root.bind('R', self.presenter.handle_restart)
-        self.root.bind('m', self.presenter.handle_menu)
-        self.root.bind('M', self.presenter.handle_menu)
-        self.root.bind('<space>', self.presenter.handle_space)
-        self.root.bind('<Escape>', lambda e: self.toggle_pause())
-        
-        # Important: Start the game BEFORE calling the callback
+        """Start a new game from the main menu"""
+        if not self.transition.active:
+            self.show_countdown()
+
+    def show_countdown(self):
+        """Show the countdown screen and get the game ready behind it"""
+        self.current_screen = "countdown"
+        self.presenter.stop()
+        self.countdown_label.config(text="3", foreground=UI_TEXT_COLOR)
+        self.screens.show('countdown')
+
+        # Everything the first frame needs, done while the countdown runs
+        self.transition.start([
+            ('model', self.model.prepare_game),
+            ('images', self.ui.finish_preload),
+            ('first_frame', lambda: self.view.draw_game_screen(self.model))
+        ])
+
+    def _set_countdown_text(self, text):
+        """Show a countdown step"""
+        self.countdown_label.config(text=text)
+
+    def _fade_countdown(self, progress):
+        """Fade the countdown text into the background"""
+        self.countdown_label.config(foreground=blend_color(UI_TEXT_COLOR, BG_COLOR, progress))
+
+    def prepare_game_screen(self):
+        """Start the game once the countdown has faded out"""
+        # Start the game BEFORE showing the screen so the first frame is a game frame
         self.model.start_game()  # This sets game_state to "playing"
-        
+
         # Set game state variables
         self.current_screen = "game"
         self.game_running = True
-        
+        self.presenter.paused = False
+
+        self.screens.show('game')
+        self.canvas.focus_set()
+
+        # The presenter keeps the music tempo in step with the difficulty speed
+        self.sound.play_music(PROCEDURAL_MUSIC)
+
         # Start the game loop
-        self.presenter.update()
-        
-        # Call the callback if needed
-        # callback()  # We don't need this anymore
-    
-    def begin_game(self):
-        """Begin the game after countdown"""
-        self.current_screen = "game"
-        self.game_running = True
-        
-        # Set up pause key
-        self.root.bind('<Escape>', lambda e: self.toggle_pause())
-        
-        # Start the game
-        self.presenter.update()
-    
+        self.presenter.start()
+
+    def quit(self):
+        """Close the game (pending saves finish before the process exits)"""
+        self.presenter.stop()
+        self.sound.shutdown()
+        self.runtime.stop()
+
     def toggle_pause(self):
         """Toggle game pause state"""
         if not self.game_running:
             return
-            
-        if hasattr(self, 'pause_menu'):
+
+        if self.screens.is_overlay_visible('pause'):
             # Resume game
-            self.pause_menu.destroy()
-            delattr(self, 'pause_menu')
+            self.screens.hide_overlay('pause')
             self.presenter.paused = False
+            self.sound.unpause_music()
         else:
             # Pause game
             self.presenter.paused = True
-            
-            # Create pause menu
-            self.pause_menu = tk.Frame(self.canvas, bg='#333333', bd=2, relief=tk.RAISED)
-            self.pause_menu.place(relx=0.5, rely=0.5, anchor=tk.CENTER, 
-                                relwidth=0.8, relheight=0.6)
-            
-            # Pause text
-            pause_label = tk.Label(self.pause_menu, text="PAUSED", 
-                                 font=("Arial", 24, "bold"),
-                                 fg="#FFD700", bg="#333333")
-            pause_label.pack(pady=(30, 50))
-            
-            # Buttons
-            button_frame = tk.Frame(self.pause_menu, bg='#333333')
-            button_frame.pack(pady=10)
-            
-            button_style = {
-                'font': ('Arial', 12, 'bold'),
-                'width': 15,
-                'bd': 1,
-                'relief': tk.RAISED,
-                'padx': 10,
-                'pady': 5
-            }
-            
-            resume_button = tk.Button(button_frame, text="RESUME", 
-                                   bg='#333333', fg='#FFD700',
-                                   activebackground='#444444', activeforeground='#FFFFFF',
-                                   command=self.toggle_pause, **button_style)
-            resume_button.pack(pady=10)
-            
-            menu_button = tk.Button(button_frame, text="MAIN MENU", 
-                                  bg='#333333', fg='#FFD700',
-                                  activebackground='#444444', activeforeground='#FFFFFF',
-                                  command=self.show_main_menu, **button_style)
-            menu_button.pack(pady=10)
+            self.sound.pause_music()
+            self.screens.show_overlay('pause')
 
 def main():
     # Create assets directory if it doesn't exist
-    os.makedirs("assets/images", exist_ok=True)
-    
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+
     # Start the game
     global game  # Make the game instance globally accessible
     game = SwipeChaserGame()
-    game.root.mainloop()
+    game.runtime.run()
 
 if __name__ == '__main__':
     main()
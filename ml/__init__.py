@@ -5,5 +5,6 @@ Provides dynamic difficulty adjustment based on player performance
 from .player_profiler import PlayerProfiler
 from .difficulty_model import DifficultyModel
 from .data_store import PlayerDataStore
+from .analytics import SessionArchive
 
-__all__ = ['PlayerProfiler', 'DifficultyModel', 'PlayerDataStore']
+__all__ = ['PlayerProfiler', 'DifficultyModel', 'PlayerDataStore', 'SessionArchive']
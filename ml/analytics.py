@@ -0,0 +1,299 @@
+"""
+Columnar session archive for Swipe Chaser
+Exports difficulty history records to column files for fast aggregate queries
+"""
+import os
+import glob
+import threading
+
+import numpy as np
+
+from render_backend import DIFFICULTY_LEVELS, PARAM_NAMES, get_difficulty_level
+
+# Optional columnar backends: Parquet through pyarrow, DataFrames through pandas
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Per-record metrics (PlayerProfiler.get_metrics) and difficulty parameters, one column each
+METRIC_NAMES = ('reaction_time', 'near_miss_distance', 'coin_collection_rate',
+                'lane_changes_per_minute', 'obstacles_avoided', 'play_time')
+
+# The level column holds an index into DIFFICULTY_LEVELS
+COLUMNS = (['timestamp', 'score', 'duration', 'level'] +
+           ['metric_' + name for name in METRIC_NAMES] +
+           ['param_' + name for name in PARAM_NAMES])
+
+COLUMN_DTYPES = dict(
+    {'timestamp': np.float64, 'score': np.int64, 'duration': np.float64, 'level': np.int8},
+    **{column: np.float64 for column in COLUMNS[4:]}
+)
+
+# Sessions per chunk file. Must not exceed the records PlayerDataStore keeps in
+# difficulty_history, which doubles as the buffer for the chunk being filled.
+CHUNK_ROWS = 16
+
+FORMATS = ('parquet', 'npy', 'csv')
+
+
+def records_to_columns(records):
+    """
+    Flatten difficulty history records into columns
+
+    Args:
+        records: Records from PlayerDataStore.add_difficulty_record
+
+    Returns:
+        dict: Column name -> NumPy array (missing metrics and parameters are NaN)
+    """
+    columns = {column: np.empty(len(records), dtype=dtype) for column, dtype in COLUMN_DTYPES.items()}
+    for row, record in enumerate(records):
+        metrics = record.get('metrics') or {}
+        params = record.get('params') or {}
+        columns['timestamp'][row] = record.get('timestamp', 0.0)
+        columns['score'][row] = record.get('score', 0)
+        columns['duration'][row] = record.get('duration', 0.0)
+        columns['level'][row] = DIFFICULTY_LEVELS.index(get_difficulty_level(params))
+        for name in METRIC_NAMES:
+            columns['metric_' + name][row] = metrics.get(name, np.nan)
+        for name in PARAM_NAMES:
+            columns['param_' + name][row] = params.get(name, np.nan)
+    return columns
+
+
+class SessionArchive:
+    def __init__(self, directory, fmt=None, chunk_rows=CHUNK_ROWS):
+        """
+        Initialize the archive
+
+        Sessions are buffered and written chunk_rows at a time, each chunk
+        as its own file, so appending never rewrites earlier sessions.
+
+        Args:
+            directory: Directory holding the chunk files (created on first write)
+            fmt: 'parquet', 'npy' (one .npy file per column, memory-mapped
+                 on read) or 'csv'; Parquet when pyarrow is installed,
+                 otherwise npy
+            chunk_rows: Sessions per chunk
+        """
+        if fmt is None:
+            fmt = 'parquet' if pq is not None else 'npy'
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown archive format: {fmt}")
+        if fmt == 'parquet' and pq is None:
+            raise ValueError("Parquet archives need pyarrow")
+
+        self.directory = directory
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+
+        # Records not written to a chunk yet
+        self.pending = []
+        # Chunks handed to a background job but not written yet: path -> (records, columns)
+        self.in_flight = {}
+        # Guards pending and in_flight: games end on the simulation thread,
+        # background writes finish on the loop thread
+        self._lock = threading.Lock()
+        paths = self.chunk_paths()
+        # Number after the newest chunk (a failed write leaves a gap, so don't count files)
+        self.next_chunk = int(os.path.basename(paths[-1])[6:12]) + 1 if paths else 0
+        timestamps = self.read_columns(['timestamp'], include_pending=False)['timestamp']
+        self.last_timestamp = float(timestamps.max()) if len(timestamps) else 0.0
+
+        # Optional async_runtime.BackgroundJobs; when set, chunks are written on a worker thread
+        self.jobs = None
+
+    def chunk_paths(self):
+        """Paths of the written chunks, oldest first (any format)"""
+        return sorted(glob.glob(os.path.join(self.directory, 'chunk_[0-9]*')))
+
+    def append(self, records):
+        """
+        Add session records, writing a chunk whenever chunk_rows are buffered
+
+        Args:
+            records: Records from PlayerDataStore.add_difficulty_record
+        """
+        for record in records:
+            self.pending.append(record)
+            self.last_timestamp = max(self.last_timestamp, record.get('timestamp', 0.0))
+            if len(self.pending) >= self.chunk_rows:
+                self.flush()
+
+    def catch_up(self, records):
+        """
+        Buffer the records that are newer than everything archived
+
+        Restores the unwritten part of the last chunk after a restart.
+
+        Args:
+            records: PlayerDataStore difficulty_history
+        """
+        self.append([record for record in records
+                     if record.get('timestamp', 0.0) > self.last_timestamp])
+
+    def flush(self):
+        """
+        Write the buffered records as a new chunk
+
+        With background jobs the chunk stays readable (see iter_chunks) until
+        its write lands. Records whose chunk failed to write go back into the
+        buffer for the next chunk.
+        """
+        with self._lock:
+            if not self.pending:
+                return
+            records, self.pending = self.pending, []
+            path = os.path.join(self.directory, f'chunk_{self.next_chunk:06d}')
+            if self.fmt != 'npy':
+                path += '.' + self.fmt
+            self.next_chunk += 1
+            columns = records_to_columns(records)
+            if self.jobs is not None:
+                self.in_flight[path] = (records, columns)
+
+        if self.jobs is not None:
+            return self.jobs.submit(self._write_chunk, path, columns,
+                                    on_done=lambda written: self._chunk_done(path, written))
+        written = self._write_chunk(path, columns)
+        if not written:
+            with self._lock:
+                self.pending[:0] = records
+        return written
+
+    def _chunk_done(self, path, written):
+        """Retire a background chunk write, keeping its records if it failed (loop thread)"""
+        with self._lock:
+            records, _ = self.in_flight.pop(path)
+            if not written:
+                self.pending[:0] = records
+
+    def _write_chunk(self, path, columns):
+        """Write one chunk, moving it into place in one step"""
+        temp_path = os.path.join(os.path.dirname(path), '.tmp_' + os.path.basename(path))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.fmt == 'parquet':
+                pq.write_table(pa.table(columns), temp_path)
+            elif self.fmt == 'csv':
+                with open(temp_path, 'w') as f:
+                    f.write(','.join(COLUMNS) + '\n')
+                    for row in zip(*(columns[column].tolist() for column in COLUMNS)):
+                        f.write(','.join(repr(value) for value in row) + '\n')
+            else:
+                os.makedirs(temp_path)
+                for column, values in columns.items():
+                    np.save(os.path.join(temp_path, column + '.npy'), values)
+            os.replace(temp_path, path)
+            return True
+        except Exception as e:
+            print(f"Error writing session chunk: {e}")
+            return False
+
+    def _read_chunk(self, path, columns):
+        """Read some columns of one chunk, memory-mapped where the format allows"""
+        if path.endswith('.parquet'):
+            if pq is None:
+                raise ValueError(f"Reading {path} needs pyarrow")
+            table = pq.read_table(path, columns=columns, memory_map=True)
+            return {column: table.column(column).to_numpy() for column in columns}
+        if path.endswith('.csv'):
+            data = np.genfromtxt(path, delimiter=',', names=True, dtype=None, encoding=None,
+                                 usecols=[COLUMNS.index(column) for column in columns])
+            data = np.atleast_1d(data)
+            return {column: data[column].astype(COLUMN_DTYPES[column]) for column in columns}
+        return {column: np.load(os.path.join(path, column + '.npy'), mmap_mode='r')
+                for column in columns}
+
+    def iter_chunks(self, columns=None, include_pending=True):
+        """
+        Iterate the archive one chunk at a time
+
+        Chunks still being written in the background are yielded from memory.
+
+        Args:
+            columns: Column names to read (all by default)
+            include_pending: Also yield the records not written yet
+
+        Yields:
+            dict: Column name -> array for one chunk
+        """
+        columns = list(columns or COLUMNS)
+        with self._lock:
+            in_flight = {path: chunk for path, (_, chunk) in self.in_flight.items()}
+            pending = list(self.pending)
+        # A chunk written since the snapshot is on disk and in in_flight; read it once
+        for path in sorted(set(self.chunk_paths()) | set(in_flight)):
+            if path in in_flight:
+                yield {column: in_flight[path][column] for column in columns}
+            else:
+                yield self._read_chunk(path, columns)
+        if include_pending and pending:
+            pending = records_to_columns(pending)
+            yield {column: pending[column] for column in columns}
+
+    def read_columns(self, columns=None, include_pending=True):
+        """
+        Read whole columns across every chunk
+
+        Args:
+            columns: Column names to read (all by default)
+            include_pending: Include the records not written yet
+
+        Returns:
+            dict: Column name -> array
+        """
+        columns = list(columns or COLUMNS)
+        chunks = list(self.iter_chunks(columns, include_pending))
+        if len(chunks) == 1:
+            return chunks[0]
+        return {column: np.concatenate([chunk[column] for chunk in chunks]) if chunks
+                else np.empty(0, dtype=COLUMN_DTYPES[column])
+                for column in columns}
+
+    def mean_by_level(self, column='metric_reaction_time'):
+        """
+        Mean of a column for each difficulty level, computed chunk by chunk
+
+        Args:
+            column: Column to average
+
+        Returns:
+            dict: Level name -> {'sessions': count, 'mean': mean} for the
+                  levels with at least one session (NaN values are skipped)
+        """
+        counts = np.zeros(len(DIFFICULTY_LEVELS), dtype=np.int64)
+        sums = np.zeros(len(DIFFICULTY_LEVELS))
+        for chunk in self.iter_chunks(['level', column]):
+            values = np.asarray(chunk[column], dtype=np.float64)
+            present = ~np.isnan(values)
+            levels = np.asarray(chunk['level'], dtype=np.int64)[present]
+            counts += np.bincount(levels, minlength=len(DIFFICULTY_LEVELS))
+            sums += np.bincount(levels, weights=values[present], minlength=len(DIFFICULTY_LEVELS))
+        return {level: {'sessions': int(counts[i]), 'mean': float(sums[i] / counts[i])}
+                for i, level in enumerate(DIFFICULTY_LEVELS) if counts[i]}
+
+    def to_dataframe(self, columns=None):
+        """
+        Load the archive as a pandas DataFrame
+
+        Args:
+            columns: Column names to load (all by default)
+
+        Returns:
+            pandas.DataFrame: One row per session, with a categorical level column
+        """
+        if pd is None:
+            raise ValueError("to_dataframe needs pandas")
+        data = self.read_columns(columns)
+        frame = pd.DataFrame({column: np.asarray(values) for column, values in data.items()})
+        if 'level' in frame:
+            frame['level'] = pd.Categorical.from_codes(frame['level'], categories=DIFFICULTY_LEVELS, ordered=True)
+        return frame
@@ -7,6 +7,11 @@ import json
 import time
 import joblib
 
+from .analytics import SessionArchive
+
+# Difficulty history records kept in player_data.json (the archive keeps every session)
+DIFFICULTY_HISTORY_LIMIT = 20
+
 class PlayerDataStore:
     def __init__(self, data_dir='./data'):
         """
@@ -25,6 +30,14 @@ class PlayerDataStore:
         
         # Load player data if it exists
         self.player_data = self._load_player_data()
+        
+        # Columnar archive of every session's difficulty record (data/sessions);
+        # records newer than its last chunk are still in difficulty_history
+        self.archive = SessionArchive(os.path.join(data_dir, 'sessions'))
+        self.archive.catch_up(self.player_data['difficulty_history'])
+        
+        # Optional async_runtime.BackgroundJobs; when set, saves don't block the caller
+        self.jobs = None
     
     def _load_player_data(self):
         """Load player data from disk"""
@@ -46,10 +59,33 @@ class PlayerDataStore:
         }
     
     def save_player_data(self):
-        """Save player data to disk"""
+        """
+        Save player data to disk
+        
+        With background jobs set (see jobs), the data is serialized now and
+        written on a worker thread.
+        
+        Returns:
+            bool or awaitable: Whether the save succeeded, or the pending
+                               write job when saving in the background
+        """
+        try:
+            data = json.dumps(self.player_data)
+        except Exception as e:
+            print(f"Error saving player data: {e}")
+            return False
+        
+        if self.jobs is not None:
+            return self.jobs.submit(self._write_player_data, data)
+        return self._write_player_data(data)
+    
+    def _write_player_data(self, data):
+        """Write serialized player data, replacing the file in one step"""
+        temp_file = self.player_data_file + '.tmp'
         try:
-            with open(self.player_data_file, 'w') as f:
-                json.dump(self.player_data, f)
+            with open(temp_file, 'w') as f:
+                f.write(data)
+            os.replace(temp_file, self.player_data_file)
             return True
         except Exception as e:
             print(f"Error saving player data: {e}")
@@ -96,10 +132,12 @@ class PlayerDataStore:
         
         # Add to history
         self.player_data['difficulty_history'].append(record)
+        self.archive.append([record])
         
-        # Keep only the last 20 records to avoid file size growth
-        if len(self.player_data['difficulty_history']) > 20:
-            self.player_data['difficulty_history'] = self.player_data['difficulty_history'][-20:]
+        # Keep only the last records to avoid file size growth
+        history = self.player_data['difficulty_history']
+        if len(history) > DIFFICULTY_HISTORY_LIMIT:
+            self.player_data['difficulty_history'] = history[-DIFFICULTY_HISTORY_LIMIT:]
         
         # Save updated data
         self.save_player_data()
@@ -3,11 +3,23 @@ Difficulty Model for Swipe Chaser
 Uses machine learning to dynamically adjust game difficulty based on player performance
 """
 import os
+import threading
 import numpy as np
 import joblib
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 
+# Parameter ranges used by the heuristic, from least to most skilled player
+HEURISTIC_RANGES = {
+    'speed': (3.0, 10.0),
+    'obstacle_frequency': (60, 15),  # Higher is less frequent
+    'pattern_complexity': (1.0, 3.0)
+}
+
+# Play time (seconds) after which a player counts as fully experienced
+EXPERIENCE_TIME = 300
+
 class DifficultyModel:
     def __init__(self, model_path=None):
         """
@@ -32,6 +44,16 @@ class DifficultyModel:
             'coin_value': 1
         }
         
+        # Optional async_runtime.BackgroundJobs; when set, training runs off the caller's thread
+        self.jobs = None
+        self.training_job = None
+        self.retrain_pending = False
+        self.lock = threading.Lock()
+        
+        # Heuristic tuning (overridable per instance, e.g. by tuning sweeps)
+        self.heuristic_ranges = dict(HEURISTIC_RANGES)
+        self.experience_time = EXPERIENCE_TIME
+        
         # Load existing model if provided
         if model_path and os.path.exists(model_path):
             self._load_model(model_path)
@@ -115,22 +137,63 @@ class DifficultyModel:
         return features
     
     def _train_model(self):
-        """Train the model using collected data"""
+        """
+        Train the model using collected data
+        
+        With background jobs set (see jobs), a fresh model is fitted on a
+        worker thread and swapped in when it's done; predictions keep using
+        the current model until then.
+        
+        Returns:
+            awaitable or None: The training job when training in the background
+        """
         if len(self.training_data['features']) < 5:
-            return
+            return None
             
         X = np.array(self.training_data['features'])
         y = np.array(self.training_data['targets'])
         
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        if self.jobs is None:
+            self._install(self._fit(self.model, self.scaler, X, y))
+            return None
         
-        # Train model
+        if self.training_job is not None and not self.training_job.done():
+            # Fit again with the newer data once the running job is done
+            self.retrain_pending = True
+            return self.training_job
+        
+        self.training_job = self.jobs.submit(self._fit, clone(self.model), StandardScaler(), X, y,
+                                             on_done=self._install_background_result)
+        return self.training_job
+    
+    @staticmethod
+    def _fit(model, scaler, X, y):
+        """Fit a scaler and model (no shared state, so safe on any thread)"""
         try:
-            self.model.fit(X_scaled, y)
-            self.trained = True
+            # Scale features
+            X_scaled = scaler.fit_transform(X)
+            
+            # Train model
+            model.fit(X_scaled, y)
+            return model, scaler
         except Exception as e:
             print(f"Error training model: {e}")
+            return None
+    
+    def _install(self, fitted):
+        """Start predicting with a freshly fitted (model, scaler) pair"""
+        if fitted is None:
+            return
+        with self.lock:
+            self.model, self.scaler = fitted
+            self.trained = True
+    
+    def _install_background_result(self, fitted):
+        """Swap in a model trained in the background, then run any queued retrain"""
+        self._install(fitted)
+        if self.retrain_pending:
+            self.retrain_pending = False
+            self._train_model()
     
     def get_difficulty_params(self, player_metrics):
         """
@@ -148,11 +211,12 @@ class DifficultyModel:
         
         # Extract features
         features = self._extract_features(player_metrics)
-        features_scaled = self.scaler.transform([features])
         
-        # Predict parameters
+        # Predict parameters (the lock keeps the model and scaler from a background swap consistent)
         try:
-            params = self.model.predict(features_scaled)[0]
+            with self.lock:
+                features_scaled = self.scaler.transform([features])
+                params = self.model.predict(features_scaled)[0]
             
             return {
                 'speed': max(3.0, min(10.0, params[0])),
@@ -188,13 +252,14 @@ class DifficultyModel:
         )
         
         # Adjust for play time - new players get easier difficulty
-        experience_factor = min(1.0, play_time / 300)  # Caps at 5 minutes of play
+        experience_factor = min(1.0, play_time / self.experience_time)  # Caps at 5 minutes of play by default
         adjusted_skill = skill_score * (0.5 + 0.5 * experience_factor)
         
         # Calculate parameters based on skill
-        speed = 3.0 + adjusted_skill * 7.0  # Range: 3.0 - 10.0
-        obstacle_freq = 60 - adjusted_skill * 45  # Range: 15 - 60 (higher is less frequent)
-        pattern_complexity = 1.0 + adjusted_skill * 2.0  # Range: 1.0 - 3.0
+        ranges = self.heuristic_ranges
+        speed = self._interpolate(ranges['speed'], adjusted_skill)  # Range: 3.0 - 10.0
+        obstacle_freq = self._interpolate(ranges['obstacle_frequency'], adjusted_skill)  # Range: 15 - 60 (higher is less frequent)
+        pattern_complexity = self._interpolate(ranges['pattern_complexity'], adjusted_skill)  # Range: 1.0 - 3.0
         
         return {
             'speed': speed,
@@ -203,6 +268,12 @@ class DifficultyModel:
             'coin_value': self._calculate_coin_value(player_metrics)
         }
     
+    @staticmethod
+    def _interpolate(value_range, skill):
+        """Map a skill score onto a (low skill, high skill) parameter range"""
+        low, high = value_range
+        return low + skill * (high - low)
+    
     def _calculate_coin_value(self, player_metrics):
         """Calculate coin value based on player skill - harder difficulty gives more points"""
         # FIXED: Always return exactly 1 to fix scoring issues
@@ -6,14 +6,25 @@ import time
 import numpy as np
 from collections import deque
 
+from events import (COIN_COLLECTED, COIN_MISSED, NEAR_MISS, OBSTACLE_AVOIDED,
+                    OBSTACLE_SPAWNED)
+
+# Event types the profiler subscribes to on the game's event bus
+PROFILED_EVENTS = (COIN_COLLECTED, COIN_MISSED, NEAR_MISS, OBSTACLE_AVOIDED, OBSTACLE_SPAWNED)
+
 class PlayerProfiler:
-    def __init__(self, history_size=50):
+    def __init__(self, history_size=50, clock=None):
         """
         Initialize the player profiler with default metrics
         
         Args:
             history_size: Number of recent events to keep for rolling metrics
+            clock: Callable returning the current time in seconds, defaults to
+                   time.time. GameModel passes its simulation clock so metrics
+                   are reproducible.
         """
+        self.clock = clock or time.time
+        
         # Performance metrics
         self.reaction_times = deque(maxlen=history_size)  # Time between obstacle spawn and player reaction
         self.near_misses = deque(maxlen=history_size)     # Distance of near misses (smaller = closer call)
@@ -32,13 +43,13 @@ class PlayerProfiler:
         
     def start_session(self):
         """Start a new play session and reset session-specific metrics"""
-        self.session_start_time = time.time()
-        self.last_lane_change_time = time.time()
+        self.session_start_time = self.clock()
+        self.last_lane_change_time = self.session_start_time
     
     def end_session(self):
         """End the current session and update total play time"""
-        if self.session_start_time:
-            self.play_time += time.time() - self.session_start_time
+        if self.session_start_time is not None:
+            self.play_time += self.clock() - self.session_start_time
             self.session_start_time = None
     
     def track_lane_change(self, new_lane, current_time=None):
@@ -47,10 +58,10 @@ class PlayerProfiler:
         
         Args:
             new_lane: The lane the player moved to (0, 1, or 2)
-            current_time: Current timestamp, defaults to time.time()
+            current_time: Current timestamp, defaults to the profiler clock
         """
         if current_time is None:
-            current_time = time.time()
+            current_time = self.clock()
             
         if new_lane != self.last_player_lane:
             # Calculate reaction time if there are obstacles in the lane the player just left
@@ -70,16 +81,42 @@ class PlayerProfiler:
         Args:
             obstacle_id: Unique identifier for the obstacle
             lane: Lane where the obstacle spawned (0, 1, or 2)
-            current_time: Current timestamp, defaults to time.time()
+            current_time: Current timestamp, defaults to the profiler clock
         """
         if current_time is None:
-            current_time = time.time()
+            current_time = self.clock()
             
         self.active_obstacles[obstacle_id] = {
             'lane': lane,
             'spawn_time': current_time
         }
     
+    def handle_events(self, events):
+        """
+        Track a tick's batch of game events (EventBus subscriber)
+        
+        Args:
+            events: events.EventBuffer for the tick
+        """
+        current_time = self.clock()
+        types = events.types
+        entity_ids = events.entity_ids
+        for i in range(events.count):
+            event_type = types[i]
+            if event_type == OBSTACLE_SPAWNED:
+                self.track_obstacle_spawn(entity_ids[i], events.lanes[i], current_time)
+            elif event_type == OBSTACLE_AVOIDED:
+                self.track_obstacle_avoided(entity_ids[i])
+            elif event_type == NEAR_MISS:
+                self.track_near_miss(entity_ids[i], events.values[i])
+            elif event_type == COIN_COLLECTED:
+                self.coins_collected += 1
+            elif event_type == COIN_MISSED:
+                self.coins_missed += 1
+        
+        if events.has(COIN_COLLECTED) or events.has(COIN_MISSED):
+            self._update_coin_rate()
+    
     def track_obstacle_avoided(self, obstacle_id):
         """
         Track when an obstacle is successfully avoided
@@ -144,8 +181,8 @@ class PlayerProfiler:
     def _calculate_lane_changes_per_minute(self):
         """Calculate lane changes per minute of play time"""
         total_time = self.play_time
-        if self.session_start_time:
-            total_time += time.time() - self.session_start_time
+        if self.session_start_time is not None:
+            total_time += self.clock() - self.session_start_time
             
         if total_time > 0:
             return (self.lane_changes / total_time) * 60
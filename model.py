@@ -1,40 +1,112 @@
-import random
 import time
 import os
+from collections import deque
+
+import numpy as np
 
 # Import ML components
-from ml.player_profiler import PlayerProfiler
+from ml.player_profiler import PlayerProfiler, PROFILED_EVENTS
 from ml.difficulty_model import DifficultyModel
 from ml.data_store import PlayerDataStore
+from render_backend import get_difficulty_level
+from snapshot import SnapshotBuffer
+from entity_store import EntityStore
+from pattern_library import PatternLibrary, COIN_SPAWN_Y
+from rng import GameRNG
+from events import (EventBus, COIN_COLLECTED, COIN_MISSED, NEAR_MISS, COLLISION,
+                    OBSTACLE_AVOIDED, OBSTACLE_SPAWNED, COIN_SPAWNED, GAME_OVER)
+
+# Simulated seconds per tick (the game loop runs at ~30 FPS)
+TICK_SECONDS = 0.033
+
+# Number of recent input-to-tick latencies kept for statistics
+INPUT_LATENCY_HISTORY = 256
+
+# TESTING: Force difficulty progression based on score, so difficulty changes
+# show up even in short sessions. Entries are
+# (minimum score, levels the rule applies to, speed, pattern complexity).
+FORCED_PROGRESSION = [
+    (5, ("Novice",), 5.0, 1.2),
+    (10, ("Novice", "Easy"), 6.5, 1.8),
+    (15, ("Novice", "Easy", "Medium"), 8.0, 2.5)
+]
 
 class GameModel:
-    def __init__(self):
+    def __init__(self, seed=None, persist=True, data_dir=None):
+        """
+        Initialize the game model
+        
+        Args:
+            seed: Seed for the game's random streams. With a seed, every game
+                  started without an explicit seed replays the same spawns.
+            persist: Save session data, training examples and replays when a
+                     game ends. Headless simulations (replay playback,
+                     sweeps) turn this off.
+            data_dir: Directory for player data, defaults to ./data next to
+                      this file
+        """
         self.width = 400
+        self.persist = persist
         self.height = 600
         self.game_state = "start"  # start, playing, game_over
         
         # Create data directory if it doesn't exist
-        data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+        if data_dir is None:
+            data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
         
         # Initialize ML components
         self.data_store = PlayerDataStore(data_dir=data_dir)
-        self.player_profiler = PlayerProfiler()
+        self.player_profiler = PlayerProfiler(clock=self.get_sim_time)
         self.difficulty_model = DifficultyModel()
         
+        # Score-based difficulty progression (overridable per instance)
+        self.forced_progression = list(FORCED_PROGRESSION)
+        
+        # Declarative obstacle patterns (data/patterns.json)
+        self.pattern_library = PatternLibrary.load()
+        
+        # Random streams (replaced with a freshly seeded set every game)
+        self.seed = seed
+        self.rng = GameRNG(seed)
+        
         # Session tracking
         self.session_start_time = None
         self.obstacle_id_counter = 0
         
+        # Recorded difficulty parameters by tick; when set (replay playback)
+        # these replace the ML difficulty updates
+        self.difficulty_schedule = None
+        
+        # Double-buffered render snapshots published at the end of every tick
+        self.snapshots = SnapshotBuffer()
+        # Optional shared-memory ring the tick is also written to (see use_shared_state)
+        self.shared_state = None
+        
+        # Player input as (perf_counter timestamp, direction), drained at the start of each tick.
+        # deque append/popleft are atomic, so input handlers never need the simulation lock.
+        self.input_queue = deque()
+        # Seconds between each input being queued and the tick that applied it
+        self.input_latencies = deque(maxlen=INPUT_LATENCY_HISTORY)
+        # perf_counter time of the last lane change actually applied
+        self.last_lane_change_time = None
+        
+        # Opening difficulty parameters computed by prepare_game(), used by the next start_game()
+        self.prepared_params = None
+        
+        # Game events, delivered to subscribers in one batch per tick
+        self.events = EventBus()
+        self.events.subscribe(self.player_profiler.handle_events, PROFILED_EVENTS)
+        
         # Initialize game state
         self.reset()
         
     def reset(self):
         self.player_lane = 1  # 0=left, 1=center, 2=right
         self.score = 0
-        self.obstacles = []  # List of (obstacle_id, lane, y) tuples
-        self.coins = []      # List of (coin_id, lane, y) tuples
+        self.obstacles = EntityStore()  # Iterates as (obstacle_id, lane, y) tuples
+        self.coins = EntityStore()      # Iterates as (coin_id, lane, y) tuples
         
         # Default difficulty parameters (will be adjusted by ML)
         self.difficulty_params = {
@@ -49,9 +121,19 @@ class GameModel:
         self.coin_id_counter = 0
         self.obstacle_id_counter = 0
         
+        # Lane changes as (tick, direction); with the seed this reproduces the run
+        self.input_log = []
+        # Difficulty parameters as (tick, params) whenever a difficulty update changed them
+        self.param_log = []
+        self.initial_params = dict(self.difficulty_params)
+        
         # Reset player profiler for new game
         self.player_profiler.reset()
         
+        # Drop events and input left over from the previous game
+        self.events.buffer.clear()
+        self.input_queue.clear()
+        
     def move_player(self, direction):
         old_lane = self.player_lane
         
@@ -62,22 +144,135 @@ class GameModel:
             
         # Track lane change for player profiling if lane actually changed
         if old_lane != self.player_lane:
+            self.last_lane_change_time = time.perf_counter()
+            self.input_log.append((self.tick, direction))
             self.player_profiler.track_lane_change(self.player_lane)
             
-    def start_game(self):
+    def queue_input(self, direction, timestamp=None):
+        """
+        Queue a lane change to be applied at the start of the next tick
+        
+        Args:
+            direction: 'left' or 'right'
+            timestamp: time.perf_counter() when the input happened, defaults to now
+        """
+        self.input_queue.append((timestamp if timestamp is not None else time.perf_counter(), direction))
+    
+    def _apply_queued_input(self):
+        """Apply every queued lane change in order and record how long each waited"""
+        now = time.perf_counter()
+        queue = self.input_queue
+        while queue:
+            timestamp, direction = queue.popleft()
+            self.input_latencies.append(now - timestamp)
+            self.move_player(direction)
+    
+    def get_input_latency_stats(self):
+        """
+        Summarize recent input-to-tick latencies
+        
+        Returns:
+            dict: count, mean, p50, p95 and max in milliseconds
+        """
+        if not self.input_latencies:
+            return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+        latencies = np.array(self.input_latencies) * 1000
+        return {
+            'count': len(latencies),
+            'mean': float(latencies.mean()),
+            'p50': float(np.percentile(latencies, 50)),
+            'p95': float(np.percentile(latencies, 95)),
+            'max': float(latencies.max())
+        }
+    
+    def get_sim_time(self):
+        """Simulation time in seconds, derived from the tick counter"""
+        return self.tick * TICK_SECONDS
+    
+    def start_game(self, seed=None):
+        """
+        Start a new game
+        
+        Args:
+            seed: Seed for this game's random streams; defaults to the model
+                  seed, or a fresh random seed if the model has none
+        """
         self.reset()
+        self.rng = GameRNG(seed if seed is not None else self.seed)
         self.game_state = "playing"
         
         # Start session tracking
         self.session_start_time = time.time()
         self.player_profiler.start_session()
         
-        # Load initial difficulty parameters
+        # Load initial difficulty parameters (computed ahead by prepare_game when possible)
+        params = self.prepared_params
+        self.prepared_params = None
+        if params is None:
+            params = self._initial_difficulty_params()
+        if params:
+            self.difficulty_params = params
+        
+        # Starting parameters for the replay
+        self.initial_params = dict(self.difficulty_params)
+        
+        self.publish_snapshot()
+        
+    def use_background_jobs(self, jobs):
+        """
+        Move player data, replay and archive saves and difficulty model training off the game loop
+        
+        Args:
+            jobs: async_runtime.BackgroundJobs (or None to go back to blocking calls)
+        """
+        self.data_store.jobs = jobs
+        self.data_store.archive.jobs = jobs
+        self.difficulty_model.jobs = jobs
+        
+    def use_shared_state(self, writer):
+        """
+        Publish every tick to other processes through shared memory
+        
+        Args:
+            writer: shared_state.SharedStateWriter (or None to stop publishing)
+        """
+        self.shared_state = writer
+        if writer is not None:
+            writer.write(self)
+        
+    def prepare_game(self):
+        """
+        Do the expensive part of start_game ahead of time
+        
+        Resets the entity stores and computes the opening difficulty
+        parameters (the first difficulty prediction), so the next
+        start_game() only has to seed the random streams. The game state is
+        left alone; call this while something else is on screen, e.g.
+        during the countdown.
+        """
+        self.reset()
+        # An empty dict records that there is no history to adjust for
+        self.prepared_params = self._initial_difficulty_params() or {}
+        if self.prepared_params:
+            # So a frame drawn before start_game shows the opening difficulty
+            self.difficulty_params = dict(self.prepared_params)
+        self.publish_snapshot()
+        
+    def _initial_difficulty_params(self):
+        """Opening difficulty parameters from the player's history, or None for a new player"""
         player_stats = self.data_store.get_player_stats()
         if player_stats['games_played'] > 0:
             # Adjust initial difficulty based on player history
             metrics = self.player_profiler.get_metrics()
-            self.difficulty_params = self.difficulty_model.get_difficulty_params(metrics)
+            return self.difficulty_model.get_difficulty_params(metrics)
+        return None
+        
+    def quit_to_menu(self):
+        """Abandon the current game without recording it and return to the start state"""
+        self.reset()
+        self.prepared_params = None
+        self.game_state = "start"
+        self.publish_snapshot()
         
     def end_game(self):
         # Debug print to trace when game ends
@@ -92,10 +287,14 @@ class GameModel:
             
         self.game_state = "game_over"
         
+        # Announce the end (value is the final score) after the tick's own batch
+        self.events.emit(GAME_OVER, value=self.score)
+        self.events.dispatch(self.tick)
+        
         # End session tracking
-        if self.session_start_time:
+        self.player_profiler.end_session()
+        if self.session_start_time and self.persist:
             session_duration = time.time() - self.session_start_time
-            self.player_profiler.end_session()
             
             # Save session data
             self.data_store.update_session_data(
@@ -120,80 +319,39 @@ class GameModel:
                 difficulty_params=self.difficulty_params,
                 success_rating=success_rating
             )
+            
+            # Keep a compact replay of the game
+            self._save_replay()
+    
+    def _save_replay(self):
+        """Save a replay of the finished game to data/replays (on a worker thread with background jobs)"""
+        from replay import Replay, save_replay
+        
+        try:
+            # Capture the game now; encoding, writing and pruning can happen later
+            replay = Replay.from_model(self)
+            replay_dir = os.path.join(self.data_store.data_dir, 'replays')
+            jobs = self.data_store.jobs
+            if jobs is not None:
+                jobs.submit(save_replay, replay, replay_dir)
+            else:
+                save_replay(replay, replay_dir)
+        except Exception as e:
+            print(f"Error saving replay: {e}")
         
     def update(self):
         if self.game_state != "playing":
             return
+        
+        # Input queued since the last tick belongs to the last tick, as move_player logs it
+        if self.input_queue:
+            self._apply_queued_input()
             
         self.tick += 1
         
         # Update difficulty more frequently - every 3 seconds instead of 5
         if self.tick % 180 == 0 and self.tick > 0:
-            print(f"Updating difficulty at tick {self.tick}")
-            
-            try:
-                metrics = self.player_profiler.get_metrics()
-                new_params = self.difficulty_model.get_difficulty_params(metrics)
-                
-                # Get current and new difficulty levels for comparison
-                from view import GameView
-                
-                # Create a temporary view instance to use its difficulty calculation
-                temp_view = GameView(None)
-                current_level = temp_view._get_difficulty_level(self.difficulty_params)
-                new_level = temp_view._get_difficulty_level(new_params)
-                
-                # Print current and new parameters with difficulty levels
-                print(f"Current difficulty: {current_level}")
-                print(f"Current params: {self.difficulty_params}")
-                print(f"Target difficulty: {new_level}")
-                print(f"Target params: {new_params}")
-                
-                # Print clear message if difficulty is changing
-                if current_level != new_level:
-                    print(f"\n*** DIFFICULTY CHANGING: {current_level} → {new_level} ***\n")
-                
-                # Make difficulty changes more significant - 30% change instead of 10%
-                for key in self.difficulty_params:
-                    if key in new_params:
-                        current = self.difficulty_params[key]
-                        target = new_params[key]
-                        # Move 30% toward the target value for more noticeable changes
-                        self.difficulty_params[key] = current + 0.3 * (target - current)
-                
-                # TESTING: Force difficulty progression based on score
-                # This ensures you'll see difficulty changes even in short play sessions
-                if self.score >= 5 and current_level == "Novice":
-                    print("\n*** FORCING DIFFICULTY TO EASY DUE TO SCORE ***\n")
-                    self.difficulty_params['speed'] = 5.0
-                    self.difficulty_params['pattern_complexity'] = 1.2
-                
-                if self.score >= 10 and current_level in ["Novice", "Easy"]:
-                    print("\n*** FORCING DIFFICULTY TO MEDIUM DUE TO SCORE ***\n")
-                    self.difficulty_params['speed'] = 6.5
-                    self.difficulty_params['pattern_complexity'] = 1.8
-                
-                if self.score >= 15 and current_level in ["Novice", "Easy", "Medium"]:
-                    print("\n*** FORCING DIFFICULTY TO HARD DUE TO SCORE ***\n")
-                    self.difficulty_params['speed'] = 8.0
-                    self.difficulty_params['pattern_complexity'] = 2.5
-                
-                # FIXED: Ensure obstacle_frequency is always a reasonable value
-                # This prevents obstacles from stopping
-                if 'obstacle_frequency' in self.difficulty_params:
-                    # Clamp to reasonable range (15-60)
-                    self.difficulty_params['obstacle_frequency'] = max(15, min(60, self.difficulty_params['obstacle_frequency']))
-                
-                print(f"Updated params: {self.difficulty_params}")
-            except Exception as e:
-                print(f"Error updating difficulty: {e}")
-                # Fallback to default parameters if something goes wrong
-                self.difficulty_params = {
-                    'speed': 5.0,
-                    'obstacle_frequency': 30,
-                    'pattern_complexity': 1.0,
-                    'coin_value': 1
-                }
+            self._update_difficulty()
         
         # Get current difficulty parameters
         speed = self.difficulty_params['speed']
@@ -205,26 +363,26 @@ class GameModel:
         print(f"Using coin value: {coin_value} (from difficulty params)")
         
         # Move obstacles and coins down with dynamic speed
-        new_obstacles = []
-        for obs_id, lane, y in self.obstacles:
-            new_y = y + speed
-            if new_y < self.height:
-                new_obstacles.append((obs_id, lane, new_y))
-            else:
-                # Obstacle went off screen - track as avoided
-                self.player_profiler.track_obstacle_avoided(obs_id)
-        self.obstacles = new_obstacles
+        obstacles = self.obstacles
+        obstacles.advance(speed)
+        n = len(obstacles)
+        offscreen = obstacles.ys[:n] >= self.height
+        if offscreen.any():
+            # Obstacles that went off screen - track as avoided
+            self.events.emit_many(OBSTACLE_AVOIDED, obstacles.ids[:n][offscreen].tolist(),
+                                  obstacles.lanes[:n][offscreen].tolist())
+            obstacles.keep(~offscreen)
         
         # Move coins down
-        new_coins = []
-        for coin_id, lane, y in self.coins:
-            new_y = y + speed
-            if new_y < self.height:
-                new_coins.append((coin_id, lane, new_y))
-            else:
-                # Coin went off screen - track as missed
-                self.player_profiler.track_coin_missed()
-        self.coins = new_coins
+        coins = self.coins
+        coins.advance(speed)
+        n = len(coins)
+        offscreen = coins.ys[:n] >= self.height
+        if offscreen.any():
+            # Coins that went off screen - track as missed
+            self.events.emit_many(COIN_MISSED, coins.ids[:n][offscreen].tolist(),
+                                  coins.lanes[:n][offscreen].tolist())
+            coins.keep(~offscreen)
         
         # FIXED: Ensure obstacle frequency is a positive integer
         if obstacle_frequency <= 0:
@@ -239,128 +397,164 @@ class GameModel:
         # Add new obstacles based on dynamic frequency and pattern complexity
         # FIXED: Use modulo with max to prevent division by zero or negative values
         if self.tick % max(1, int(obstacle_frequency)) == 0:
-            # Debug print for obstacle spawning
-            print(f"Spawning new obstacles at tick {self.tick}")
-            
-            # Ensure pattern is a valid integer between 1-3
-            pattern = max(1, min(3, int(pattern_complexity)))
-            print(f"Using pattern complexity: {pattern}")
-            
-            if pattern == 1:
-                # Simple pattern - single random obstacle
-                lane = random.randint(0, 2)
-                self._spawn_obstacle(lane)
-                print(f"Spawned simple obstacle in lane {lane}")
-            elif pattern == 2:
-                # Medium pattern - two obstacles with one gap
-                lanes = [0, 1, 2]
-                empty_lane = random.choice(lanes)
-                lanes.remove(empty_lane)
-                for lane in lanes:
-                    self._spawn_obstacle(lane)
-                print(f"Spawned medium pattern with gap in lane {empty_lane}")
-            else:
-                # Complex pattern - special formations
-                pattern_type = random.randint(1, 3)
-                if pattern_type == 1:
-                    # Zigzag pattern
-                    self._spawn_obstacle(1)  # Center
-                    self._spawn_obstacle_delayed(0, 15)  # Left, delayed
-                    self._spawn_obstacle_delayed(2, 30)  # Right, more delayed
-                    print("Spawned zigzag pattern")
-                elif pattern_type == 2:
-                    # Wall with small gap
-                    gap = random.randint(0, 2)
-                    for lane in range(3):
-                        if lane != gap:
-                            self._spawn_obstacle(lane)
-                    print(f"Spawned wall pattern with gap in lane {gap}")
-                else:
-                    # Random pattern
-                    for _ in range(2):
-                        lane = random.randint(0, 2)
-                        self._spawn_obstacle(lane)
-                    print("Spawned random pattern")
+            # Ensure pattern tier is a valid integer between 1-3
+            tier = max(1, min(3, int(pattern_complexity)))
+            pattern, anchor = self.pattern_library.choose(tier, self.rng.spawning)
+            self._spawn_pattern(pattern, anchor)
             
             # Add coins with 50% probability
-            if random.random() < 0.5:
-                coin_lane = random.randint(0, 2)
+            if self.rng.coins.random() < 0.5:
+                coin_lane = self.rng.coins.randint(0, 2)
                 self._spawn_coin(coin_lane)
                 print(f"Spawned coin in lane {coin_lane}")
             
             # FIXED: Always spawn at least one coin every 3 obstacle patterns
             # This ensures coins keep appearing throughout the game
             elif self.tick % (max(1, int(obstacle_frequency)) * 3) == 0:
-                coin_lane = random.randint(0, 2)
+                coin_lane = self.rng.coins.randint(0, 2)
                 self._spawn_coin(coin_lane)
                 print(f"Forced coin spawn in lane {coin_lane}")
         
         player_y = 500
         
         # Process coin collection FIRST to ensure coins are collected even if player hits obstacle
-        collected_coins = []
+        n = len(coins)
+        collected = (coins.lanes[:n] == self.player_lane) & (np.abs(player_y - coins.ys[:n]) < 30)
+        collected_count = int(np.count_nonzero(collected))
+        if collected_count:
+            # Collect coins with dynamic value
+            self.score += coin_value * collected_count
+            for coin_id, lane in zip(coins.ids[:n][collected].tolist(), coins.lanes[:n][collected].tolist()):
+                self.events.emit(COIN_COLLECTED, coin_id, lane, coin_value)
+            coins.keep(~collected)
+            print(f"Collected {collected_count} coin(s) worth {coin_value}, new score: {self.score}")
         
-        # Debug print for coin value
-        print(f"Current coin value: {coin_value}, Current score: {self.score}")
+        # Collision detection AFTER coin collection
+        n = len(obstacles)
+        in_lane = obstacles.lanes[:n] == self.player_lane
+        distance = np.abs(player_y - obstacles.ys[:n])
         
-        # Make a copy of coins to iterate over
-        coins_to_check = self.coins.copy()
+        # More precise collision detection - use a smaller hitbox
+        hits = np.flatnonzero(in_lane & (distance < 20))
+        collision_detected = len(hits) > 0
         
-        for coin_id, lane, y in coins_to_check:  # Iterate through coins
-            if lane == self.player_lane and abs(player_y - y) < 30:
-                # Collect coin with dynamic value
-                print(f"Collecting coin: {coin_id}, value: {coin_value}")
-                self.score += coin_value
-                print(f"New score after collection: {self.score}")
-                collected_coins.append((coin_id, lane, y))
-                self.player_profiler.track_coin_collected()
+        # Near misses in the player's lane
+        near_miss = in_lane & (distance >= 20) & (distance < 50)
+        if near_miss.any():
+            self.events.emit_many(NEAR_MISS, obstacles.ids[:n][near_miss].tolist(),
+                                  obstacles.lanes[:n][near_miss].tolist(), distance[near_miss].tolist())
         
-        # Remove collected coins after iteration
-        for coin in collected_coins:
-            if coin in self.coins:  # Make sure it's still in the list
-                self.coins.remove(coin)
-                print(f"Removed coin: {coin[0]}, remaining coins: {len(self.coins)}")
+        if collision_detected:
+            self.events.emit(COLLISION, int(obstacles.ids[hits[0]]), self.player_lane)
         
-        # Collision detection AFTER coin collection
-        collision_detected = False
-        
-        # Make a copy of obstacles to avoid modification during iteration
-        obstacles_to_check = self.obstacles.copy()
-        
-        for obs_id, lane, y in obstacles_to_check:
-            # Check for collision
-            if lane == self.player_lane:
-                distance = abs(player_y - y)
-                print(f"Obstacle {obs_id} at distance {distance} in lane {lane}, player lane: {self.player_lane}")
-                # More precise collision detection - use a smaller hitbox
-                if distance < 20:  # Collision - reduced further from 25 to 20 for more precise detection
-                    print(f"COLLISION DETECTED with obstacle {obs_id}")
-                    collision_detected = True
-                    # Don't break immediately to allow processing of other game elements
-                elif distance < 50:  # Near miss
-                    self.player_profiler.track_near_miss(obs_id, distance)
+        # Deliver this tick's events before the game can end, so the
+        # profiler's metrics are complete when the session is recorded
+        self.events.dispatch(self.tick)
         
         # End game only after all processing is complete
         if collision_detected and self.game_state == "playing":
-            print("Ending game due to collision")
+            print("COLLISION DETECTED - ending game")
             self.end_game()
+        
+        self.publish_snapshot()
+    
+    def _update_difficulty(self):
+        """Move the difficulty parameters toward the model's target (every 180 ticks)"""
+        if self.difficulty_schedule is not None:
+            # Replay playback - apply the recorded parameters
+            params = self.difficulty_schedule.get(self.tick)
+            if params is not None:
+                self.difficulty_params = dict(params)
+            self._log_params()
+            return
+        
+        print(f"Updating difficulty at tick {self.tick}")
+        
+        try:
+            metrics = self.player_profiler.get_metrics()
+            new_params = self.difficulty_model.get_difficulty_params(metrics)
+            
+            # Get current and new difficulty levels for comparison
+            current_level = get_difficulty_level(self.difficulty_params)
+            new_level = get_difficulty_level(new_params)
+            
+            # Print current and new parameters with difficulty levels
+            print(f"Current difficulty: {current_level}")
+            print(f"Current params: {self.difficulty_params}")
+            print(f"Target difficulty: {new_level}")
+            print(f"Target params: {new_params}")
+            
+            # Print clear message if difficulty is changing
+            if current_level != new_level:
+                print(f"\n*** DIFFICULTY CHANGING: {current_level} → {new_level} ***\n")
+            
+            # Make difficulty changes more significant - 30% change instead of 10%
+            for key in self.difficulty_params:
+                if key in new_params:
+                    current = self.difficulty_params[key]
+                    target = new_params[key]
+                    # Move 30% toward the target value for more noticeable changes
+                    self.difficulty_params[key] = current + 0.3 * (target - current)
+            
+            # TESTING: Force difficulty progression based on score
+            # This ensures you'll see difficulty changes even in short play sessions
+            for min_score, levels, speed, complexity in self.forced_progression:
+                if self.score >= min_score and current_level in levels:
+                    print(f"\n*** FORCING DIFFICULTY UP FROM {current_level.upper()} DUE TO SCORE ***\n")
+                    self.difficulty_params['speed'] = speed
+                    self.difficulty_params['pattern_complexity'] = complexity
+            
+            # FIXED: Ensure obstacle_frequency is always a reasonable value
+            # This prevents obstacles from stopping
+            if 'obstacle_frequency' in self.difficulty_params:
+                # Clamp to reasonable range (15-60)
+                self.difficulty_params['obstacle_frequency'] = max(15, min(60, self.difficulty_params['obstacle_frequency']))
+            
+            print(f"Updated params: {self.difficulty_params}")
+        except Exception as e:
+            print(f"Error updating difficulty: {e}")
+            # Fallback to default parameters if something goes wrong
+            self.difficulty_params = {
+                'speed': 5.0,
+                'obstacle_frequency': 30,
+                'pattern_complexity': 1.0,
+                'coin_value': 1
+            }
+        
+        self._log_params()
+    
+    def _log_params(self):
+        """Record the difficulty parameters for the replay if they changed"""
+        previous = self.param_log[-1][1] if self.param_log else self.initial_params
+        if self.difficulty_params != previous:
+            self.param_log.append((self.tick, dict(self.difficulty_params)))
     
-    def _spawn_obstacle(self, lane):
-        """Spawn a new obstacle in the specified lane"""
-        self.obstacle_id_counter += 1
-        obstacle_id = f"obs_{self.obstacle_id_counter}"
-        self.obstacles.append((obstacle_id, lane, -50))
-        self.player_profiler.track_obstacle_spawn(obstacle_id, lane)
+    def publish_snapshot(self):
+        """Publish a read-only render snapshot of the current tick"""
+        self.snapshots.publish(self)
+        if self.shared_state is not None:
+            self.shared_state.write(self)
     
-    def _spawn_obstacle_delayed(self, lane, delay):
-        """Spawn an obstacle with a delay (used for complex patterns)"""
-        self.obstacle_id_counter += 1
-        obstacle_id = f"obs_{self.obstacle_id_counter}"
-        self.obstacles.append((obstacle_id, lane, -50 - delay))
-        self.player_profiler.track_obstacle_spawn(obstacle_id, lane)
+    def _spawn_pattern(self, pattern, anchor):
+        """Stamp a compiled pattern into the entity stores with one bulk insert each"""
+        count = len(pattern.obstacle_lanes)
+        if count:
+            ids = np.arange(self.obstacle_id_counter + 1, self.obstacle_id_counter + count + 1)
+            lanes = (pattern.obstacle_lanes + anchor) % 3
+            self.obstacle_id_counter += count
+            self.obstacles.bulk_insert(ids, lanes, pattern.obstacle_ys)
+            self.events.emit_many(OBSTACLE_SPAWNED, ids.tolist(), lanes.tolist())
+        
+        count = len(pattern.coin_lanes)
+        if count:
+            ids = np.arange(self.coin_id_counter + 1, self.coin_id_counter + count + 1)
+            lanes = (pattern.coin_lanes + anchor) % 3
+            self.coin_id_counter += count
+            self.coins.bulk_insert(ids, lanes, pattern.coin_ys)
+            self.events.emit_many(COIN_SPAWNED, ids.tolist(), lanes.tolist())
     
     def _spawn_coin(self, lane):
         """Spawn a new coin in the specified lane"""
         self.coin_id_counter += 1
-        coin_id = f"coin_{self.coin_id_counter}"
-        self.coins.append((coin_id, lane, -30))
+        self.coins.append(self.coin_id_counter, lane, COIN_SPAWN_Y)
+        self.events.emit(COIN_SPAWNED, self.coin_id_counter, lane)
@@ -0,0 +1,220 @@
+import threading
+import time
+
+import numpy as np
+import pygame
+
+# Tempo follows the difficulty speed: bpm = MUSIC_BASE_BPM + speed * MUSIC_BPM_PER_SPEED
+MUSIC_BASE_BPM = 70
+MUSIC_BPM_PER_SPEED = 8
+MUSIC_MAX_BPM = 170
+
+# Eight-step arpeggio (semitones above the chord root) played in eighth notes
+ARPEGGIO = np.array([0, 7, 12, 15, 19, 15, 12, 7], dtype=np.int64)
+
+# Chord roots (semitones above A2) for each bar of the progression
+PROGRESSION = np.array([0, 0, -4, -2], dtype=np.int64)
+
+ROOT_FREQUENCY = 110.0  # A2
+
+
+class MusicGenerator:
+    """Streams procedurally generated music through a mixer channel
+
+    Audio is synthesized in short chunks directly into the sample buffers of
+    a small ring of preallocated Sounds (via pygame.sndarray.samples), and
+    each finished chunk is handed to Channel.queue while the previous one
+    plays. All working arrays are allocated up front, so memory use stays
+    the same however long the music runs. Song position is tracked in beats
+    rather than samples so a tempo change takes effect on the next chunk
+    without a jump in the melody.
+    """
+
+    def __init__(self, channel, chunk_seconds=0.25, ring_size=3, volume=0.5):
+        """
+        Initialize the generator
+
+        Args:
+            channel: pygame.mixer.Channel to stream to
+            chunk_seconds: Length of each synthesized chunk
+            ring_size: Number of chunk buffers (one playing, one queued,
+                       the rest free to be written; at least 3)
+            volume: Channel volume (0.0 to 1.0)
+        """
+        self.sample_rate, _, self.channels = pygame.mixer.get_init()
+        self.channel = channel
+        self.channel.set_volume(volume)
+        self.chunk_seconds = chunk_seconds
+        self.chunk_samples = int(self.sample_rate * chunk_seconds)
+
+        # Ring of Sounds whose buffers are written in place
+        shape = (self.chunk_samples, self.channels) if self.channels > 1 else (self.chunk_samples,)
+        self.ring = [pygame.sndarray.make_sound(np.zeros(shape, dtype=np.int16))
+                     for _ in range(max(3, ring_size))]
+        self.ring_samples = [pygame.sndarray.samples(sound) for sound in self.ring]
+        self.next_slot = 0
+
+        # Preallocated work buffers
+        n = self.chunk_samples
+        self.sample_index = np.arange(n, dtype=np.float64)
+        self.beat = np.empty(n, dtype=np.float64)
+        self.step = np.empty(n, dtype=np.int64)
+        self.note = np.empty(n, dtype=np.int64)
+        self.frequency = np.empty(n, dtype=np.float64)
+        self.phase = np.empty(n, dtype=np.float64)
+        self.envelope = np.empty(n, dtype=np.float64)
+        self.voice = np.empty(n, dtype=np.float64)
+        self.mix = np.empty(n, dtype=np.float64)
+
+        # Song state carried between chunks
+        self.bpm = MUSIC_BASE_BPM
+        self.beat_position = 0.0
+        self.lead_phase = 0.0
+        self.bass_phase = 0.0
+
+        # Synthesis cost per chunk
+        self.stats = {'chunks': 0, 'total_time': 0.0, 'max_time': 0.0, 'underruns': 0}
+
+        self.running = False
+        self.thread = None
+
+    def set_speed(self, speed):
+        """Sync the tempo to the game's difficulty speed"""
+        self.bpm = min(MUSIC_MAX_BPM, MUSIC_BASE_BPM + speed * MUSIC_BPM_PER_SPEED)
+
+    def set_volume(self, volume):
+        """Set the channel volume (0.0 to 1.0)"""
+        self.channel.set_volume(volume)
+
+    @property
+    def cpu_load(self):
+        """Average synthesis time as a fraction of the audio it produced"""
+        if not self.stats['chunks']:
+            return 0.0
+        return self.stats['total_time'] / (self.stats['chunks'] * self.chunk_seconds)
+
+    def _synthesize(self, out):
+        """Render the next chunk into an int16 sample buffer"""
+        n = self.chunk_samples
+        beats_per_sample = self.bpm / 60.0 / self.sample_rate
+
+        # Position in beats for every sample of the chunk
+        np.multiply(self.sample_index, beats_per_sample, out=self.beat)
+        self.beat += self.beat_position
+
+        # Arpeggio note: eighth-note step within the bar, transposed by the bar's chord
+        np.multiply(self.beat, 2, out=self.envelope)
+        np.floor(self.envelope, out=self.envelope)
+        self.step[:] = self.envelope
+        np.remainder(self.step, len(ARPEGGIO), out=self.note)
+        np.take(ARPEGGIO, self.note, out=self.note)
+        np.floor_divide(self.step, len(ARPEGGIO), out=self.step)
+        np.remainder(self.step, len(PROGRESSION), out=self.step)
+        np.take(PROGRESSION, self.step, out=self.step)
+        self.note += self.step
+
+        # Lead: sine at the arpeggio note with phase accumulated across chunks
+        np.divide(self.note, 12.0, out=self.frequency)
+        np.exp2(self.frequency, out=self.frequency)
+        self.frequency *= ROOT_FREQUENCY * 2 * np.pi / self.sample_rate
+        np.cumsum(self.frequency, out=self.phase)
+        self.phase += self.lead_phase
+        self.lead_phase = self.phase[-1] % (2 * np.pi)
+        np.sin(self.phase, out=self.mix)
+
+        # Pluck envelope decaying over each eighth note
+        np.multiply(self.beat, 2, out=self.envelope)
+        np.remainder(self.envelope, 1.0, out=self.envelope)
+        self.envelope *= -4.0
+        np.exp(self.envelope, out=self.envelope)
+        self.mix *= self.envelope
+        self.mix *= 0.25
+
+        # Bass: chord root an octave down, swelling on every beat
+        np.divide(self.step, 12.0, out=self.frequency)
+        np.exp2(self.frequency, out=self.frequency)
+        self.frequency *= ROOT_FREQUENCY * 0.5 * 2 * np.pi / self.sample_rate
+        np.cumsum(self.frequency, out=self.phase)
+        self.phase += self.bass_phase
+        self.bass_phase = self.phase[-1] % (2 * np.pi)
+        np.sin(self.phase, out=self.voice)
+        np.remainder(self.beat, 1.0, out=self.envelope)
+        self.envelope *= -2.5
+        np.exp(self.envelope, out=self.envelope)
+        self.voice *= self.envelope
+        self.voice *= 0.3
+        self.mix += self.voice
+
+        self.beat_position += n * beats_per_sample
+
+        # Scale to 16-bit and write every output channel
+        self.mix *= 32767
+        if out.ndim == 1:
+            out[:] = self.mix
+        else:
+            out[:] = self.mix[:, np.newaxis]
+
+    def fill(self):
+        """
+        Keep the channel fed: synthesize and queue a chunk if there's room
+
+        Returns:
+            bool: True if a chunk was synthesized
+        """
+        if self.channel.get_busy() and self.channel.get_queue() is not None:
+            return False
+
+        start = time.perf_counter()
+        slot = self.next_slot
+        self._synthesize(self.ring_samples[slot])
+        elapsed = time.perf_counter() - start
+
+        if self.channel.get_busy():
+            self.channel.queue(self.ring[slot])
+        else:
+            # Nothing playing - either the first chunk or we fell behind
+            if self.stats['chunks']:
+                self.stats['underruns'] += 1
+            self.channel.play(self.ring[slot])
+        self.next_slot = (slot + 1) % len(self.ring)
+
+        self.stats['chunks'] += 1
+        self.stats['total_time'] += elapsed
+        self.stats['max_time'] = max(self.stats['max_time'], elapsed)
+        return True
+
+    def start(self):
+        """Start streaming on a background thread"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop streaming and silence the channel"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        self.channel.stop()
+
+    def pause(self):
+        """Pause playback (the stream resumes where it left off)"""
+        self.channel.pause()
+
+    def unpause(self):
+        """Resume paused playback"""
+        self.channel.unpause()
+
+    def _run(self):
+        """Streaming loop: top up the channel several times per chunk"""
+        poll_interval = self.chunk_seconds / 4
+        while self.running:
+            try:
+                self.fill()
+            except Exception as e:
+                print(f"Error generating music: {e}")
+                self.running = False
+                return
+            time.sleep(poll_interval)
@@ -0,0 +1,123 @@
+import json
+import os
+
+import numpy as np
+
+# Default pattern file shipped with the game
+DEFAULT_PATTERN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'patterns.json')
+
+# Spawn heights used by GameModel
+OBSTACLE_SPAWN_Y = -50
+COIN_SPAWN_Y = -30
+
+
+class CompiledPattern:
+    """A spawn pattern precompiled into arrays ready to stamp into an EntityStore"""
+
+    __slots__ = ('name', 'anchor', 'obstacle_lanes', 'obstacle_ys', 'coin_lanes', 'coin_ys')
+
+    def __init__(self, spec, lane_count):
+        """
+        Compile a pattern specification
+
+        Args:
+            spec: Pattern dictionary from the pattern file
+            lane_count: Number of lanes in the game
+        """
+        self.name = spec['name']
+        self.anchor = spec.get('anchor', 'random')
+        if self.anchor not in ('random', 'fixed'):
+            raise ValueError(f"Pattern '{self.name}' has unknown anchor '{self.anchor}'")
+
+        obstacles = spec.get('obstacles', [])
+        coins = spec.get('coins', [])
+
+        # Lanes are offsets from the anchor lane; delays push entities further above the screen
+        self.obstacle_lanes = np.array([o['lane'] % lane_count for o in obstacles], dtype=np.int8)
+        self.obstacle_ys = np.array([OBSTACLE_SPAWN_Y - o.get('delay', 0) for o in obstacles], dtype=np.float64)
+        self.coin_lanes = np.array([c['lane'] % lane_count for c in coins], dtype=np.int8)
+        self.coin_ys = np.array([COIN_SPAWN_Y - c.get('delay', 0) for c in coins], dtype=np.float64)
+
+
+class PatternLibrary:
+    """Weighted, data-driven obstacle patterns for each complexity tier
+
+    Patterns are declared in a JSON file (see data/patterns.json) with lane
+    offsets, y delays, optional coin placements and a weight per pattern
+    complexity tier. Everything is compiled into arrays at load time, so
+    choosing and stamping a pattern doesn't depend on how the pattern was
+    written or how many entities it has. Adding a pattern only needs an
+    edit to the JSON file.
+    """
+
+    _cache = {}
+
+    def __init__(self, spec):
+        """
+        Build a library from a parsed pattern file
+
+        Args:
+            spec: Dictionary with 'lanes' and a list of 'patterns'
+        """
+        self.lane_count = spec.get('lanes', 3)
+        self.patterns = [CompiledPattern(p, self.lane_count) for p in spec['patterns']]
+
+        # Per tier: the patterns it can use and their cumulative weights
+        tiers = {}
+        for pattern, pattern_spec in zip(self.patterns, spec['patterns']):
+            for tier, weight in pattern_spec.get('weights', {}).items():
+                if weight > 0:
+                    tiers.setdefault(int(tier), []).append((pattern, float(weight)))
+
+        if not tiers:
+            raise ValueError("Pattern library has no weighted patterns")
+
+        self.tiers = {}
+        for tier, entries in tiers.items():
+            weights = np.array([weight for _, weight in entries])
+            self.tiers[tier] = ([pattern for pattern, _ in entries], np.cumsum(weights) / weights.sum())
+        self.tier_levels = sorted(self.tiers)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATTERN_FILE):
+        """
+        Load (and cache) a pattern library from a JSON file
+
+        Args:
+            path: Path to the pattern file
+
+        Returns:
+            PatternLibrary: The compiled library
+        """
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+        cached = cls._cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, 'r') as f:
+            library = cls(json.load(f))
+        cls._cache[path] = (mtime, library)
+        return library
+
+    def choose(self, tier, rng):
+        """
+        Pick a weighted pattern for a complexity tier
+
+        Args:
+            tier: Pattern complexity tier; falls back to the closest lower tier
+            rng: random.Random-compatible generator
+
+        Returns:
+            tuple: (CompiledPattern, anchor lane)
+        """
+        if tier not in self.tiers:
+            lower = [level for level in self.tier_levels if level <= tier]
+            tier = lower[-1] if lower else self.tier_levels[0]
+
+        patterns, cumulative = self.tiers[tier]
+        index = int(np.searchsorted(cumulative, rng.random(), side='right'))
+        pattern = patterns[min(index, len(patterns) - 1)]
+
+        anchor = rng.randint(0, self.lane_count - 1) if pattern.anchor == 'random' else 0
+        return pattern, anchor
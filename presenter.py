@@ -1,10 +1,58 @@
 import traceback
+from collections import deque
+
+from events import COIN_COLLECTED, COLLISION, GAME_OVER
+
+# Event types the view and sound manager react to
+FEEDBACK_EVENTS = (COIN_COLLECTED, COLLISION, GAME_OVER)
 
 class GamePresenter:
-    def __init__(self, model, view, root):
+    """Drives the game loop against any RenderBackend (GameView, PygameView, ...)"""
+
+    def __init__(self, model, view, root, worker=None, sound_manager=None, on_menu=None,
+                 frame_scheduler=None, loop=None, bind_start_key=False):
+        """
+        Args:
+            model: GameModel to drive
+            view: RenderBackend to draw with
+            root: Tk root window used for scheduling and key bindings
+            worker: Optional SimulationWorker that steps the model
+            sound_manager: Optional SoundManager fed the feedback events
+            on_menu: Called when M is pressed on the game over screen; without
+                     it the model goes back to its start screen
+            frame_scheduler: Optional async_runtime.FrameScheduler; with it the
+                             game loop runs as a coroutine on loop
+            loop: asyncio event loop for the game loop coroutine
+            bind_start_key: Bind Space to start a game from the model's start
+                            screen (leave off when something else, like a
+                            menu, starts games)
+        """
         self.model = model
         self.view = view
         self.root = root
+        self.on_menu = on_menu
+        
+        # Optional SimulationWorker that steps the model on its own thread.
+        # Without one the model is stepped here, on the Tk thread.
+        self.worker = worker
+        
+        # Effects and audio react to the model's per-tick event batches. With a
+        # worker the batches arrive on the simulation thread, so they are copied
+        # into feedback_queue and handled on the Tk thread before the next draw.
+        self.sound_manager = sound_manager
+        self.feedback_queue = deque()
+        # Difficulty speed the music tempo was last synced to
+        self.music_speed = None
+        # GameRNG of the game the view was last set up for (start_game replaces it)
+        self.game_rng = None
+        if worker is not None:
+            self.model.events.subscribe(self._queue_feedback, FEEDBACK_EVENTS)
+        else:
+            self.model.events.subscribe(self._handle_feedback, FEEDBACK_EVENTS)
+        
+        # Replay playback (see start_replay)
+        self.replay_player = None
+        self.replay_speed = 1
         
         # Game state
         self.paused = False
@@ -18,100 +66,184 @@ class GamePresenter:
         self.root.bind('R', self.handle_restart)
         self.root.bind('m', self.handle_menu)
         self.root.bind('M', self.handle_menu)
-        self.root.bind('<space>', self.handle_space)
+        if bind_start_key:
+            self.root.bind('<space>', self.handle_space)
+        self.root.bind('f', self.handle_replay_speed)
         
-        # Set up game loop
+        # Set up game loop: root.after() callbacks by default, or a coroutine
+        # paced by frame_scheduler (see async_runtime.TkAsyncRuntime)
         self.update_id = None
+        self.frame_scheduler = frame_scheduler
+        self.loop = loop
+        self.task = None
     
+    # Key presses are timestamped and queued; the model applies them at the
+    # start of its next tick (queue_input is safe to call from any thread)
     def handle_left(self, event):
-        if self.model.game_state == "playing" and not self.paused:
-            self.model.move_player('left')
+        if self.model.game_state == "playing" and not self.paused and not self.replay_player:
+            self.model.queue_input('left')
     
     def handle_right(self, event):
-        if self.model.game_state == "playing" and not self.paused:
-            self.model.move_player('right')
+        if self.model.game_state == "playing" and not self.paused and not self.replay_player:
+            self.model.queue_input('right')
+    
+    def start_replay(self, player, speed=1):
+        """
+        Show a replay instead of a live game
+        
+        Args:
+            player: ReplayPlayer to step
+            speed: Simulation ticks per frame (1, 4 or 16)
+        """
+        self.replay_player = player
+        self.replay_speed = speed
+        self.model = player.model
+    
+    def handle_replay_speed(self, event):
+        """Cycle replay playback between 1x, 4x and 16x"""
+        if self.replay_player:
+            speeds = [1, 4, 16]
+            index = speeds.index(self.replay_speed) if self.replay_speed in speeds else -1
+            self.replay_speed = speeds[(index + 1) % len(speeds)]
+            print(f"Replay speed: {self.replay_speed}x")
+    
+    def _handle_feedback(self, events):
+        """Hand a batch of feedback events to the view and the sound manager"""
+        self.view.handle_events(events)
+        if self.sound_manager is not None:
+            self.sound_manager.handle_events(events)
+    
+    def _queue_feedback(self, events):
+        """Keep a copy of a tick's feedback events for the Tk thread (simulation thread)"""
+        self.feedback_queue.append(events.copy())
+    
+    def _drain_feedback(self):
+        """Handle the feedback events queued by the simulation thread"""
+        queue = self.feedback_queue
+        while queue:
+            self._handle_feedback(queue.popleft())
+    
+    def _sync_new_game(self):
+        """Set the view up for a new game once start_game has reseeded the model"""
+        rng = self.model.rng
+        if rng is not self.game_rng:
+            self.game_rng = rng
+            self.view.reset_hud()
+            self.view.set_effects_rng(rng.numpy('effects'))
+    
+    def _sync_music(self):
+        """Match the procedural music tempo to the difficulty speed when it changes"""
+        speed = self.model.difficulty_params['speed']
+        if speed != self.music_speed:
+            self.music_speed = speed
+            self.sound_manager.set_music_speed(speed)
+    
+    def _apply(self, func, *args):
+        """Run a model mutation, under the simulation lock when a worker is stepping the model"""
+        if self.worker:
+            return self.worker.submit(func, *args)
+        return func(*args)
     
     def handle_space(self, event):
         if self.model.game_state == "start" and not self.paused:
-            # Try different approaches to find the game instance
-            # First, check if we have a direct reference
-            try:
-                import __main__
-                if hasattr(__main__, 'game'):
-                    # Access the global game instance
-                    __main__.game.show_countdown(lambda: None)  # We don't need to call start_game here
-                    return
-            except:
-                pass
-                
-            # Try to find the game instance in the root's winfo_toplevel
-            root_toplevel = self.root.winfo_toplevel()
-            for widget in root_toplevel.winfo_children():
-                if hasattr(widget, 'show_countdown'):
-                    widget.show_countdown(lambda: None)  # We don't need to call start_game here
-                    return
-            
-            # If all else fails, just start the game directly
-            self.model.start_game()
+            self._apply(self.model.start_game)
         
     def handle_restart(self, event):
-        if self.model.game_state == "game_over":
-            self.model.start_game()
+        # A replay's model only ever plays back the recorded game
+        if self.model.game_state == "game_over" and not self.replay_player:
+            self._apply(self.model.start_game)
     
     def handle_menu(self, event):
         """Handle menu key press"""
         if self.model.game_state == "game_over":
-            # Find the main game instance
-            # Look for the main game instance in the root window's attributes
-            for widget in self.root.winfo_children():
-                if hasattr(widget, '_nametowidget'):
-                    # Try to find the main game instance
-                    if hasattr(self.root, 'master') and hasattr(self.root.master, 'show_main_menu'):
-                        self.root.master.show_main_menu()
-                        return
-            
-            # If we can't find the game instance through normal means, use a global approach
-            # This is a fallback to ensure the menu button works
-            for widget in self.root.winfo_toplevel().winfo_children():
-                if hasattr(widget, 'show_main_menu'):
-                    widget.show_main_menu()
-                    return
-                    
-            # Last resort - try to access through global namespace
+            if self.on_menu:
+                self.on_menu()
+            else:
+                self._apply(self.model.quit_to_menu)
+    
+    def start(self):
+        """Start the game loop if it isn't already running"""
+        # Music may have (re)started since the last sync
+        self.music_speed = None
+        if self.frame_scheduler is not None:
+            if self.task is None or self.task.done():
+                self.frame_scheduler.reset()
+                self.task = self.loop.create_task(self.run())
+        elif self.update_id is None:
+            self.update()
+    
+    def stop(self):
+        """Stop the game loop (the presenter can be started again later)"""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        if self.update_id is not None:
             try:
-                import __main__
-                if hasattr(__main__, 'game') and hasattr(__main__.game, 'show_main_menu'):
-                    __main__.game.show_main_menu()
-            except:
-                # If all else fails, restart the game
-                self.model.start_game()
+                self.root.after_cancel(self.update_id)
+            except Exception:
+                pass
+            self.update_id = None
+    
+    async def run(self):
+        """Game loop as a coroutine, one frame per frame_scheduler deadline"""
+        while self._run_frame():
+            await self.frame_scheduler.next_frame()
     
     def update(self):
-        """Main game loop update"""
+        """Main game loop update (root.after() driven)"""
+        # The callback that scheduled this call has fired
+        self.update_id = None
+        if self._run_frame():
+            self.update_id = self.root.after(33, self.update)  # ~30 FPS
+    
+    def _run_frame(self):
+        """
+        Step and draw one frame
+        
+        Returns:
+            bool: True if the loop should keep running
+        """
         try:
             # Check if root window still exists
             if not self._check_root_exists():
-                return
+                return False
                 
-            if self.model.game_state == "playing" and not self.paused:
+            if self.replay_player:
+                if not self.paused:
+                    self.replay_player.step(self.replay_speed)
+            elif self.worker:
+                # The worker steps the model; just keep it in sync with our pause state
+                self.worker.paused = self.paused
+            elif self.model.game_state == "playing" and not self.paused:
                 try:
                     self.model.update()
                 except Exception as e:
                     print(f"Error in model update: {e}")
                     traceback.print_exc()
-                
-                # Check if game is over
-                if self.model.game_state == "game_over":
-                    self.last_score = self.model.score
+            
+            if self.sound_manager is not None and self.model.game_state == "playing":
+                self._sync_music()
+            
+            # Check if game is over
+            if self.model.game_state == "game_over":
+                self.last_score = self.model.score
             
             # Update view with error handling
             try:
+                self._sync_new_game()
+                self._drain_feedback()
                 if self.model.game_state == "start":
                     self.view.draw_start_screen()
                 elif self.model.game_state == "playing":
-                    self.view.draw_game_screen(self.model)
+                    # Render the latest completed tick rather than the live model
+                    snapshot = self.model.snapshots.acquire()
+                    try:
+                        self.view.draw_game_screen(snapshot or self.model)
+                    finally:
+                        self.model.snapshots.release()
                 elif self.model.game_state == "game_over":
                     self.view.draw_game_over_screen(self.last_score)
+                self.view.present()
             except Exception as e:
                 print(f"Error in view update: {e}")
                 traceback.print_exc()
@@ -119,9 +251,8 @@ class GamePresenter:
             # Reset error count on successful update
             self.error_count = 0
             
-            # Schedule next update if root still exists
-            if self._check_root_exists():
-                self.update_id = self.root.after(33, self.update)  # ~30 FPS
+            # Keep going if root still exists
+            return self._check_root_exists()
                 
         except Exception as e:
             # Increment error count
@@ -131,9 +262,9 @@ class GamePresenter:
             
             # If we haven't had too many errors, try to continue
             if self.error_count < 5 and self._check_root_exists():
-                self.update_id = self.root.after(33, self.update)
-            else:
-                print("Too many errors, stopping game loop")
+                return True
+            print("Too many errors, stopping game loop")
+            return False
     
     def _check_root_exists(self):
         """Check if the root window still exists"""
@@ -0,0 +1,210 @@
+import os
+import time
+
+import pygame
+
+from effects import ParticleSystem, TransitionEffect
+from events import COIN_COLLECTED, COLLISION
+from render_backend import RenderBackend
+from view import (LANE_X, PLAYER_Y, BG_COLOR, LANE_COLOR, UI_BG_COLOR,
+                  UI_TEXT_COLOR, PLAYER_COLOR, COIN_COLOR, OBSTACLE_COLOR)
+
+
+class PygameView(RenderBackend):
+    """pygame Surface implementation of the render backend
+
+    Sprites are rendered once up front and blitted every frame, so the cost
+    of a frame is one fill plus one blit per entity instead of creating and
+    deleting canvas items. Particles and transitions from effects.py are
+    drawn on top of the scene.
+    """
+
+    def __init__(self, width=400, height=600, headless=False, rng=None):
+        """
+        Initialize the pygame renderer
+
+        Args:
+            width: Width of the render surface in pixels
+            height: Height of the render surface in pixels
+            headless: Use the SDL dummy video driver so frames can be rendered
+                      (and benchmarked) without a display
+            rng: NumPy Generator for particle effects; the presenter replaces it
+                 with each game's GameRNG.numpy('effects') (see set_effects_rng)
+        """
+        self.width = width
+        self.height = height
+        self.headless = headless
+
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+        pygame.display.init()
+        pygame.font.init()
+        self.surface = pygame.display.set_mode((width, height))
+        if not headless:
+            pygame.display.set_caption('Swipe Chaser')
+
+        # Effects drawn on top of the scene
+        self.particles = ParticleSystem(rng=rng)
+        self.transition = TransitionEffect(width, height)
+
+        # Fonts and cached text surfaces (only re-rendered when the text changes)
+        self.hud_font = pygame.font.SysFont('Arial', 16, bold=True)
+        self.title_font = pygame.font.SysFont('Arial', 24, bold=True)
+        self.body_font = pygame.font.SysFont('Arial', 14)
+        self.text_cache = {}
+
+        # Frame statistics for throughput benchmarks
+        self.frames_drawn = 0
+        self.animation_timer = time.time()
+
+        self._build_sprites()
+
+    def _build_sprites(self):
+        """Pre-render the background and entity sprites"""
+        # Background with lanes
+        self.background = pygame.Surface((self.width, self.height))
+        self.background.fill(pygame.Color(BG_COLOR))
+        for x in LANE_X:
+            pygame.draw.line(self.background, pygame.Color(LANE_COLOR), (x, 0), (x, self.height), 2)
+
+        # Player
+        self.player_sprite = pygame.Surface((40, 50), pygame.SRCALPHA)
+        pygame.draw.ellipse(self.player_sprite, (0, 0, 0, 128), (0, 35, 40, 10))  # Shadow
+        pygame.draw.rect(self.player_sprite, pygame.Color(PLAYER_COLOR), (0, 0, 40, 40))
+        pygame.draw.rect(self.player_sprite, pygame.Color('#B8860B'), (0, 0, 40, 40), 2)
+        pygame.draw.rect(self.player_sprite, pygame.Color('#B8860B'), (10, 5, 20, 10))  # Face
+        pygame.draw.rect(self.player_sprite, pygame.Color('#B8860B'), (15, 15, 10, 15))  # Body
+
+        # Obstacle
+        self.obstacle_sprite = pygame.Surface((40, 40), pygame.SRCALPHA)
+        pygame.draw.rect(self.obstacle_sprite, pygame.Color(OBSTACLE_COLOR), (0, 0, 40, 40))
+        pygame.draw.rect(self.obstacle_sprite, pygame.Color('#8B0000'), (0, 0, 40, 40), 2)
+        pygame.draw.line(self.obstacle_sprite, (255, 255, 255), (5, 5), (35, 35), 2)
+        pygame.draw.line(self.obstacle_sprite, (255, 255, 255), (35, 5), (5, 35), 2)
+
+        # Coin
+        self.coin_sprite = pygame.Surface((24, 24), pygame.SRCALPHA)
+        pygame.draw.circle(self.coin_sprite, pygame.Color(COIN_COLOR), (12, 12), 12)
+        pygame.draw.circle(self.coin_sprite, pygame.Color('#B8860B'), (12, 12), 12, 2)
+        dollar = self.hud_font.render("$", True, pygame.Color('#B8860B'))
+        self.coin_sprite.blit(dollar, dollar.get_rect(center=(12, 12)))
+
+    def _render_text(self, text, font, color=UI_TEXT_COLOR):
+        """Render text through the cache"""
+        key = (text, id(font), color)
+        rendered = self.text_cache.get(key)
+        if rendered is None:
+            # Keep the cache from growing without bound as the score changes
+            if len(self.text_cache) > 256:
+                self.text_cache.clear()
+            rendered = font.render(text, True, pygame.Color(color))
+            self.text_cache[key] = rendered
+        return rendered
+
+    def _draw_panel(self, title, lines, width=300, height=200):
+        """Draw a centered panel with a title and lines of text"""
+        panel = pygame.Rect(0, 0, width, height)
+        panel.center = (self.width // 2, self.height // 2)
+        pygame.draw.rect(self.surface, pygame.Color(UI_BG_COLOR), panel)
+        pygame.draw.rect(self.surface, pygame.Color(UI_TEXT_COLOR), panel, 1)
+
+        title_surface = self._render_text(title, self.title_font)
+        y = panel.top + 40
+        self.surface.blit(title_surface, title_surface.get_rect(center=(panel.centerx, y)))
+
+        y += 40
+        for line in lines:
+            line_surface = self._render_text(line, self.body_font)
+            self.surface.blit(line_surface, line_surface.get_rect(center=(panel.centerx, y)))
+            y += 20
+
+    def _draw_hud(self, model):
+        """Draw the score and difficulty boxes"""
+        pygame.draw.rect(self.surface, pygame.Color(UI_BG_COLOR), (10, 10, 120, 30))
+        pygame.draw.rect(self.surface, pygame.Color(UI_TEXT_COLOR), (10, 10, 120, 30), 1)
+        score_surface = self._render_text(f'Score: {model.score}', self.hud_font)
+        self.surface.blit(score_surface, score_surface.get_rect(center=(70, 25)))
+
+        difficulty_level = self._get_difficulty_level(model.difficulty_params)
+        pygame.draw.rect(self.surface, pygame.Color(UI_BG_COLOR), (270, 10, 120, 30))
+        pygame.draw.rect(self.surface, pygame.Color(UI_TEXT_COLOR), (270, 10, 120, 30), 1)
+        difficulty_surface = self._render_text(f'Difficulty: {difficulty_level}', self.body_font)
+        self.surface.blit(difficulty_surface, difficulty_surface.get_rect(center=(330, 25)))
+
+    def handle_events(self, events):
+        """Burst particles where coins were collected and where the player crashed"""
+        types = events.types
+        lanes = events.lanes
+        for i in range(events.count):
+            if types[i] == COIN_COLLECTED:
+                self.particles.create_coin_particles(LANE_X[lanes[i]], PLAYER_Y)
+            elif types[i] == COLLISION:
+                self.particles.create_obstacle_particles(LANE_X[lanes[i]], PLAYER_Y)
+
+    def set_effects_rng(self, rng):
+        """Draw particle randomness from a new game's effects stream"""
+        self.particles.rng = rng
+
+    def _draw_effects(self):
+        """Advance and draw particles and transitions"""
+        self.particles.update()
+        self.particles.draw(self.surface)
+        self.transition.update()
+        self.transition.draw(self.surface)
+
+    def draw_start_screen(self):
+        """Draw the start screen"""
+        self.surface.blit(self.background, (0, 0))
+        self._draw_panel("SWIPE CHASER", [
+            "Controls:",
+            "← → Arrow keys to move",
+            "Press SPACE to start",
+            "ESC to pause"
+        ])
+        self._draw_effects()
+        self.frames_drawn += 1
+
+    def draw_game_screen(self, model):
+        """Draw the game screen for the given model state"""
+        self.surface.blit(self.background, (0, 0))
+
+        blit = self.surface.blit
+        obstacle_sprite = self.obstacle_sprite
+        coin_sprite = self.coin_sprite
+
+        # Draw obstacles
+        for obs_id, lane, y in model.obstacles:
+            blit(obstacle_sprite, (LANE_X[lane] - 20, int(y) - 20))
+
+        # Draw coins
+        for coin_id, lane, y in model.coins:
+            blit(coin_sprite, (LANE_X[lane] - 12, int(y) - 12))
+
+        # Draw player
+        blit(self.player_sprite, (LANE_X[model.player_lane] - 20, PLAYER_Y - 20))
+
+        self._draw_effects()
+        self._draw_hud(model)
+        self.frames_drawn += 1
+
+    def draw_game_over_screen(self, score):
+        """Draw the game over panel over the last game frame"""
+        self._draw_panel("GAME OVER!", [
+            f"Final Score: {score}",
+            "",
+            "Press R to restart",
+            "Press M for main menu"
+        ], width=350, height=250)
+        self._draw_effects()
+        self.frames_drawn += 1
+
+    def present(self):
+        """Flip the finished frame to the display"""
+        pygame.display.flip()
+        # Keep the window responsive
+        pygame.event.pump()
+
+    def close(self):
+        """Shut down the pygame display"""
+        pygame.display.quit()
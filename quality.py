@@ -0,0 +1,103 @@
+from collections import namedtuple
+
+# Detail settings for one quality tier
+QualityTier = namedtuple('QualityTier', ['name', 'shadows', 'coin_labels', 'obstacle_marks', 'player_detail'])
+
+# Ordered from cheapest to most expensive; the top tier is the full game
+# screen. Stepping down drops the stippled player shadow first, then the
+# coin "$" labels, then the X marks on obstacles, then the player's details.
+QUALITY_TIERS = [
+    QualityTier('Flat', shadows=False, coin_labels=False, obstacle_marks=False, player_detail=False),
+    QualityTier('Minimal', shadows=False, coin_labels=False, obstacle_marks=False, player_detail=True),
+    QualityTier('Low', shadows=False, coin_labels=False, obstacle_marks=True, player_detail=True),
+    QualityTier('Medium', shadows=False, coin_labels=True, obstacle_marks=True, player_detail=True),
+    QualityTier('High', shadows=True, coin_labels=True, obstacle_marks=True, player_detail=True)
+]
+
+
+class QualityController:
+    """Adapts render detail to measured frame time
+
+    Frame times are smoothed with an exponential moving average. The tier
+    steps down once the average has stayed above the high-water mark for
+    downgrade_frames frames, and steps back up only after it has stayed
+    below the (much lower) low-water mark for upgrade_frames frames. The
+    gap between the two marks and the longer upgrade window keep the
+    controller from oscillating between tiers.
+    """
+
+    def __init__(self, budget=0.033, high_water=0.75, low_water=0.35,
+                 downgrade_frames=10, upgrade_frames=90, smoothing=0.1,
+                 tiers=QUALITY_TIERS, start_tier=None):
+        """
+        Initialize the quality controller
+
+        Args:
+            budget: Frame time budget in seconds
+            high_water: Fraction of the budget above which detail is reduced
+            low_water: Fraction of the budget below which detail is restored
+            downgrade_frames: Consecutive slow frames before stepping down
+            upgrade_frames: Consecutive fast frames before stepping up
+            smoothing: Weight of the newest sample in the moving average
+            tiers: Quality tiers ordered from cheapest to most expensive
+            start_tier: Initial tier index, defaults to the highest tier
+        """
+        self.budget = budget
+        self.high_water = high_water
+        self.low_water = low_water
+        self.downgrade_frames = downgrade_frames
+        self.upgrade_frames = upgrade_frames
+        self.smoothing = smoothing
+        self.tiers = tiers
+        self.tier_index = len(tiers) - 1 if start_tier is None else start_tier
+
+        self.average_frame_time = None
+        self.slow_frames = 0
+        self.fast_frames = 0
+        self.tier_changes = 0
+
+    @property
+    def tier(self):
+        """The active QualityTier"""
+        return self.tiers[self.tier_index]
+
+    def record_frame(self, frame_time):
+        """
+        Record a measured frame time and adjust the tier if needed
+
+        Args:
+            frame_time: Time the frame took, in seconds
+
+        Returns:
+            bool: True if the quality tier changed
+        """
+        if self.average_frame_time is None:
+            self.average_frame_time = frame_time
+        else:
+            self.average_frame_time += self.smoothing * (frame_time - self.average_frame_time)
+
+        if self.average_frame_time > self.budget * self.high_water:
+            self.slow_frames += 1
+            self.fast_frames = 0
+        elif self.average_frame_time < self.budget * self.low_water:
+            self.fast_frames += 1
+            self.slow_frames = 0
+        else:
+            self.slow_frames = 0
+            self.fast_frames = 0
+
+        if self.slow_frames >= self.downgrade_frames and self.tier_index > 0:
+            return self._set_tier(self.tier_index - 1)
+        if self.fast_frames >= self.upgrade_frames and self.tier_index < len(self.tiers) - 1:
+            return self._set_tier(self.tier_index + 1)
+        return False
+
+    def _set_tier(self, tier_index):
+        """Switch tiers and restart the hysteresis counters"""
+        print(f"Render quality: {self.tier.name} → {self.tiers[tier_index].name} "
+              f"(avg frame {self.average_frame_time * 1000:.1f} ms)")
+        self.tier_index = tier_index
+        self.slow_frames = 0
+        self.fast_frames = 0
+        self.tier_changes += 1
+        return True
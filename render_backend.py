@@ -0,0 +1,71 @@
+import abc
+
+# Game states and difficulty parameters, in the order the wire (state_codec),
+# shared-memory (shared_state) and archive (ml.analytics) formats store them
+GAME_STATES = ('start', 'playing', 'game_over')
+PARAM_NAMES = ('speed', 'obstacle_frequency', 'pattern_complexity', 'coin_value')
+
+# Difficulty levels from easiest to hardest, as returned by get_difficulty_level
+DIFFICULTY_LEVELS = ('Novice', 'Easy', 'Medium', 'Hard', 'Expert')
+
+class RenderBackend(abc.ABC):
+    """Interface shared by every renderer the GamePresenter can drive
+
+    The presenter only ever calls the methods below, so any backend that
+    implements them (the Tk canvas GameView, the pygame PygameView, ...)
+    can be swapped in without touching the game loop.
+    """
+
+    @abc.abstractmethod
+    def draw_start_screen(self):
+        """Draw the start screen"""
+
+    @abc.abstractmethod
+    def draw_game_screen(self, model):
+        """Draw the game screen for the given model state"""
+
+    @abc.abstractmethod
+    def draw_game_over_screen(self, score):
+        """Draw the game over screen"""
+
+    def present(self):
+        """Push the finished frame to the screen (no-op for retained-mode backends)"""
+        pass
+
+    def handle_events(self, events):
+        """React to a tick's game events (events.EventBuffer), e.g. with particles"""
+        pass
+
+    def reset_hud(self):
+        """Forget HUD state carried over from the previous game"""
+        pass
+
+    def set_effects_rng(self, rng):
+        """Draw effect randomness from a new game's GameRNG.numpy('effects') stream"""
+        pass
+
+    def _get_difficulty_level(self, difficulty_params):
+        """Convert difficulty parameters to a human-readable level"""
+        return get_difficulty_level(difficulty_params)
+
+
+def get_difficulty_level(difficulty_params):
+    """Convert difficulty parameters to a human-readable level"""
+    # Calculate overall difficulty based on speed and pattern complexity
+    speed = difficulty_params.get('speed', 5.0)
+    complexity = difficulty_params.get('pattern_complexity', 1.0)
+
+    # Calculate a difficulty score (0-100)
+    difficulty_score = ((speed - 3) / 7) * 50 + ((complexity - 1) / 2) * 50
+
+    # Convert to text
+    if difficulty_score < 20:
+        return DIFFICULTY_LEVELS[0]
+    elif difficulty_score < 40:
+        return DIFFICULTY_LEVELS[1]
+    elif difficulty_score < 60:
+        return DIFFICULTY_LEVELS[2]
+    elif difficulty_score < 80:
+        return DIFFICULTY_LEVELS[3]
+    else:
+        return DIFFICULTY_LEVELS[4]
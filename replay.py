@@ -0,0 +1,415 @@
+import bisect
+import contextlib
+from array import array
+import copy
+import glob
+import os
+import struct
+import tempfile
+import time
+import zlib
+
+from render_backend import PARAM_NAMES
+
+# File layout: header, then a zlib-compressed body of varints and doubles
+REPLAY_MAGIC = b'SCRP'
+REPLAY_VERSION = 1
+HEADER_FORMAT = '<4sBQ'  # magic, version, seed
+
+# Difficulty parameters, stored in PARAM_NAMES order
+PARAMS_FORMAT = '<' + 'd' * len(PARAM_NAMES)
+PARAMS_SIZE = struct.calcsize(PARAMS_FORMAT)
+
+# Lane-change directions packed into the low bit of each input
+DIRECTIONS = ('left', 'right')
+
+# Keep this many replays in data/replays
+MAX_SAVED_REPLAYS = 50
+
+
+@contextlib.contextmanager
+def _quiet(enabled=True):
+    """Silence the model's debug output while re-simulating"""
+    if not enabled:
+        yield
+        return
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _write_varint(out, value):
+    """Append an unsigned LEB128 varint to a bytearray"""
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(data, pos):
+    """Read an unsigned LEB128 varint, returning (value, new position)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class Replay:
+    """Everything needed to re-simulate one game
+
+    A game is fully determined by its seed, its starting difficulty
+    parameters, the parameter changes made by the 180-tick difficulty
+    update (recorded because the ML model's state isn't part of the replay)
+    and the player's lane changes.
+    """
+
+    def __init__(self, seed, initial_params, param_changes, inputs, final_tick=0, final_score=0):
+        """
+        Initialize a replay
+
+        Args:
+            seed: Seed of the game's random streams
+            initial_params: Difficulty parameters when the game started
+            param_changes: List of (tick, params) difficulty changes
+            inputs: List of (tick, direction) lane changes
+            final_tick: Tick the game ended on
+            final_score: Score the game ended with
+        """
+        self.seed = seed
+        self.initial_params = initial_params
+        self.param_changes = param_changes
+        self.inputs = inputs
+        self.final_tick = final_tick
+        self.final_score = final_score
+
+    @classmethod
+    def from_model(cls, model):
+        """Build a replay from a GameModel's logs"""
+        return cls(
+            seed=model.rng.seed,
+            initial_params=dict(model.initial_params),
+            param_changes=[(tick, dict(params)) for tick, params in model.param_log],
+            inputs=list(model.input_log),
+            final_tick=model.tick,
+            final_score=model.score
+        )
+
+    @property
+    def duration(self):
+        """Simulated length of the game in seconds"""
+        from model import TICK_SECONDS
+        return self.final_tick * TICK_SECONDS
+
+    def to_bytes(self):
+        """Encode the replay in the compact binary format"""
+        body = bytearray()
+        _write_varint(body, self.final_tick)
+        _write_varint(body, self.final_score)
+        body += struct.pack(PARAMS_FORMAT, *(float(self.initial_params[key]) for key in PARAM_NAMES))
+
+        # Difficulty changes: tick delta followed by the full parameter set
+        _write_varint(body, len(self.param_changes))
+        last_tick = 0
+        for tick, params in self.param_changes:
+            _write_varint(body, tick - last_tick)
+            body += struct.pack(PARAMS_FORMAT, *(float(params[key]) for key in PARAM_NAMES))
+            last_tick = tick
+
+        # Inputs: tick delta shifted left one bit with the direction in the low bit
+        _write_varint(body, len(self.inputs))
+        last_tick = 0
+        for tick, direction in self.inputs:
+            _write_varint(body, ((tick - last_tick) << 1) | DIRECTIONS.index(direction))
+            last_tick = tick
+
+        header = struct.pack(HEADER_FORMAT, REPLAY_MAGIC, REPLAY_VERSION, self.seed)
+        return header + zlib.compress(bytes(body), 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a replay produced by to_bytes()"""
+        header_size = struct.calcsize(HEADER_FORMAT)
+        magic, version, seed = struct.unpack_from(HEADER_FORMAT, data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("Not a Swipe Chaser replay")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+
+        body = zlib.decompress(data[header_size:])
+        final_tick, pos = _read_varint(body, 0)
+        final_score, pos = _read_varint(body, pos)
+        initial_params = dict(zip(PARAM_NAMES, struct.unpack_from(PARAMS_FORMAT, body, pos)))
+        pos += PARAMS_SIZE
+
+        count, pos = _read_varint(body, pos)
+        param_changes = []
+        tick = 0
+        for _ in range(count):
+            delta, pos = _read_varint(body, pos)
+            tick += delta
+            param_changes.append((tick, dict(zip(PARAM_NAMES, struct.unpack_from(PARAMS_FORMAT, body, pos)))))
+            pos += PARAMS_SIZE
+
+        count, pos = _read_varint(body, pos)
+        inputs = []
+        tick = 0
+        for _ in range(count):
+            packed, pos = _read_varint(body, pos)
+            tick += packed >> 1
+            inputs.append((tick, DIRECTIONS[packed & 1]))
+
+        return cls(seed, initial_params, param_changes, inputs, final_tick, final_score)
+
+    def save(self, path):
+        """Write the replay to a file"""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay from a file"""
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def save_replay(replay, replay_dir, keep=MAX_SAVED_REPLAYS):
+    """
+    Save a replay into a directory, pruning the oldest files
+
+    Args:
+        replay: Replay to save
+        replay_dir: Directory for replay files
+        keep: Number of replay files to keep
+
+    Returns:
+        str: Path of the saved file
+    """
+    os.makedirs(replay_dir, exist_ok=True)
+    path = os.path.join(replay_dir, f"replay_{int(time.time() * 1000)}_{replay.seed}.scr")
+    replay.save(path)
+
+    existing = sorted(glob.glob(os.path.join(replay_dir, 'replay_*.scr')), key=os.path.getmtime)
+    for old_path in existing[:-keep]:
+        os.remove(old_path)
+    return path
+
+
+class EventRecorder:
+    """Records the game's event stream during playback (EventBus subscriber)
+
+    Events are appended to typed arrays, one column per field, so a long
+    game costs a few bytes per event. Two simulations of the same replay
+    must produce the same stream, so comparing digest() values is a quick
+    check that a re-simulation has not drifted from the original game.
+    """
+
+    def __init__(self):
+        """Initialize an empty recording"""
+        self.ticks = array('q')
+        self.types = array('b')
+        self.entity_ids = array('q')
+        self.lanes = array('b')
+
+    def __len__(self):
+        return len(self.types)
+
+    def handle_events(self, events):
+        """Append a tick's batch of events"""
+        n = events.count
+        tick = events.tick
+        for i in range(n):
+            self.ticks.append(tick)
+            self.types.append(events.types[i])
+            self.entity_ids.append(events.entity_ids[i])
+            self.lanes.append(events.lanes[i])
+
+    def truncate(self, length):
+        """Drop events recorded after the first length events (used when seeking back)"""
+        for column in (self.ticks, self.types, self.entity_ids, self.lanes):
+            del column[length:]
+
+    def counts(self):
+        """Number of recorded events of each type, by event name"""
+        from events import EVENT_NAMES
+        return {name: self.types.count(event_type) for event_type, name in enumerate(EVENT_NAMES)}
+
+    def digest(self):
+        """CRC32 over the recorded stream"""
+        crc = 0
+        for column in (self.ticks, self.types, self.entity_ids, self.lanes):
+            crc = zlib.crc32(column.tobytes(), crc)
+        return crc
+
+
+class ReplayPlayer:
+    """Re-simulates a replay on a headless GameModel
+
+    The player can run a replay to the end at full speed, step it a few
+    ticks at a time (GamePresenter uses this for 1x/4x/16x viewing) and
+    seek to any tick. Seeking restores the closest earlier checkpoint;
+    checkpoints are captured every checkpoint_interval ticks as the replay
+    plays forward.
+    """
+
+    def __init__(self, replay, checkpoint_interval=300):
+        """
+        Initialize the player
+
+        Args:
+            replay: Replay to play
+            checkpoint_interval: Ticks between state checkpoints
+        """
+        from model import GameModel
+
+        self.replay = replay
+        self.checkpoint_interval = checkpoint_interval
+        self.input_ticks = [tick for tick, _ in replay.inputs]
+
+        # Playback must not touch the player's real data, so the model gets a
+        # throwaway data dir (removed when the player is garbage collected)
+        self.data_dir = tempfile.TemporaryDirectory(prefix='swipe_chaser_replay_')
+        with _quiet():
+            self.model = GameModel(seed=replay.seed, persist=False, data_dir=self.data_dir.name)
+            self.model.start_game(seed=replay.seed)
+        self.model.difficulty_params = dict(replay.initial_params)
+        self.model.initial_params = dict(replay.initial_params)
+        self.model.difficulty_schedule = dict(replay.param_changes)
+        self.model.publish_snapshot()
+        
+        self.recorder = EventRecorder()
+        self.model.events.subscribe(self.recorder.handle_events)
+
+        self.input_index = 0
+        self.checkpoints = {0: self._capture()}
+
+    @property
+    def finished(self):
+        """True once the replayed game has ended"""
+        return self.model.game_state != "playing" or self.model.tick >= self.replay.final_tick
+
+    def step(self, ticks=1):
+        """
+        Advance the replay
+
+        Args:
+            ticks: Number of simulation ticks to run
+
+        Returns:
+            int: Number of ticks actually run
+        """
+        model = self.model
+        inputs = self.replay.inputs
+        for ran in range(ticks):
+            if self.finished:
+                return ran
+
+            # Inputs recorded at this tick were applied before the next update
+            while self.input_index < len(inputs) and inputs[self.input_index][0] == model.tick:
+                model.move_player(inputs[self.input_index][1])
+                self.input_index += 1
+
+            model.update()
+
+            if model.tick % self.checkpoint_interval == 0 and model.tick not in self.checkpoints:
+                self.checkpoints[model.tick] = self._capture()
+        return ticks
+
+    def run_headless(self, quiet=True):
+        """
+        Re-simulate the rest of the replay at maximum speed
+
+        Args:
+            quiet: Silence the model's debug output
+
+        Returns:
+            GameModel: The model in its final state
+        """
+        with _quiet(quiet):
+            while not self.finished:
+                self.step(self.checkpoint_interval)
+        return self.model
+
+    def seek(self, tick, quiet=True):
+        """
+        Jump to a tick, restoring the nearest earlier checkpoint
+
+        Args:
+            tick: Target tick
+            quiet: Silence the model's debug output while fast-forwarding
+        """
+        tick = max(0, min(tick, self.replay.final_tick))
+        checkpoint_ticks = sorted(self.checkpoints)
+        start = checkpoint_ticks[bisect.bisect_right(checkpoint_ticks, tick) - 1]
+
+        # Going backwards, or forwards past a known checkpoint - restore it first
+        if tick < self.model.tick or start > self.model.tick:
+            self._restore(self.checkpoints[start])
+
+        with _quiet(quiet):
+            self.step(tick - self.model.tick)
+
+    def get_training_example(self):
+        """
+        Rebuild the difficulty model training example for a finished replay
+
+        Returns:
+            dict: player_metrics, difficulty_params and success_rating as
+            GameModel.end_game would pass them to DifficultyModel
+        """
+        duration = self.model.get_sim_time()
+        return {
+            'player_metrics': self.model.player_profiler.get_metrics(),
+            'difficulty_params': dict(self.model.difficulty_params),
+            'success_rating': min(1.0, (self.model.score / max(1, duration * 0.1)))
+        }
+
+    def _capture(self):
+        """Capture the model state needed to resume from the current tick"""
+        model = self.model
+        profiler = model.player_profiler
+        return {
+            'tick': model.tick,
+            'score': model.score,
+            'player_lane': model.player_lane,
+            'game_state': model.game_state,
+            'difficulty_params': dict(model.difficulty_params),
+            'obstacles': model.obstacles.copy(),
+            'coins': model.coins.copy(),
+            'obstacle_id_counter': model.obstacle_id_counter,
+            'coin_id_counter': model.coin_id_counter,
+            'input_log': len(model.input_log),
+            'param_log': len(model.param_log),
+            'events': len(self.recorder),
+            'rng': model.rng.getstate(),
+            # The profiler's clock is bound to the model, so copy everything else
+            'profiler': copy.deepcopy({k: v for k, v in vars(profiler).items() if k != 'clock'})
+        }
+
+    def _restore(self, checkpoint):
+        """Restore a state captured by _capture()"""
+        model = self.model
+        model.tick = checkpoint['tick']
+        model.score = checkpoint['score']
+        model.player_lane = checkpoint['player_lane']
+        model.game_state = checkpoint['game_state']
+        model.difficulty_params = dict(checkpoint['difficulty_params'])
+        model.obstacles = checkpoint['obstacles'].copy()
+        model.coins = checkpoint['coins'].copy()
+        model.obstacle_id_counter = checkpoint['obstacle_id_counter']
+        model.coin_id_counter = checkpoint['coin_id_counter']
+        del model.input_log[checkpoint['input_log']:]
+        del model.param_log[checkpoint['param_log']:]
+        self.recorder.truncate(checkpoint['events'])
+        model.rng.setstate(checkpoint['rng'])
+        vars(model.player_profiler).update(copy.deepcopy(checkpoint['profiler']))
+
+        self.input_index = bisect.bisect_left(self.input_ticks, model.tick)
+        model.publish_snapshot()
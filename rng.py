@@ -0,0 +1,61 @@
+import random
+import secrets
+
+import numpy as np
+
+# Independent random streams used by one game
+RNG_STREAMS = ('spawning', 'coins', 'effects')
+
+
+class GameRNG:
+    """Explicitly seeded random streams for a single game
+
+    One seed is split with NumPy's SeedSequence into an independent child
+    seed per stream, so drawing more numbers from one stream (say, extra
+    particle effects) never shifts what another stream (obstacle spawning)
+    produces. Each stream is available both as a random.Random for scalar
+    draws and as a NumPy Generator for vectorized bulk draws. Nothing here
+    touches the global random or numpy.random state, so parallel games
+    don't interfere with each other.
+    """
+
+    def __init__(self, seed=None):
+        """
+        Initialize the streams
+
+        Args:
+            seed: Integer seed; a random one is chosen (and kept in self.seed)
+                  when omitted so the game can still be reproduced later
+        """
+        if seed is None:
+            seed = secrets.randbits(63)
+        self.seed = seed
+
+        self._random = {}
+        self._numpy = {}
+        for name, child in zip(RNG_STREAMS, np.random.SeedSequence(seed).spawn(len(RNG_STREAMS))):
+            stream_seed = int.from_bytes(child.generate_state(4).tobytes(), 'little')
+            self._random[name] = random.Random(stream_seed)
+            self._numpy[name] = np.random.Generator(np.random.PCG64(child))
+
+        # Scalar streams as attributes for the hot paths
+        self.spawning = self._random['spawning']
+        self.coins = self._random['coins']
+        self.effects = self._random['effects']
+
+    def numpy(self, name):
+        """Get the NumPy Generator for a stream"""
+        return self._numpy[name]
+
+    def getstate(self):
+        """Capture the state of every stream"""
+        return {
+            name: (self._random[name].getstate(), self._numpy[name].bit_generator.state)
+            for name in RNG_STREAMS
+        }
+
+    def setstate(self, state):
+        """Restore a state captured with getstate()"""
+        for name, (random_state, numpy_state) in state.items():
+            self._random[name].setstate(random_state)
+            self._numpy[name].bit_generator.state = numpy_state
@@ -0,0 +1,130 @@
+import time
+import tkinter as tk
+from collections import deque
+
+
+class ScreenManager:
+    """Builds every screen once and switches between them
+
+    Each screen is a Frame built by its builder function the first time it
+    is registered; all screens share one grid cell of a fixed-size
+    container and switching is a tkraise(), so no widgets are destroyed or
+    recreated on a transition. Overlays (the pause menu) are built inside a
+    screen and shown with place()/place_forget(). Every switch is timed so
+    transition latency can be measured.
+    """
+
+    def __init__(self, root, width=400, height=600, bg='#121212'):
+        """
+        Initialize the screen manager
+
+        Args:
+            root: Tk root window
+            width: Width of the screen area in pixels
+            height: Height of the screen area in pixels
+            bg: Background color behind the screens
+        """
+        self.root = root
+        self.container = tk.Frame(root, width=width, height=height, bg=bg)
+        self.container.pack(fill=tk.BOTH, expand=True)
+        self.container.grid_propagate(False)
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
+
+        self.screens = {}
+        self.builders = {}
+        self.overlays = {}  # name -> (frame, place options)
+        self.current = None
+
+        # (from screen, to screen, seconds) for recent transitions
+        self.transition_times = deque(maxlen=1000)
+
+    def add_screen(self, name, builder):
+        """
+        Build and register a screen
+
+        Args:
+            name: Screen name used by show()
+            builder: Callable taking the parent container and returning the
+                     screen's Frame
+
+        Returns:
+            tk.Frame: The screen
+        """
+        frame = builder(self.container)
+        frame.grid(row=0, column=0, sticky='nsew')
+        self.screens[name] = frame
+        self.builders[name] = builder
+        return frame
+
+    def add_overlay(self, name, screen, builder, **place_options):
+        """
+        Build and register an overlay on top of a screen
+
+        Args:
+            name: Overlay name used by show_overlay()/hide_overlay()
+            screen: Name of the screen the overlay covers
+            builder: Callable taking the parent screen and returning a Frame
+            **place_options: Options passed to place() when the overlay is shown
+        """
+        frame = builder(self.screens[screen])
+        self.overlays[name] = (frame, place_options)
+        return frame
+
+    def show(self, name):
+        """
+        Switch to a screen
+
+        Returns:
+            float: Seconds the transition took, including Tk's redraw
+        """
+        start = time.perf_counter()
+        for overlay, _ in self.overlays.values():
+            overlay.place_forget()
+        self.screens[name].tkraise()
+        self.root.update_idletasks()
+        elapsed = time.perf_counter() - start
+
+        self.transition_times.append((self.current, name, elapsed))
+        self.current = name
+        return elapsed
+
+    def show_overlay(self, name):
+        """Show an overlay over its screen"""
+        frame, place_options = self.overlays[name]
+        frame.place(**place_options)
+        frame.tkraise()
+
+    def hide_overlay(self, name):
+        """Hide an overlay"""
+        self.overlays[name][0].place_forget()
+
+    def is_overlay_visible(self, name):
+        """True if an overlay is currently shown"""
+        return bool(self.overlays[name][0].winfo_manager())
+
+    def rebuild(self, name):
+        """Destroy and rebuild a screen (the old per-transition behavior, for benchmarks)"""
+        self.screens[name].destroy()
+        return self.add_screen(name, self.builders[name])
+
+    def get_transition_stats(self):
+        """
+        Summarize transition latency per destination screen
+
+        Returns:
+            dict: screen name -> count, mean, p95 and max in milliseconds
+        """
+        by_screen = {}
+        for _, name, elapsed in self.transition_times:
+            by_screen.setdefault(name, []).append(elapsed * 1000)
+        stats = {}
+        for name, times in by_screen.items():
+            times.sort()
+            stats[name] = {
+                'count': len(times),
+                'mean_ms': sum(times) / len(times),
+                'p95_ms': times[min(len(times) - 1, int(round(0.95 * (len(times) - 1))))],
+                'max_ms': times[-1]
+            }
+        return stats
@@ -0,0 +1,447 @@
+"""
+Multi-session game server for Swipe Chaser
+
+Hosts many GameModel sessions in one process and steps them all from a
+single batched tick loop. Thin clients connect over a localhost TCP or
+Unix socket, send lane changes and receive a compact state update for
+their session every tick.
+
+Wire protocol (little-endian, every message is framed by a uint32 byte
+length):
+
+  client -> server
+    INPUT    B type, B direction (0 = left, 1 = right)
+    RESTART  B type
+  server -> client
+    WELCOME  B type, I session id
+    STATE    B type, then a state_codec message (keyframe or delta)
+
+A client that sends anything else (an unknown type or direction, or a
+frame longer than MAX_CLIENT_MESSAGE) is disconnected.
+
+One STATE message is sent per tick of a game in progress (the last one
+carries the game over state). Each game starts with a keyframe, and
+state_codec.StateEncoder sends further keyframes periodically; in
+between, deltas carry only the speed and the spawned and despawned
+entities.
+
+Usage:
+    python server.py --port 8765
+    python server.py --unix /tmp/swipe_chaser.sock
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import struct
+import tempfile
+import time
+from collections import deque
+
+from model import GameModel, TICK_SECONDS
+from state_codec import StateEncoder, StateDecoder, DecodedState
+
+# Message types
+MSG_INPUT = 1
+MSG_RESTART = 2
+MSG_WELCOME = 16
+MSG_STATE = 17
+
+DIRECTIONS = ('left', 'right')
+
+FRAME_HEADER = struct.Struct('<I')
+INPUT_MESSAGE = struct.Struct('<BB')
+WELCOME_MESSAGE = struct.Struct('<BI')
+STATE_PREFIX = bytes([MSG_STATE])
+
+# Recent tick durations kept per session
+TICK_HISTORY = 300
+
+# A client whose unsent output grows past this many bytes is disconnected
+MAX_WRITE_BUFFER = 1 << 20
+
+# Longest message a client may send (INPUT is the longest)
+MAX_CLIENT_MESSAGE = INPUT_MESSAGE.size
+
+
+def frame(payload):
+    """Prefix a message with its length"""
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+async def read_message(reader, max_size=None):
+    """
+    Read one framed message
+
+    Args:
+        reader: asyncio.StreamReader
+        max_size: Longest message accepted, or None for no limit
+
+    Returns:
+        bytes: The message, or None at end of stream
+
+    Raises:
+        ValueError: If the frame is longer than max_size
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+        size = FRAME_HEADER.unpack(header)[0]
+        if max_size is not None and size > max_size:
+            raise ValueError(f"{size} byte message (the limit is {max_size})")
+        return await reader.readexactly(size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+def parse_client_message(message):
+    """
+    Decode a client message
+
+    Returns:
+        tuple: (MSG_INPUT, direction) or (MSG_RESTART, None)
+
+    Raises:
+        ValueError: If the message is malformed
+    """
+    if not message:
+        raise ValueError("empty message")
+    if message[0] == MSG_INPUT and len(message) == INPUT_MESSAGE.size:
+        _, direction = INPUT_MESSAGE.unpack(message)
+        if direction >= len(DIRECTIONS):
+            raise ValueError(f"unknown direction {direction}")
+        return MSG_INPUT, DIRECTIONS[direction]
+    if message[0] == MSG_RESTART and len(message) == 1:
+        return MSG_RESTART, None
+    raise ValueError(f"bad message of type {message[0]} and length {len(message)}")
+
+
+class Session:
+    """One player's GameModel and the encoder for its state stream"""
+
+    def __init__(self, session_id, model, writer):
+        self.session_id = session_id
+        self.model = model
+        self.writer = writer
+        self.encoder = StateEncoder()
+
+        # Seconds each model.update() took, and bytes sent
+        self.tick_times = deque(maxlen=TICK_HISTORY)
+        self.bytes_sent = 0
+
+    def restart(self):
+        """Start a new game; the next message is a keyframe"""
+        self.model.start_game()
+        self.encoder.force_keyframe()
+
+    def encode_state(self):
+        """Pack this tick's STATE message"""
+        return STATE_PREFIX + self.encoder.encode(self.model)
+
+    def get_stats(self):
+        """Tick latency summary in milliseconds"""
+        times = sorted(t * 1000 for t in self.tick_times)
+        if not times:
+            return {'ticks': 0, 'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'ticks': self.model.tick,
+            'mean_ms': sum(times) / len(times),
+            'p95_ms': times[min(len(times) - 1, int(round(0.95 * (len(times) - 1))))],
+            'max_ms': times[-1]
+        }
+
+
+class GameServer:
+    """Hosts GameModel sessions and steps them in one batched tick loop
+
+    Every tick the loop updates each playing session in turn (one process,
+    one thread, no per-session tasks), then writes each session's state message to
+    its socket without waiting on slow readers. Input arrives through
+    GameModel.queue_input and is applied at the start of the session's
+    next tick.
+    """
+
+    def __init__(self, max_sessions=256, tick_seconds=TICK_SECONDS, data_dir=None, quiet=True):
+        """
+        Initialize the server
+
+        Args:
+            max_sessions: Connections beyond this are refused
+            tick_seconds: Seconds between ticks; 0 runs ticks back to back
+            data_dir: Player data directory shared by the sessions (nothing is
+                      written, sessions don't persist); defaults to an empty
+                      temporary directory so every session starts as a new player
+            quiet: Silence the models' console output during ticks
+        """
+        self.max_sessions = max_sessions
+        self.tick_seconds = tick_seconds
+        self.data_dir = data_dir or tempfile.mkdtemp(prefix='swipe_chaser_server_')
+        self.quiet = quiet
+        self.devnull = open(os.devnull, 'w') if quiet else None
+
+        self.sessions = {}
+        self.next_session_id = 1
+        self.server = None
+        self.tick_task = None
+        self.connection_tasks = set()
+
+        # Aggregate throughput
+        self.total_ticks = 0
+        self.started_at = None
+        self.batch_times = deque(maxlen=TICK_HISTORY)
+
+    async def start(self, host='127.0.0.1', port=8765, unix_path=None):
+        """Start listening and run the tick loop"""
+        if unix_path:
+            self.server = await asyncio.start_unix_server(self._handle_client, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self._handle_client, host, port)
+        self.started_at = time.perf_counter()
+        self.tick_task = asyncio.get_running_loop().create_task(self._tick_loop())
+        return self.server
+
+    async def stop(self):
+        """Stop the tick loop and close every connection"""
+        if self.tick_task:
+            self.tick_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.tick_task
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        for session in list(self.sessions.values()):
+            session.writer.close()
+        # Closing the sockets ends each connection's read loop
+        await asyncio.gather(*self.connection_tasks, return_exceptions=True)
+        self.sessions.clear()
+        if self.devnull:
+            self.devnull.close()
+            self.devnull = None
+
+    def create_session(self, writer):
+        """Create and start a session for a new connection"""
+        session_id = self.next_session_id
+        self.next_session_id += 1
+        model = GameModel(seed=session_id, persist=False, data_dir=self.data_dir)
+        session = Session(session_id, model, writer)
+        with self._output():
+            session.restart()
+        self.sessions[session_id] = session
+        return session
+
+    async def _handle_client(self, reader, writer):
+        """Serve one connection: send its session id, then read its input"""
+        if len(self.sessions) >= self.max_sessions:
+            writer.close()
+            return
+
+        session = self.create_session(writer)
+        writer.write(frame(WELCOME_MESSAGE.pack(MSG_WELCOME, session.session_id)))
+        task = asyncio.current_task()
+        self.connection_tasks.add(task)
+        try:
+            while True:
+                message = await read_message(reader, MAX_CLIENT_MESSAGE)
+                if message is None:
+                    break
+                message_type, direction = parse_client_message(message)
+                if message_type == MSG_INPUT:
+                    session.model.queue_input(direction)
+                elif session.model.game_state == "game_over":
+                    with self._output():
+                        session.restart()
+        except ValueError as e:
+            print(f"Session {session.session_id} sent a bad message ({e}), disconnecting")
+        finally:
+            self.connection_tasks.discard(task)
+            self.sessions.pop(session.session_id, None)
+            writer.close()
+
+    def _output(self):
+        """Context that silences model output when running quietly"""
+        if self.quiet:
+            return contextlib.redirect_stdout(self.devnull)
+        return contextlib.nullcontext()
+
+    def tick(self):
+        """Step every playing session once and send the state messages"""
+        batch_start = time.perf_counter()
+        dropped = []
+        with self._output():
+            for session in list(self.sessions.values()):
+                model = session.model
+                if model.game_state != "playing":
+                    # Nothing changes outside a game
+                    continue
+                start = time.perf_counter()
+                model.update()
+                session.tick_times.append(time.perf_counter() - start)
+                self.total_ticks += 1
+                if not self._send(session, session.encode_state()):
+                    dropped.append(session.session_id)
+        self.batch_times.append(time.perf_counter() - batch_start)
+        # Reported outside _output() so quiet servers still log disconnects
+        for session_id in dropped:
+            print(f"Session {session_id} is not reading, disconnecting")
+
+    def _send(self, session, payload):
+        """
+        Queue a message for a client, dropping clients that stopped reading
+
+        Returns:
+            bool: False if the client was disconnected instead
+        """
+        writer = session.writer
+        if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.sessions.pop(session.session_id, None)
+            writer.close()
+            return False
+        message = frame(payload)
+        writer.write(message)
+        session.bytes_sent += len(message)
+        return True
+
+    async def _tick_loop(self):
+        """Run tick() at a fixed rate against absolute deadlines"""
+        next_tick = time.perf_counter()
+        while True:
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Error in server tick: {e}")
+            next_tick += self.tick_seconds
+            delay = next_tick - time.perf_counter()
+            if delay < -5 * max(self.tick_seconds, 0.001):
+                # Too far behind - don't try to catch up in a burst
+                next_tick = time.perf_counter()
+            await asyncio.sleep(max(0.0, delay))
+
+    def get_stats(self):
+        """
+        Aggregate and per-session statistics
+
+        Returns:
+            dict: sessions, ticks_per_second, batch mean/max in ms and a
+                  per-session dict of tick latency summaries
+        """
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        batches = [t * 1000 for t in self.batch_times]
+        return {
+            'sessions': len(self.sessions),
+            'ticks_per_second': self.total_ticks / elapsed if elapsed else 0.0,
+            'batch_mean_ms': sum(batches) / len(batches) if batches else 0.0,
+            'batch_max_ms': max(batches) if batches else 0.0,
+            'per_session': {session_id: {**session.get_stats(), 'bytes_sent': session.bytes_sent}
+                            for session_id, session in self.sessions.items()}
+        }
+
+
+class ClientState(DecodedState):
+    """A client's copy of its session, rebuilt from STATE messages
+
+    Has the attributes the views and tools.bot.BotPlayer read, and
+    move_player() sends the lane change to the server.
+    """
+
+    def __init__(self, send_input):
+        super().__init__()
+        self.send_input = send_input
+
+    def move_player(self, direction):
+        """Ask the server for a lane change"""
+        self.send_input(direction)
+
+
+class GameClient:
+    """Minimal client: connects, keeps a ClientState up to date and sends input"""
+
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.session_id = None
+        self.state = ClientState(self.send_input)
+        self.decoder = StateDecoder(self.state)
+        self.bytes_received = 0
+
+    async def connect(self, host='127.0.0.1', port=8765, unix_path=None):
+        """
+        Connect and wait for the session id
+
+        Raises:
+            ConnectionError: If the server closed the connection instead of
+                             welcoming it (e.g. it is full)
+        """
+        if unix_path:
+            self.reader, self.writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(host, port)
+        message = await read_message(self.reader)
+        if message is None or message[0] != MSG_WELCOME:
+            self.writer.close()
+            raise ConnectionError("Server refused the connection (is it full?)")
+        _, self.session_id = WELCOME_MESSAGE.unpack(message)
+        return self.session_id
+
+    def send_input(self, direction):
+        """Send a lane change"""
+        self.writer.write(frame(INPUT_MESSAGE.pack(MSG_INPUT, DIRECTIONS.index(direction))))
+
+    def restart(self):
+        """Ask for a new game after game over"""
+        self.writer.write(frame(bytes([MSG_RESTART])))
+
+    async def receive(self):
+        """
+        Wait for and apply the next state message
+
+        Returns:
+            bool: False when the server closed the connection
+        """
+        message = await read_message(self.reader)
+        if message is None:
+            return False
+        self.bytes_received += FRAME_HEADER.size + len(message)
+        if message[0] == MSG_STATE:
+            self.decoder.decode(message, 1)
+        return True
+
+    async def close(self):
+        """Close the connection"""
+        if self.writer:
+            self.writer.close()
+            with contextlib.suppress(ConnectionError):
+                await self.writer.wait_closed()
+
+
+async def serve(args):
+    """Run the server until interrupted, printing statistics periodically"""
+    server = GameServer(max_sessions=args.max_sessions, tick_seconds=args.tick_seconds)
+    await server.start(args.host, args.port, args.unix)
+    print(f"Serving on {args.unix or f'{args.host}:{args.port}'}")
+    try:
+        while True:
+            await asyncio.sleep(args.report_every)
+            stats = server.get_stats()
+            print(f"{stats['sessions']} sessions, {stats['ticks_per_second']:.0f} ticks/s, "
+                  f"batch mean {stats['batch_mean_ms']:.2f} ms max {stats['batch_max_ms']:.2f} ms")
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Swipe Chaser sessions for remote clients")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port to listen on")
+    parser.add_argument('--unix', default=None, help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument('--max-sessions', type=int, default=256, help="Most concurrent sessions")
+    parser.add_argument('--tick-seconds', type=float, default=TICK_SECONDS, help="Seconds per tick")
+    parser.add_argument('--report-every', type=float, default=5.0, help="Seconds between statistics lines")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+"""
+Shared-memory publishing of game state to other processes
+
+SharedStateWriter owns a multiprocessing.shared_memory block holding a
+small header and a ring of fixed-layout frames (tick, score, player lane,
+game state, difficulty parameters and the obstacle and coin arrays). The
+model writes one frame per tick; readers in other processes attach by
+name and map the frames as NumPy views, so nothing is pickled or copied
+to share a tick.
+
+Each frame is guarded by a sequence lock: the writer sets the frame's
+sequence number to an odd value before writing and to the next even value
+after, then bumps the header's frame counter. A reader checks the
+sequence before and after using a frame; if it changed (or was odd) the
+frame was torn and is discarded. The ring gives zero-copy readers several
+ticks to finish with a frame before the writer comes back around to it.
+The checks rely on the writer's stores becoming visible in order, which
+holds on x86; readers on weakly ordered CPUs should use read(), which
+copies the frame and re-checks it.
+"""
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from snapshot import MAX_SNAPSHOT_ENTITIES
+from render_backend import GAME_STATES, PARAM_NAMES, get_difficulty_level
+
+# Header layout: magic, layout version, frames in the ring, entity capacity, frames written
+MAGIC = 0x53434841  # "SCHA"
+LAYOUT_VERSION = 1
+HEADER_FIELDS = 5
+HEADER_BYTES = 64  # Header padded to a cache line
+WRITTEN = 4        # Index of the frame counter in the header
+
+# Frames in the ring by default
+RING_FRAMES = 8
+
+
+def frame_dtype(capacity):
+    """NumPy record layout of one frame for a given entity capacity"""
+    return np.dtype([
+        ('seq', '<u8'),
+        ('tick', '<i8'),
+        ('score', '<i8'),
+        ('player_lane', '<i8'),
+        ('game_state', '<i8'),
+        ('params', '<f8', (len(PARAM_NAMES),)),
+        ('n_obstacles', '<i8'),
+        ('n_coins', '<i8'),
+        ('obstacle_ids', '<i8', (capacity,)),
+        ('obstacle_ys', '<f4', (capacity,)),
+        ('coin_ids', '<i8', (capacity,)),
+        ('coin_ys', '<f4', (capacity,)),
+        ('obstacle_lanes', 'i1', (capacity,)),
+        ('coin_lanes', 'i1', (capacity,))
+    ], align=True)
+
+
+def _attach(name):
+    """Attach to an existing block without letting this process unlink it at exit"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers every attach with the resource tracker,
+        # which would destroy the writer's block when the reader exits.
+        # Skip the registration rather than undoing it afterwards: a forked
+        # reader shares the writer's tracker and would drop its entry too.
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = (
+            lambda name, rtype: None if rtype == 'shared_memory' else register(name, rtype))
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedStateWriter:
+    """Writes one frame per tick into a shared-memory ring (single writer)"""
+
+    def __init__(self, name=None, frames=RING_FRAMES, capacity=MAX_SNAPSHOT_ENTITIES):
+        """
+        Create the shared-memory block
+
+        Args:
+            name: Block name readers attach to; random by default (see .name)
+            frames: Frames in the ring
+            capacity: Obstacles and coins stored per frame (the frame layout is fixed, so
+                      extra ones are left out and counted in truncated)
+        """
+        self.frames = frames
+        self.capacity = capacity
+        dtype = frame_dtype(capacity)
+        self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                              size=HEADER_BYTES + frames * dtype.itemsize)
+        self.name = self.shm.name
+
+        self.header = np.ndarray((HEADER_FIELDS,), dtype='<i8', buffer=self.shm.buf)
+        self.ring = np.ndarray((frames,), dtype=dtype, buffer=self.shm.buf, offset=HEADER_BYTES)
+        self.ring['seq'] = 0
+        self.header[:] = (MAGIC, LAYOUT_VERSION, frames, capacity, 0)
+        self.written = 0
+
+        # Frames that had more obstacles or coins than capacity (the extras are left out)
+        self.truncated = 0
+
+        # Seconds each write took
+        self.write_times = deque(maxlen=300)
+
+    def write(self, model):
+        """
+        Publish the model's current state as the next frame
+
+        Args:
+            model: GameModel (or anything with the same attributes)
+        """
+        start = time.perf_counter()
+        count = self.written
+        frame = self.ring[count % self.frames]
+
+        frame['seq'] = 2 * count + 1  # Odd: being written
+        frame['tick'] = model.tick
+        frame['score'] = model.score
+        frame['player_lane'] = model.player_lane
+        frame['game_state'] = GAME_STATES.index(model.game_state)
+        params = model.difficulty_params
+        frame['params'] = [params[name] for name in PARAM_NAMES]
+        truncated = False
+        for prefix, store in (('obstacle', model.obstacles), ('coin', model.coins)):
+            n = min(len(store), self.capacity)
+            truncated = truncated or n < len(store)
+            frame[f'n_{prefix}s'] = n
+            frame[f'{prefix}_ids'][:n] = store.ids[:n]
+            frame[f'{prefix}_lanes'][:n] = store.lanes[:n]
+            frame[f'{prefix}_ys'][:n] = store.ys[:n]
+        frame['seq'] = 2 * count + 2  # Even: complete
+
+        self.written = count + 1
+        self.header[WRITTEN] = self.written
+        if truncated:
+            if not self.truncated:
+                print(f"WARNING: more than {self.capacity} entities in a tick, "
+                      f"shared state frames will leave some out")
+            self.truncated += 1
+        self.write_times.append(time.perf_counter() - start)
+
+    def get_write_stats(self):
+        """Mean and max write time in microseconds plus frames written and truncated"""
+        times = list(self.write_times)
+        return {
+            'mean_us': (sum(times) / len(times)) * 1e6 if times else 0.0,
+            'max_us': max(times) * 1e6 if times else 0.0,
+            'written': self.written,
+            'truncated': self.truncated
+        }
+
+    def close(self):
+        """Release and remove the shared-memory block"""
+        self.header = self.ring = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SharedFrame:
+    """Zero-copy view of one frame in the ring
+
+    Has the attributes the views read from a RenderSnapshot (tick,
+    game_state, score, player_lane, difficulty_params, difficulty_level,
+    obstacles and coins), plus the raw entity arrays. The arrays alias
+    shared memory: call is_valid() after using them to make sure the
+    writer didn't overwrite the frame in the meantime.
+    """
+
+    def __init__(self, record, expected_seq):
+        # Frame in the shared ring (None once detached by copy())
+        self._record = record
+        self.seq = expected_seq
+        self.tick = int(record['tick'])
+        self.score = int(record['score'])
+        self.player_lane = int(record['player_lane'])
+        self.game_state = GAME_STATES[int(record['game_state'])]
+        self.difficulty_params = dict(zip(PARAM_NAMES, record['params'].tolist()))
+        self.difficulty_level = get_difficulty_level(self.difficulty_params)
+
+        n_obstacles = int(record['n_obstacles'])
+        n_coins = int(record['n_coins'])
+        self.obstacle_ids = record['obstacle_ids'][:n_obstacles]
+        self.obstacle_lanes = record['obstacle_lanes'][:n_obstacles]
+        self.obstacle_ys = record['obstacle_ys'][:n_obstacles]
+        self.coin_ids = record['coin_ids'][:n_coins]
+        self.coin_lanes = record['coin_lanes'][:n_coins]
+        self.coin_ys = record['coin_ys'][:n_coins]
+
+    @property
+    def obstacles(self):
+        """Iterate obstacles as (id, lane, y) tuples like GameModel.obstacles"""
+        return zip(self.obstacle_ids.tolist(), self.obstacle_lanes.tolist(), self.obstacle_ys.tolist())
+
+    @property
+    def coins(self):
+        """Iterate coins as (id, lane, y) tuples like GameModel.coins"""
+        return zip(self.coin_ids.tolist(), self.coin_lanes.tolist(), self.coin_ys.tolist())
+
+    def is_valid(self):
+        """True if the writer hasn't touched the frame since it was acquired"""
+        return self._record is None or int(self._record['seq']) == self.seq
+
+    def copy(self):
+        """Detach the frame from shared memory"""
+        detached = SharedFrame(self._record.copy(), self.seq)
+        detached._record = None
+        return detached
+
+
+class SharedStateReader:
+    """Maps a SharedStateWriter's ring from another process"""
+
+    def __init__(self, name):
+        """
+        Attach to a writer's block
+
+        Args:
+            name: SharedStateWriter.name
+
+        Raises:
+            ValueError: If the block doesn't hold a compatible ring
+        """
+        self.shm = _attach(name)
+        self.header = np.ndarray((HEADER_FIELDS,), dtype='<i8', buffer=self.shm.buf)
+        magic, version, frames, capacity, _ = self.header.tolist()
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            self.close()
+            raise ValueError(f"{name} is not a Swipe Chaser state ring")
+        self.frames = frames
+        self.capacity = capacity
+        self.ring = np.ndarray((frames,), dtype=frame_dtype(capacity), buffer=self.shm.buf,
+                               offset=HEADER_BYTES)
+
+        # Frames rejected because the writer was changing them
+        self.torn = 0
+
+    @property
+    def frames_written(self):
+        """Number of frames the writer has published"""
+        return int(self.header[WRITTEN])
+
+    def acquire(self, retries=3):
+        """
+        Map the latest complete frame without copying
+
+        Args:
+            retries: Attempts before giving up on a frame being rewritten
+
+        Returns:
+            SharedFrame: The frame (check is_valid() after use), or None if
+                         nothing has been written or every attempt was torn
+        """
+        for _ in range(retries):
+            written = int(self.header[WRITTEN])
+            if written == 0:
+                return None
+            record = self.ring[(written - 1) % self.frames]
+            expected = 2 * written
+            if int(record['seq']) == expected:
+                frame = SharedFrame(record, expected)
+                if frame.is_valid():
+                    return frame
+            self.torn += 1
+        return None
+
+    def read(self, retries=3):
+        """
+        Copy the latest complete frame out of shared memory
+
+        Returns:
+            SharedFrame: A detached copy, or None (see acquire())
+        """
+        for _ in range(retries):
+            frame = self.acquire(retries)
+            if frame is None:
+                return None
+            copied = frame.copy()
+            if frame.is_valid():
+                return copied
+            self.torn += 1
+        return None
+
+    def close(self):
+        """Detach from the block (the writer removes it)"""
+        self.header = self.ring = None
+        self.shm.close()
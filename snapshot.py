@@ -0,0 +1,254 @@
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+
+import numpy as np
+
+from render_backend import get_difficulty_level
+
+# Entities each snapshot slot holds before it has to grow
+MAX_SNAPSHOT_ENTITIES = 256
+
+
+class RenderSnapshot:
+    """Read-only copy of everything a view needs to draw one game frame
+
+    Snapshots expose the same attributes the views read from GameModel
+    (player_lane, obstacles, coins, score, difficulty_params), so any
+    RenderBackend can draw either one. Entity positions are stored as
+    read-only NumPy arrays.
+    """
+
+    __slots__ = ('tick', 'game_state', 'score', 'player_lane',
+                 'difficulty_params', 'difficulty_level',
+                 'obstacle_lanes', 'obstacle_ys', 'coin_lanes', 'coin_ys')
+
+    @property
+    def obstacles(self):
+        """Iterate obstacles as (index, lane, y) tuples like GameModel.obstacles"""
+        return zip(range(len(self.obstacle_lanes)), self.obstacle_lanes.tolist(), self.obstacle_ys.tolist())
+
+    @property
+    def coins(self):
+        """Iterate coins as (index, lane, y) tuples like GameModel.coins"""
+        return zip(range(len(self.coin_lanes)), self.coin_lanes.tolist(), self.coin_ys.tolist())
+
+
+class _SnapshotSlot:
+    """Preallocated storage backing one side of the double buffer"""
+
+    def __init__(self, capacity):
+        self.capacity = 0
+        self.snapshot = RenderSnapshot()
+        self._allocate(capacity)
+
+        # Times the slot had to grow to fit the model's entities
+        self.grown = 0
+
+    def _allocate(self, capacity):
+        """(Re)allocate the slot arrays for a given number of entities"""
+        self.capacity = capacity
+        self.obstacle_lanes = np.zeros(capacity, dtype=np.int8)
+        self.obstacle_ys = np.zeros(capacity, dtype=np.float32)
+        self.coin_lanes = np.zeros(capacity, dtype=np.int8)
+        self.coin_ys = np.zeros(capacity, dtype=np.float32)
+
+    def fill(self, model):
+        """Copy the model state into this slot and return the snapshot"""
+        needed = max(len(model.obstacles), len(model.coins))
+        if needed > self.capacity:
+            # Never drop entities: the view must show everything the model collides with.
+            # Only the back slot is ever filled, so the reader can't be holding these arrays.
+            self._allocate(max(needed, 2 * self.capacity))
+            self.grown += 1
+
+        obstacle_count = self._copy_entities(model.obstacles, self.obstacle_lanes, self.obstacle_ys)
+        coin_count = self._copy_entities(model.coins, self.coin_lanes, self.coin_ys)
+
+        snapshot = self.snapshot
+        snapshot.tick = model.tick
+        snapshot.game_state = model.game_state
+        snapshot.score = model.score
+        snapshot.player_lane = model.player_lane
+        snapshot.difficulty_params = MappingProxyType(dict(model.difficulty_params))
+        snapshot.difficulty_level = get_difficulty_level(model.difficulty_params)
+        snapshot.obstacle_lanes = self._read_only(self.obstacle_lanes, obstacle_count)
+        snapshot.obstacle_ys = self._read_only(self.obstacle_ys, obstacle_count)
+        snapshot.coin_lanes = self._read_only(self.coin_lanes, coin_count)
+        snapshot.coin_ys = self._read_only(self.coin_ys, coin_count)
+        return snapshot
+
+    def _copy_entities(self, entities, lanes, ys):
+        """Copy lanes and ys from an EntityStore into the slot arrays"""
+        count = len(entities)
+        if count:
+            lanes[:count] = entities.lanes[:count]
+            ys[:count] = entities.ys[:count]
+        return count
+
+    @staticmethod
+    def _read_only(array, count):
+        """Return a read-only view of the first count elements"""
+        view = array[:count]
+        view.flags.writeable = False
+        return view
+
+
+class SnapshotBuffer:
+    """Double-buffered handoff of render snapshots from the simulation to a view
+
+    The simulation publishes into the back slot and then flips it to the
+    front; the view acquires the front slot for the duration of a frame.
+    Publishing never blocks: if the view is still holding the back slot the
+    publish is dropped and the view simply sees the previous completed tick.
+    Supports one writer and one reader.
+    """
+
+    def __init__(self, capacity=MAX_SNAPSHOT_ENTITIES):
+        """
+        Initialize the snapshot buffer
+
+        Args:
+            capacity: Obstacles and coins each slot holds up front; slots grow
+                      (see get_copy_stats) when the model has more
+        """
+        self._slots = [_SnapshotSlot(capacity), _SnapshotSlot(capacity)]
+        self._front = None   # Index of the latest completed slot
+        self._pinned = None  # Index of the slot held by the reader
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.published = 0
+        self.dropped = 0
+        self.copy_times = deque(maxlen=300)
+
+    def publish(self, model):
+        """
+        Copy the model state into the back slot and make it the front
+
+        Args:
+            model: GameModel (or anything with the same attributes)
+
+        Returns:
+            bool: True if the snapshot was published, False if it was dropped
+        """
+        start = time.perf_counter()
+
+        with self._lock:
+            back = 1 if self._front == 0 else 0
+            if back == self._pinned:
+                self.dropped += 1
+                return False
+
+        # The reader can only pin the front slot, so the back slot is ours
+        self._slots[back].fill(model)
+
+        with self._lock:
+            self._front = back
+
+        self.published += 1
+        self.copy_times.append(time.perf_counter() - start)
+        return True
+
+    def acquire(self):
+        """
+        Pin and return the latest completed snapshot
+
+        Returns:
+            RenderSnapshot: Latest snapshot, or None if nothing has been published
+        """
+        with self._lock:
+            if self._front is None:
+                return None
+            self._pinned = self._front
+            return self._slots[self._front].snapshot
+
+    def release(self):
+        """Release the snapshot returned by acquire()"""
+        with self._lock:
+            self._pinned = None
+
+    def get_copy_stats(self):
+        """
+        Get statistics about the per-tick copy cost
+
+        Returns:
+            dict: Mean and max copy time in microseconds, publish counts, the
+                  slot capacity and how many times a slot had to grow
+        """
+        times = list(self.copy_times)
+        return {
+            'mean_us': (sum(times) / len(times)) * 1e6 if times else 0.0,
+            'max_us': max(times) * 1e6 if times else 0.0,
+            'published': self.published,
+            'dropped': self.dropped,
+            'capacity': min(slot.capacity for slot in self._slots),
+            'grown': sum(slot.grown for slot in self._slots)
+        }
+
+
+class SimulationWorker:
+    """Steps a GameModel at a fixed tick rate on a background thread
+
+    The model publishes a snapshot at the end of every tick, so the Tk
+    thread can keep rendering the latest completed snapshot while the
+    worker simulates the next one. Player input goes through
+    GameModel.queue_input and is applied by the tick itself; anything else
+    that mutates the model (restarts) should go through submit() so it runs
+    under the same lock as the tick.
+    """
+
+    def __init__(self, model, tick_interval=0.033):
+        """
+        Initialize the simulation worker
+
+        Args:
+            model: GameModel to step
+            tick_interval: Seconds between simulation ticks
+        """
+        self.model = model
+        self.tick_interval = tick_interval
+        self.paused = False
+        self.lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start stepping the model on a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='simulation', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the worker thread and wait for it to exit"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, func, *args):
+        """Run func(*args) under the simulation lock"""
+        with self.lock:
+            return func(*args)
+
+    def _run(self):
+        """Fixed-rate tick loop"""
+        next_tick = time.perf_counter()
+        while not self._stop_event.is_set():
+            with self.lock:
+                if self.model.game_state == "playing" and not self.paused:
+                    try:
+                        self.model.update()
+                    except Exception as e:
+                        print(f"Error in simulation worker: {e}")
+
+            next_tick += self.tick_interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            elif delay < -5 * self.tick_interval:
+                # Too far behind - don't try to catch up in a burst
+                next_tick = time.perf_counter()
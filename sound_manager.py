@@ -1,13 +1,198 @@
-import pygame
+import hashlib
+import json
 import os
+import threading
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+from events import COIN_COLLECTED, COLLISION, GAME_OVER
+
+# Without pygame (or without an audio device) SoundManager keeps its API but plays nothing
+try:
+    import pygame
+except ImportError:
+    pygame = None
+
+# Generated PCM is cached here between runs
+AUDIO_CACHE_DIR = "assets/audio"
+
+# Bump when the synthesis code changes so stale cache files are ignored
+AUDIO_CACHE_VERSION = 1
+
+# Default sounds: name -> (generator method, generator parameters)
+DEFAULT_SOUNDS = {
+    'coin': ('_generate_coin_sound', {'duration': 0.1, 'frequency': 1000, 'amplitude': 0.5}),
+    'collision': ('_generate_collision_sound', {'duration': 0.2, 'amplitude': 1.0}),
+    'game_over': ('_generate_game_over_sound', {'duration': 0.5, 'start_frequency': 500,
+                                                'end_frequency': 100, 'amplitude': 0.5})
+}
+
+# How a sound shares the mixer:
+#   max_voices   - channels it may occupy at once; further plays retrigger its oldest voice
+#   priority     - voices may only be stolen by sounds of equal or higher priority
+#   min_interval - plays closer together than this (seconds) are dropped
+SoundRule = namedtuple('SoundRule', ['max_voices', 'priority', 'min_interval'])
+
+SOUND_RULES = {
+    'coin': SoundRule(max_voices=3, priority=1, min_interval=0.04),
+    'collision': SoundRule(max_voices=2, priority=2, min_interval=0.08),
+    'game_over': SoundRule(max_voices=1, priority=3, min_interval=0.5)
+}
+DEFAULT_SOUND_RULE = SoundRule(max_voices=2, priority=1, min_interval=0.05)
+
+# Mixer channels reserved for sound effects; the channel after them streams music
+MIXER_CHANNELS = 8
+MUSIC_CHANNEL = MIXER_CHANNELS
+
+# Name play_music() uses for the procedural music stream
+PROCEDURAL_MUSIC = 'procedural'
+
+
+class SoundMixer:
+    """Plays sound effects on a fixed pool of mixer channels
+    
+    The game thread only appends play requests to a deque (append and
+    popleft are atomic, so no lock is taken) and an audio worker thread
+    drains it, so queuing a sound never blocks a frame. The worker enforces
+    each sound's SoundRule: bursts of one sound are rate limited and capped
+    at a number of voices, and when every channel is busy the oldest voice
+    of the lowest priority sound is stolen.
+    """
+    
+    def __init__(self, num_channels=MIXER_CHANNELS, rules=None, max_pending=64):
+        """
+        Initialize the mixer and start its worker thread
+        
+        Args:
+            num_channels: Size of the channel pool
+            rules: Dictionary of sound name -> SoundRule (defaults to SOUND_RULES)
+            max_pending: Queued requests kept when the worker falls behind
+                         (the oldest are evicted first and counted as overflowed)
+        """
+        if pygame.mixer.get_num_channels() < num_channels:
+            pygame.mixer.set_num_channels(num_channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(num_channels)]
+        self.rules = rules if rules is not None else SOUND_RULES
+        
+        # What each channel is playing: (name, priority, start time) or None
+        self.voices = [None] * num_channels
+        self.last_played = {}
+        
+        self.requests = deque(maxlen=max_pending)
+        self.stats = {'played': 0, 'stolen': 0, 'rate_limited': 0, 'dropped': 0, 'overflowed': 0}
+        
+        self.running = True
+        self.wakeup = threading.Event()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+    
+    def request(self, name, sound):
+        """Queue a sound to be played by the worker (never blocks)"""
+        if len(self.requests) == self.requests.maxlen:
+            # The append below evicts the oldest request
+            self.stats['overflowed'] += 1
+        self.requests.append((name, sound))
+        self.wakeup.set()
+    
+    def stop(self):
+        """Stop the worker thread and silence the pool"""
+        self.running = False
+        self.wakeup.set()
+        self.worker.join(timeout=1.0)
+        for channel in self.channels:
+            channel.stop()
+    
+    def _run(self):
+        """Worker loop: sleep until requests arrive, then play them"""
+        while self.running:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            while self.requests and self.running:
+                name, sound = self.requests.popleft()
+                try:
+                    self._play(name, sound)
+                except Exception as e:
+                    print(f"Error playing sound {name}: {e}")
+    
+    def _play(self, name, sound):
+        """Apply the sound's rule and start it on a channel"""
+        rule = self.rules.get(name, DEFAULT_SOUND_RULE)
+        now = time.perf_counter()
+        
+        if now - self.last_played.get(name, float('-inf')) < rule.min_interval:
+            self.stats['rate_limited'] += 1
+            return
+        
+        # Forget voices whose channel has finished
+        for index, channel in enumerate(self.channels):
+            if self.voices[index] is not None and not channel.get_busy():
+                self.voices[index] = None
+        
+        own_voices = [index for index, voice in enumerate(self.voices)
+                      if voice is not None and voice[0] == name]
+        if len(own_voices) >= rule.max_voices:
+            # Retrigger this sound's oldest voice
+            index = min(own_voices, key=lambda i: self.voices[i][2])
+        else:
+            index = self._free_channel()
+            if index is None:
+                index = self._steal_channel(rule.priority)
+                if index is None:
+                    self.stats['dropped'] += 1
+                    return
+                self.stats['stolen'] += 1
+        
+        self.channels[index].play(sound)
+        self.voices[index] = (name, rule.priority, now)
+        self.last_played[name] = now
+        self.stats['played'] += 1
+    
+    def _free_channel(self):
+        """Index of an idle channel, or None"""
+        for index, voice in enumerate(self.voices):
+            if voice is None:
+                return index
+        return None
+    
+    def _steal_channel(self, priority):
+        """Index of the oldest voice of the lowest priority not above priority, or None"""
+        candidates = [index for index, voice in enumerate(self.voices) if voice[1] <= priority]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda i: (self.voices[i][1], self.voices[i][2]))
+
+
+class NullSoundMixer:
+    """Stand-in for SoundMixer when audio is unavailable; accepts and drops requests"""
+    
+    def __init__(self):
+        self.stats = {'played': 0, 'stolen': 0, 'rate_limited': 0, 'dropped': 0, 'overflowed': 0}
+    
+    def request(self, name, sound):
+        """Drop the request"""
+        self.stats['dropped'] += 1
+    
+    def stop(self):
+        """Nothing to stop"""
+        pass
+
 
 class SoundManager:
-    """Handles all sound effects and music for the game"""
+    """Handles all sound effects and music for the game
+    
+    The pygame mixer is only initialized when audio is first needed (loading
+    or playing a sound, starting music), so constructing a SoundManager is
+    free. If the mixer can't be initialized - no pygame, no audio device -
+    the manager switches to a NullSoundMixer and every call becomes a no-op.
+    """
     
     def __init__(self):
         """Initialize the sound manager"""
-        # Initialize pygame mixer
-        pygame.mixer.init()
+        # None until the mixer is first needed, then True/False
+        self.audio_available = None
+        self._audio_lock = threading.Lock()
         
         # Create dictionaries to store sounds and music
         self.sounds = {}
@@ -19,11 +204,52 @@ class SoundManager:
         self.sound_enabled = True
         self.music_enabled = True
         
-        # Create assets/audio directory if it doesn't exist
-        os.makedirs("assets/audio", exist_ok=True)
+        # Fixed seed for procedural noise so generated sounds are identical every run
+        self.noise_seed = 0
+        
+        # Background thread loading the default sounds
+        self.loader_thread = None
+        
+        # Channel pool that plays sound effects off the game thread (created with the mixer)
+        self.mixer = None
+        
+        # Procedural music streamed on its own channel, created on first use
+        self.music_generator = None
+        
+        # Sounds already reported missing, so the warning is printed once
+        self.missing_sounds = set()
+    
+    def _ensure_audio(self):
+        """
+        Initialize the mixer on first use
+        
+        Returns:
+            bool: True if audio is available
+        """
+        if self.audio_available is not None:
+            return self.audio_available
+        
+        # The default sound loader thread may get here at the same time as the game thread
+        with self._audio_lock:
+            if self.audio_available is None:
+                try:
+                    if pygame is None:
+                        raise RuntimeError("pygame is not installed")
+                    if not pygame.mixer.get_init():
+                        pygame.mixer.init()
+                    pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), MUSIC_CHANNEL + 1))
+                    self.mixer = SoundMixer()
+                    self.audio_available = True
+                except Exception as e:
+                    print(f"Audio unavailable, sound disabled: {e}")
+                    self.mixer = NullSoundMixer()
+                    self.audio_available = False
+        return self.audio_available
     
     def load_sound(self, name, path):
         """Load a sound effect"""
+        if not self._ensure_audio():
+            return False
         try:
             sound = pygame.mixer.Sound(path)
             sound.set_volume(self.sound_volume)
@@ -44,20 +270,48 @@ class SoundManager:
     
     def play_sound(self, name):
         """Play a sound effect"""
-        if not self.sound_enabled:
+        if not self.sound_enabled or not self._ensure_audio():
             return
             
-        if name in self.sounds:
-            self.sounds[name].play()
-        else:
-            print(f"Warning: Sound '{name}' not found")
+        sound = self.sounds.get(name)
+        if sound is not None:
+            self.mixer.request(name, sound)
+        # Default sounds still loading in the background are skipped quietly
+        elif self.loader_thread is None or not self.loader_thread.is_alive():
+            if name not in self.missing_sounds:
+                self.missing_sounds.add(name)
+                print(f"Warning: Sound '{name}' not found")
+    
+    def handle_events(self, events):
+        """Play sounds for a tick's game events (EventBus subscriber)"""
+        # One request per sound per tick; the mixer's rules handle bursts across ticks
+        if events.has(COIN_COLLECTED):
+            self.play_sound('coin')
+        if events.has(COLLISION):
+            self.play_sound('collision')
+        if events.has(GAME_OVER):
+            self.play_sound('game_over')
+    
+    def shutdown(self):
+        """Stop the sound effect worker and the music stream"""
+        if self.mixer is not None:
+            self.mixer.stop()
+        if self.music_generator is not None:
+            self.music_generator.stop()
     
     def play_music(self, name, loops=-1):
-        """Play a music track"""
-        if not self.music_enabled:
+        """Play a music track, or PROCEDURAL_MUSIC for the generated soundtrack"""
+        if not self.music_enabled or not self._ensure_audio():
             return
             
-        if name in self.music_tracks:
+        if name == PROCEDURAL_MUSIC and name not in self.music_tracks:
+            if self.music_generator is None:
+                from music_generator import MusicGenerator
+
+                self.music_generator = MusicGenerator(pygame.mixer.Channel(MUSIC_CHANNEL),
+                                                      volume=self.music_volume)
+            self.music_generator.start()
+        elif name in self.music_tracks:
             pygame.mixer.music.load(self.music_tracks[name])
             pygame.mixer.music.set_volume(self.music_volume)
             pygame.mixer.music.play(loops)
@@ -66,15 +320,32 @@ class SoundManager:
     
     def stop_music(self):
         """Stop the currently playing music"""
+        if not self.audio_available:
+            return
         pygame.mixer.music.stop()
+        if self.music_generator is not None:
+            self.music_generator.stop()
     
     def pause_music(self):
         """Pause the currently playing music"""
+        if not self.audio_available:
+            return
         pygame.mixer.music.pause()
+        if self.music_generator is not None:
+            self.music_generator.pause()
     
     def unpause_music(self):
         """Unpause the music"""
+        if not self.audio_available:
+            return
         pygame.mixer.music.unpause()
+        if self.music_generator is not None:
+            self.music_generator.unpause()
+    
+    def set_music_speed(self, speed):
+        """Sync the procedural music tempo to the game speed"""
+        if self.music_generator is not None:
+            self.music_generator.set_speed(speed)
     
     def set_sound_volume(self, volume):
         """Set the volume for sound effects (0.0 to 1.0)"""
@@ -85,7 +356,10 @@ class SoundManager:
     def set_music_volume(self, volume):
         """Set the volume for music (0.0 to 1.0)"""
         self.music_volume = max(0.0, min(1.0, volume))
-        pygame.mixer.music.set_volume(self.music_volume)
+        if self.audio_available:
+            pygame.mixer.music.set_volume(self.music_volume)
+        if self.music_generator is not None:
+            self.music_generator.set_volume(self.music_volume)
     
     def toggle_sound(self, enabled=None):
         """Toggle sound effects on/off"""
@@ -102,96 +376,143 @@ class SoundManager:
         else:
             self.music_enabled = enabled
             
-        if self.music_enabled:
-            pygame.mixer.music.set_volume(self.music_volume)
-        else:
-            pygame.mixer.music.set_volume(0)
+        volume = self.music_volume if self.music_enabled else 0
+        if self.audio_available:
+            pygame.mixer.music.set_volume(volume)
+        if self.music_generator is not None:
+            self.music_generator.set_volume(volume)
             
         return self.music_enabled
     
-    def create_default_sounds(self):
-        """Create some default sounds for testing when no sound files are available"""
-        # Generate a coin sound
-        coin_sound = pygame.mixer.Sound(buffer=self._generate_coin_sound())
-        coin_sound.set_volume(self.sound_volume)
-        self.sounds['coin'] = coin_sound
-        
-        # Generate a collision sound
-        collision_sound = pygame.mixer.Sound(buffer=self._generate_collision_sound())
-        collision_sound.set_volume(self.sound_volume)
-        self.sounds['collision'] = collision_sound
-        
-        # Generate a game over sound
-        game_over_sound = pygame.mixer.Sound(buffer=self._generate_game_over_sound())
-        game_over_sound.set_volume(self.sound_volume)
-        self.sounds['game_over'] = game_over_sound
-    
-    def _generate_coin_sound(self):
-        """Generate a simple coin sound using pygame.sndarray"""
-        import numpy as np
-        
-        sample_rate = 44100
-        duration = 0.1  # seconds
-        frequency = 1000
-        
-        # Generate a sine wave
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        coin_wave = 0.5 * np.sin(2 * np.pi * frequency * t)
-        
-        # Apply a quick fade out
-        fade_out = np.linspace(1, 0, len(coin_wave))
-        coin_wave = coin_wave * fade_out
+    def create_default_sounds(self, background=True):
+        """
+        Create the procedural default sounds used when no sound files are available
         
-        # Convert to 16-bit signed integers
-        coin_wave = (coin_wave * 32767).astype(np.int16)
+        Generated PCM is cached in assets/audio, so only the first run pays for
+        synthesis; later runs memory-map the cached buffers.
         
-        # Convert to stereo
-        coin_wave = np.column_stack((coin_wave, coin_wave))
+        Args:
+            background: Load/generate on a worker thread so startup isn't delayed
+            
+        Returns:
+            threading.Thread: The loader thread, or None when run inline
+        """
+        if not background:
+            self._load_default_sounds()
+            return None
         
-        return pygame.sndarray.make_sound(coin_wave)
+        self.loader_thread = threading.Thread(target=self._load_default_sounds, daemon=True)
+        self.loader_thread.start()
+        return self.loader_thread
     
-    def _generate_collision_sound(self):
-        """Generate a simple collision sound using pygame.sndarray"""
-        import numpy as np
-        
-        sample_rate = 44100
-        duration = 0.2  # seconds
-        
-        # Generate white noise
-        noise = np.random.uniform(-1, 1, int(sample_rate * duration))
-        
-        # Apply a quick fade out
-        fade_out = np.linspace(1, 0, len(noise))
-        noise = noise * fade_out
-        
-        # Convert to 16-bit signed integers
-        noise = (noise * 32767).astype(np.int16)
+    def _load_default_sounds(self):
+        """Load every default sound from the cache, generating missing ones"""
+        if not self._ensure_audio():
+            return
+        frequency, _, channels = pygame.mixer.get_init()
+        for name, (generator, params) in DEFAULT_SOUNDS.items():
+            try:
+                samples = self._load_cached_sound(name, generator, params, frequency, channels)
+                sound = pygame.sndarray.make_sound(samples)
+                sound.set_volume(self.sound_volume)
+                self.sounds[name] = sound
+            except Exception as e:
+                print(f"Error creating sound {name}: {e}")
+    
+    def _cache_path(self, name, params, sample_rate, channels):
+        """Cache file for a generated sound, keyed by everything that shapes its samples"""
+        key = json.dumps({
+            'name': name,
+            'params': params,
+            'sample_rate': sample_rate,
+            'channels': channels,
+            'noise_seed': self.noise_seed,
+            'version': AUDIO_CACHE_VERSION
+        }, sort_keys=True)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(AUDIO_CACHE_DIR, f"{name}_{digest}.npy")
+    
+    def _load_cached_sound(self, name, generator, params, sample_rate, channels):
+        """
+        Get the PCM for a generated sound, from the cache when possible
         
-        # Convert to stereo
-        noise = np.column_stack((noise, noise))
+        Returns:
+            numpy.ndarray: int16 samples shaped for the mixer
+        """
+        path = self._cache_path(name, params, sample_rate, channels)
+        if os.path.exists(path):
+            try:
+                return np.load(path, mmap_mode='r')
+            except Exception as e:
+                print(f"Error loading cached sound {path}: {e}")
         
-        return pygame.sndarray.make_sound(noise)
+        samples = getattr(self, generator)(sample_rate=sample_rate, channels=channels, **params)
+        try:
+            os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
+            # Write to a temporary file first so a crash never leaves a truncated cache entry
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                np.save(f, samples)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error caching sound {path}: {e}")
+        return samples
     
-    def _generate_game_over_sound(self):
-        """Generate a simple game over sound using pygame.sndarray"""
-        import numpy as np
+    @staticmethod
+    def _to_pcm(wave, channels):
+        """Scale a float wave in [-1, 1] to int16 samples with one column per channel"""
+        wave *= 32767
+        if channels == 1:
+            return wave.astype(np.int16)
+        pcm = np.empty((len(wave), channels), dtype=np.int16)
+        pcm[:] = wave[:, np.newaxis]
+        return pcm
+    
+    @staticmethod
+    def _fade_out(wave, ramp):
+        """Apply a linear fade to zero, turning ramp (holding 0..n-1) into the envelope in place"""
+        ramp *= -1.0 / max(1, len(ramp) - 1)
+        ramp += 1.0
+        wave *= ramp
+    
+    def _generate_coin_sound(self, sample_rate, channels, duration, frequency, amplitude):
+        """Generate a short sine blip with a fade out"""
+        ramp = np.arange(int(sample_rate * duration), dtype=np.float32)
         
-        sample_rate = 44100
-        duration = 0.5  # seconds
+        # Sine wave
+        wave = ramp * np.float32(2 * np.pi * frequency / sample_rate)
+        np.sin(wave, out=wave)
+        wave *= amplitude
         
-        # Generate a descending tone
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        frequency = np.linspace(500, 100, len(t))
-        game_over_wave = 0.5 * np.sin(2 * np.pi * frequency * t)
+        self._fade_out(wave, ramp)
+        return self._to_pcm(wave, channels)
+    
+    def _generate_collision_sound(self, sample_rate, channels, duration, amplitude):
+        """Generate a burst of white noise with a fade out"""
+        rng = np.random.default_rng(self.noise_seed)
+        n = int(sample_rate * duration)
         
-        # Apply a fade out
-        fade_out = np.linspace(1, 0, len(game_over_wave))
-        game_over_wave = game_over_wave * fade_out
+        # White noise in [-1, 1)
+        wave = rng.random(n, dtype=np.float32)
+        wave *= 2
+        wave -= 1
+        wave *= amplitude
         
-        # Convert to 16-bit signed integers
-        game_over_wave = (game_over_wave * 32767).astype(np.int16)
+        self._fade_out(wave, np.arange(n, dtype=np.float32))
+        return self._to_pcm(wave, channels)
+    
+    def _generate_game_over_sound(self, sample_rate, channels, duration, start_frequency,
+                                  end_frequency, amplitude):
+        """Generate a descending tone with a fade out"""
+        ramp = np.arange(int(sample_rate * duration), dtype=np.float32)
         
-        # Convert to stereo
-        game_over_wave = np.column_stack((game_over_wave, game_over_wave))
+        # Frequency sweeping from start to end, multiplied by time for the phase
+        wave = ramp * np.float32((end_frequency - start_frequency) / max(1, len(ramp) - 1))
+        wave += start_frequency
+        wave *= ramp
+        wave *= np.float32(2 * np.pi / sample_rate)
+        np.sin(wave, out=wave)
+        wave *= amplitude
         
-        return pygame.sndarray.make_sound(game_over_wave)
+        self._fade_out(wave, ramp)
+        return self._to_pcm(wave, channels)
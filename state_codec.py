@@ -0,0 +1,249 @@
+"""
+Keyframe + delta encoding of game state for streaming
+
+StateEncoder turns a GameModel into one compact binary message per tick:
+a keyframe with every entity every KEYFRAME_INTERVAL ticks (and whenever
+a new game starts or a tick is skipped), and a delta in between. Every
+entity moves down by the same speed each tick, so a delta only carries
+the tick's speed, the entities spawned since the previous tick and the
+ids that were despawned. StateDecoder applies the messages to a
+DecodedState, which has the attributes the views read from GameModel.
+
+Layout (little-endian):
+
+  header    B kind, B flags, I tick, i score, B lane, B state, f speed
+  params    f per PARAM_NAMES entry (speed, obstacle_frequency,
+            pattern_complexity, coin_value)
+            (only when FLAG_PARAMS is set: on keyframes and whenever the
+            difficulty parameters change)
+  keyframe  H obstacles, H coins, then per store id (u4), lane (u1) and
+            y (f4) columns
+  delta     H spawned obstacles, H spawned coins, H removed obstacles,
+            H removed coins, then the spawned entities' id, lane and y
+            columns and the removed ids (u4)
+"""
+import struct
+
+import numpy as np
+
+from entity_store import EntityStore
+from render_backend import GAME_STATES, PARAM_NAMES
+
+# Message kinds
+KEYFRAME = 1
+DELTA = 2
+
+# Header flags
+FLAG_PARAMS = 1
+
+# Ticks between keyframes (about three seconds at 30 ticks per second)
+KEYFRAME_INTERVAL = 90
+
+HEADER = struct.Struct('<BBIiBBf')
+PARAMS = struct.Struct(f'<{len(PARAM_NAMES)}f')
+KEYFRAME_COUNTS = struct.Struct('<HH')
+DELTA_COUNTS = struct.Struct('<HHHH')
+
+ID_DTYPE = np.dtype('<u4')
+LANE_DTYPE = np.dtype('u1')
+Y_DTYPE = np.dtype('<f4')
+
+
+def _columns(store, mask=None):
+    """Packed id, lane and y columns of a store (optionally masked)"""
+    n = len(store)
+    ids, lanes, ys = store.ids[:n], store.lanes[:n], store.ys[:n]
+    if mask is not None:
+        ids, lanes, ys = ids[mask], lanes[mask], ys[mask]
+    return [ids.astype(ID_DTYPE).tobytes(), lanes.astype(LANE_DTYPE).tobytes(), ys.astype(Y_DTYPE).tobytes()]
+
+
+def _newest(sorted_ids):
+    """Largest id in a sorted id array (0 when empty)"""
+    return sorted_ids[-1] if len(sorted_ids) else 0
+
+
+def _missing(ids, sorted_ids):
+    """Mask of ids that are not in sorted_ids"""
+    if not len(sorted_ids):
+        return np.ones(len(ids), dtype=bool)
+    index = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+    return sorted_ids[index] != ids
+
+
+class StateEncoder:
+    """Encodes one tick of a GameModel at a time
+
+    encode() must see every tick of a game; when it doesn't (a new game,
+    a skipped tick, or force_keyframe()), it sends a keyframe.
+    """
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        """
+        Initialize the encoder
+
+        Args:
+            keyframe_interval: Ticks between keyframes
+        """
+        self.keyframe_interval = keyframe_interval
+        self.last_tick = None
+        self.last_keyframe_tick = None
+        self.last_params = None
+        self.last_obstacle_ids = np.zeros(0, dtype=np.int64)
+        self.last_coin_ids = np.zeros(0, dtype=np.int64)
+
+        # Message counts and bytes, by kind
+        self.stats = {'keyframes': 0, 'deltas': 0, 'keyframe_bytes': 0, 'delta_bytes': 0}
+
+    def force_keyframe(self):
+        """Send a keyframe next (e.g. for a client that just joined)"""
+        self.last_tick = None
+
+    def encode(self, model):
+        """
+        Encode the model's current tick
+
+        Args:
+            model: GameModel (anything with tick, score, player_lane,
+                   game_state, difficulty_params and EntityStore obstacles
+                   and coins)
+
+        Returns:
+            bytes: A keyframe or delta message
+        """
+        params = tuple(float(model.difficulty_params[name]) for name in PARAM_NAMES)
+        keyframe = (self.last_tick is None or model.tick != self.last_tick + 1 or
+                    model.tick - self.last_keyframe_tick >= self.keyframe_interval)
+        flags = FLAG_PARAMS if keyframe or params != self.last_params else 0
+
+        parts = [HEADER.pack(KEYFRAME if keyframe else DELTA, flags, model.tick, model.score,
+                             model.player_lane, GAME_STATES.index(model.game_state),
+                             model.difficulty_params['speed'])]
+        if flags & FLAG_PARAMS:
+            parts.append(PARAMS.pack(*params))
+
+        obstacles, coins = model.obstacles, model.coins
+        obstacle_ids = obstacles.ids[:len(obstacles)].copy()
+        coin_ids = coins.ids[:len(coins)].copy()
+
+        if keyframe:
+            parts.append(KEYFRAME_COUNTS.pack(len(obstacles), len(coins)))
+            parts += _columns(obstacles)
+            parts += _columns(coins)
+            self.last_keyframe_tick = model.tick
+        else:
+            # Ids only grow within a game and removal keeps order, so the stores are
+            # sorted by id: spawned = ids past the last tick's newest, removed = missing ids
+            spawned_obstacles = obstacle_ids > _newest(self.last_obstacle_ids)
+            spawned_coins = coin_ids > _newest(self.last_coin_ids)
+            removed_obstacles = self.last_obstacle_ids[_missing(self.last_obstacle_ids, obstacle_ids)]
+            removed_coins = self.last_coin_ids[_missing(self.last_coin_ids, coin_ids)]
+
+            parts.append(DELTA_COUNTS.pack(int(spawned_obstacles.sum()), int(spawned_coins.sum()),
+                                           len(removed_obstacles), len(removed_coins)))
+            parts += _columns(obstacles, spawned_obstacles)
+            parts += _columns(coins, spawned_coins)
+            parts.append(removed_obstacles.astype(ID_DTYPE).tobytes())
+            parts.append(removed_coins.astype(ID_DTYPE).tobytes())
+
+        self.last_tick = model.tick
+        self.last_params = params
+        self.last_obstacle_ids = obstacle_ids
+        self.last_coin_ids = coin_ids
+
+        message = b''.join(parts)
+        kind = 'keyframe' if keyframe else 'delta'
+        self.stats[kind + 's'] += 1
+        self.stats[kind + '_bytes'] += len(message)
+        return message
+
+
+class DecodedState:
+    """Game state rebuilt from encoded messages
+
+    Has the attributes the views read from GameModel (tick, score,
+    player_lane, game_state, difficulty_params, obstacles and coins as
+    EntityStores), so any RenderBackend can draw it.
+    """
+
+    def __init__(self):
+        self.tick = 0
+        self.score = 0
+        self.player_lane = 1
+        self.game_state = "start"
+        self.difficulty_params = {name: 0.0 for name in PARAM_NAMES}
+        self.obstacles = EntityStore()
+        self.coins = EntityStore()
+
+
+class StateDecoder:
+    """Applies keyframes and deltas to a DecodedState"""
+
+    def __init__(self, state=None):
+        """
+        Initialize the decoder
+
+        Args:
+            state: DecodedState (or subclass) to update; a new one by default
+        """
+        self.state = state if state is not None else DecodedState()
+        self.synced = False
+
+    def decode(self, message, offset=0):
+        """
+        Apply one message
+
+        Args:
+            message: bytes-like message from StateEncoder.encode
+            offset: Where the message starts in the buffer
+
+        Returns:
+            DecodedState: The updated state
+
+        Raises:
+            ValueError: For a delta that doesn't follow the state's tick
+        """
+        kind, flags, tick, score, lane, state, speed = HEADER.unpack_from(message, offset)
+        offset += HEADER.size
+        decoded = self.state
+
+        if kind == DELTA and (not self.synced or tick != decoded.tick + 1):
+            raise ValueError(f"Delta for tick {tick} does not follow tick {decoded.tick}")
+
+        if flags & FLAG_PARAMS:
+            params = PARAMS.unpack_from(message, offset)
+            offset += PARAMS.size
+            decoded.difficulty_params.update(zip(PARAM_NAMES, params))
+        decoded.difficulty_params['speed'] = speed
+
+        def take(dtype, count):
+            nonlocal offset
+            column = np.frombuffer(message, dtype=dtype, count=count, offset=offset)
+            offset += column.nbytes
+            return column
+
+        if kind == KEYFRAME:
+            n_obstacles, n_coins = KEYFRAME_COUNTS.unpack_from(message, offset)
+            offset += KEYFRAME_COUNTS.size
+            for store, count in ((decoded.obstacles, n_obstacles), (decoded.coins, n_coins)):
+                store.clear()
+                store.bulk_insert(take(ID_DTYPE, count), take(LANE_DTYPE, count), take(Y_DTYPE, count))
+            self.synced = True
+        else:
+            counts = DELTA_COUNTS.unpack_from(message, offset)
+            offset += DELTA_COUNTS.size
+            spawned = [(take(ID_DTYPE, count), take(LANE_DTYPE, count), take(Y_DTYPE, count))
+                       for count in counts[:2]]
+            removed = [take(ID_DTYPE, count) for count in counts[2:]]
+            for store, new, gone in zip((decoded.obstacles, decoded.coins), spawned, removed):
+                # Everything moved by this tick's speed before the spawns
+                store.advance(speed)
+                if len(gone):
+                    store.keep(_missing(store.ids[:len(store)], np.sort(gone)))
+                store.bulk_insert(*new)
+
+        decoded.tick = tick
+        decoded.score = score
+        decoded.player_lane = lane
+        decoded.game_state = GAME_STATES[state]
+        return decoded
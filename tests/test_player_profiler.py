@@ -0,0 +1,36 @@
+"""
+Tests for PlayerProfiler session timing on the simulation clock
+"""
+import pytest
+
+from model import GameModel, TICK_SECONDS
+from ml.player_profiler import PlayerProfiler
+
+TICKS = 60
+
+
+def test_play_time_follows_sim_clock(tmp_path):
+    model = GameModel(seed=0, persist=False, data_dir=str(tmp_path))
+    model.start_game()
+    # Clear obstacles every tick so the game runs all the ticks
+    for _ in range(TICKS):
+        model.obstacles.clear()
+        model.update()
+    assert model.game_state == "playing"
+
+    model.end_game()
+    metrics = model.player_profiler.get_metrics()
+    assert metrics['play_time'] == pytest.approx(TICKS * TICK_SECONDS)
+
+
+def test_session_starting_at_zero_counts():
+    now = [0.0]
+    profiler = PlayerProfiler(clock=lambda: now[0])
+    profiler.start_session()
+    now[0] = 30.0
+    profiler.track_lane_change(0)
+    profiler.track_lane_change(1)
+    assert profiler.get_metrics()['lane_changes_per_minute'] == pytest.approx(4.0)
+
+    profiler.end_session()
+    assert profiler.play_time == pytest.approx(30.0)
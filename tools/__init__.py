@@ -0,0 +1,5 @@
+"""
+Developer tools for Swipe Chaser
+Benchmarks and offline analysis scripts; run them from the repository root
+with `python -m tools.<name>`
+"""
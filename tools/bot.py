@@ -0,0 +1,144 @@
+"""
+Scripted players for headless simulations
+"""
+import math
+import random
+from collections import namedtuple
+
+from view import PLAYER_Y
+
+# How a bot plays:
+#   reaction_ticks - ticks between noticing a threat and moving
+#   look_ahead     - how far above the player (px) the bot watches for obstacles
+#   error_rate     - chance a dodge goes the wrong way
+#   coin_greed     - chance per decision to steer toward a coin when safe
+SkillProfile = namedtuple('SkillProfile', ['name', 'reaction_ticks', 'look_ahead', 'error_rate', 'coin_greed'])
+
+SKILL_PROFILES = {
+    'novice': SkillProfile('novice', reaction_ticks=12, look_ahead=140, error_rate=0.25, coin_greed=0.1),
+    'casual': SkillProfile('casual', reaction_ticks=8, look_ahead=180, error_rate=0.12, coin_greed=0.3),
+    'skilled': SkillProfile('skilled', reaction_ticks=5, look_ahead=220, error_rate=0.05, coin_greed=0.6),
+    'expert': SkillProfile('expert', reaction_ticks=3, look_ahead=260, error_rate=0.01, coin_greed=0.9)
+}
+
+
+# An obstacle hits the player while it is less than this far from PLAYER_Y
+HIT_DISTANCE = 20
+
+
+class BotPlayer:
+    """Plays a GameModel by dodging obstacles and steering toward coins
+
+    The bot picks a target lane, waits reaction_ticks, then moves one lane
+    per tick toward it. Before every step it looks again and re-plans if
+    the next lane is no longer safe.
+    """
+
+    def __init__(self, profile, seed=None):
+        """
+        Initialize the bot
+
+        Args:
+            profile: SkillProfile describing how well the bot plays
+            seed: Seed for the bot's own decisions
+        """
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.pending = None  # (tick to start moving on, target lane)
+
+    def _first_hits(self, model):
+        """
+        Ticks until each lane's first visible obstacle reaches the player's row
+
+        Returns:
+            list: Per lane, the number of updates after which an obstacle
+                  first overlaps the player's row (inf if none is in view)
+        """
+        speed = max(model.difficulty_params['speed'], 1e-6)
+        top = PLAYER_Y - self.profile.look_ahead
+        hits = [math.inf] * 3
+        for _, lane, y in model.obstacles:
+            if top < y < PLAYER_Y + HIT_DISTANCE:
+                ticks = max(1, math.floor((PLAYER_Y - HIT_DISTANCE - y) / speed) + 1)
+                hits[lane] = min(hits[lane], ticks)
+        return hits
+
+    def _plan(self, lane, hits, delay):
+        """
+        Choose a lane to dodge to
+
+        Args:
+            lane: Current lane
+            hits: Result of _first_hits
+            delay: Updates before the first step is taken
+
+        Returns:
+            int: Target lane, or None if staying is as good as anything
+        """
+        candidates = []
+        for target in range(3):
+            if target == lane:
+                continue
+            step = 1 if target > lane else -1
+            path = list(range(lane + step, target + step, step))
+            # Every lane on the way must still be clear when the player gets there
+            if all(hits[through] > delay + i + 1 for i, through in enumerate(path)):
+                candidates.append((hits[target], -len(path), self.rng.random(), target))
+        if not candidates:
+            return None
+        best = max(candidates)
+        if best[0] <= hits[lane]:
+            return None
+        return best[3]
+
+    def act(self, model):
+        """
+        Decide on and apply at most one lane change for the coming tick
+
+        Args:
+            model: GameModel being played
+
+        Returns:
+            str: Direction moved, or None
+        """
+        profile = self.profile
+        lane = model.player_lane
+        hits = self._first_hits(model)
+
+        if self.pending and model.tick >= self.pending[0]:
+            target = self.pending[1]
+            step = 1 if target > lane else -1
+            # Obstacles may have come into view since the decision: look again
+            # before each step and re-plan if the next lane is no longer clear
+            if target != lane and hits[lane + step] > 1:
+                if lane + step == target:
+                    self.pending = None
+                model.move_player('right' if step > 0 else 'left')
+                return 'right' if step > 0 else 'left'
+            self.pending = None
+
+        if self.pending:
+            return None
+
+        if hits[lane] != math.inf:
+            if self.rng.random() < profile.error_rate:
+                # Misjudged: dodge to a random neighbouring lane
+                target = self.rng.choice([candidate for candidate in (lane - 1, lane + 1)
+                                          if 0 <= candidate <= 2])
+            else:
+                target = self._plan(lane, hits, profile.reaction_ticks)
+        else:
+            # Safe - maybe go for a coin in a lane that is clear all the way
+            coins = [(PLAYER_Y - y, coin_lane) for _, coin_lane, y in model.coins
+                     if 0 < PLAYER_Y - y < profile.look_ahead]
+            if not coins or self.rng.random() >= profile.coin_greed:
+                return None
+            target = min(coins)[1]
+            step = 1 if target > lane else -1
+            if target == lane or any(hits[through] != math.inf
+                                     for through in range(lane + step, target + step, step)):
+                return None
+
+        if target is not None:
+            self.pending = (model.tick + profile.reaction_ticks, target)
+        return None
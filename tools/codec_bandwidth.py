@@ -0,0 +1,122 @@
+"""
+State streaming bandwidth benchmark
+
+Plays headless bot games with the difficulty pinned to each difficulty
+level and encodes every tick with state_codec.StateEncoder. Compares the
+bytes per second of keyframe + delta streaming with sending a full
+keyframe every tick, and checks that StateDecoder reproduces the model's
+entities every tick.
+
+Usage:
+    python -m tools.codec_bandwidth --ticks 9000 --output codec_bandwidth.json
+"""
+import argparse
+import contextlib
+import os
+import tempfile
+
+import numpy as np
+
+from tools.common import write_results
+from tools.bot import BotPlayer, SKILL_PROFILES
+
+from model import GameModel, TICK_SECONDS
+from render_backend import get_difficulty_level
+from state_codec import StateEncoder, StateDecoder, KEYFRAME_INTERVAL
+
+# Difficulty parameters pinned for each level (checked against get_difficulty_level)
+TIER_PARAMS = {
+    'Novice': {'speed': 3.5, 'obstacle_frequency': 55, 'pattern_complexity': 1.0, 'coin_value': 1},
+    'Easy': {'speed': 5.0, 'obstacle_frequency': 40, 'pattern_complexity': 1.5, 'coin_value': 1},
+    'Medium': {'speed': 6.5, 'obstacle_frequency': 30, 'pattern_complexity': 2.0, 'coin_value': 2},
+    'Hard': {'speed': 8.0, 'obstacle_frequency': 22, 'pattern_complexity': 2.5, 'coin_value': 2},
+    'Expert': {'speed': 9.5, 'obstacle_frequency': 15, 'pattern_complexity': 3.0, 'coin_value': 3}
+}
+
+
+def max_position_error(decoded, model):
+    """Largest y difference between decoded and model entities (inf if they differ otherwise)"""
+    error = 0.0
+    for mirror, store in ((decoded.obstacles, model.obstacles), (decoded.coins, model.coins)):
+        n = len(store)
+        if len(mirror) != n or not np.array_equal(mirror.ids[:n], store.ids[:n]):
+            return float('inf')
+        if n:
+            error = max(error, float(np.abs(mirror.ys[:n] - store.ys[:n]).max()))
+    return error
+
+
+def run_tier(level, ticks, keyframe_interval, seed, data_dir):
+    """Stream one difficulty level for a number of ticks"""
+    params = TIER_PARAMS[level]
+    assert get_difficulty_level(params) == level, f"{params} is not {level}"
+
+    model = GameModel(seed=seed, persist=False, data_dir=data_dir)
+    bot = BotPlayer(SKILL_PROFILES['expert'], seed=seed)
+    streaming = StateEncoder(keyframe_interval)
+    full = StateEncoder(keyframe_interval=1)
+    decoder = StateDecoder()
+
+    games = 0
+    max_error = 0.0
+    entity_counts = []
+    for _ in range(ticks):
+        if model.game_state != "playing":
+            model.start_game(seed + games)
+            # No difficulty updates: keep the level's parameters for the whole game
+            model.difficulty_schedule = {}
+            model.difficulty_params = dict(params)
+            games += 1
+        bot.act(model)
+        model.update()
+
+        decoder.decode(streaming.encode(model))
+        full.encode(model)
+        max_error = max(max_error, max_position_error(decoder.state, model))
+        entity_counts.append(len(model.obstacles) + len(model.coins))
+
+    seconds = ticks * TICK_SECONDS
+    stats = streaming.stats
+    streamed_bytes = stats['keyframe_bytes'] + stats['delta_bytes']
+    full_bytes = full.stats['keyframe_bytes']
+    return {
+        'level': level,
+        'ticks': ticks,
+        'games': games,
+        'mean_entities': sum(entity_counts) / len(entity_counts),
+        'keyframes': stats['keyframes'],
+        'mean_keyframe_bytes': stats['keyframe_bytes'] / max(1, stats['keyframes']),
+        'mean_delta_bytes': stats['delta_bytes'] / max(1, stats['deltas']),
+        'streamed_bytes_per_second': streamed_bytes / seconds,
+        'full_bytes_per_second': full_bytes / seconds,
+        'reduction': full_bytes / streamed_bytes if streamed_bytes else 0.0,
+        'max_position_error': max_error
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keyframe + delta state streaming")
+    parser.add_argument('--ticks', type=int, default=9000, help="Ticks streamed per difficulty level")
+    parser.add_argument('--keyframe-interval', type=int, default=KEYFRAME_INTERVAL,
+                        help="Ticks between keyframes")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for games and bots")
+    parser.add_argument('--output', default='codec_bandwidth.json', help="Path of the JSON results file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        for level in TIER_PARAMS:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                row = run_tier(level, args.ticks, args.keyframe_interval, args.seed, data_dir)
+            results.append(row)
+            print(f"{level:<7} {row['mean_entities']:5.1f} entities  "
+                  f"keyframe+delta {row['streamed_bytes_per_second']:7.0f} B/s  "
+                  f"full {row['full_bytes_per_second']:7.0f} B/s  ({row['reduction']:.1f}x)  "
+                  f"max y error {row['max_position_error']:.4f}")
+
+    write_results(args.output, 'codec_bandwidth', results,
+                  keyframe_interval=args.keyframe_interval, tick_seconds=TICK_SECONDS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Helpers shared by the benchmark tools
+"""
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+# Make the game modules importable when a tool is run as a script
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def start_virtual_display(display=':99'):
+    """
+    Start an Xvfb server if there is no display but Xvfb is installed
+
+    Args:
+        display: X display name to use for the virtual server
+
+    Returns:
+        subprocess.Popen: The Xvfb process (stop it when done), or None if
+        a display already exists or Xvfb isn't available
+    """
+    if os.environ.get('DISPLAY') or not shutil.which('Xvfb'):
+        return None
+
+    process = subprocess.Popen(
+        ['Xvfb', display, '-screen', '0', '1024x768x24', '-nolisten', 'tcp'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['DISPLAY'] = display
+    # Give the server a moment to accept connections
+    time.sleep(0.5)
+    return process
+
+
+def stop_virtual_display(process):
+    """Stop an Xvfb process started by start_virtual_display"""
+    if process:
+        process.terminate()
+        process.wait()
+
+
+def get_commit():
+    """Get the current git commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values, fraction):
+    """Get a percentile of a list of numbers (nearest-rank)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def write_results(path, benchmark, results, **metadata):
+    """
+    Write benchmark results to a JSON file with environment metadata
+
+    Args:
+        path: Output file path
+        benchmark: Name of the benchmark
+        results: List of result rows
+        **metadata: Extra top-level fields (configuration etc.)
+    """
+    data = {
+        'benchmark': benchmark,
+        'commit': get_commit(),
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'display': os.environ.get('DISPLAY'),
+        **metadata,
+        'results': results
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+    print(f"Results written to {path}")
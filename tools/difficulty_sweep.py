@@ -0,0 +1,222 @@
+"""
+Parallel Monte Carlo sweeps for difficulty tuning
+
+Plays thousands of headless games with scripted bots of different skill
+levels against several difficulty tuning variants, spread over every core
+with a ProcessPoolExecutor. Games are grouped into chunks so each task
+amortizes model construction and pickling; each finished chunk is appended
+to a JSONL file straight away, and a rerun skips chunks already on disk,
+so an interrupted sweep picks up where it stopped.
+
+Usage:
+    python -m tools.difficulty_sweep --games 2000 --output sweep_results.jsonl
+"""
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tools.common import percentile
+from tools.bot import BotPlayer, SKILL_PROFILES
+
+# Difficulty tuning variants. 'forced_progression_scale' multiplies the score
+# thresholds in model.FORCED_PROGRESSION; 'heuristic_ranges' overrides
+# entries of ml.difficulty_model.HEURISTIC_RANGES.
+DEFAULT_VARIANTS = {
+    'baseline': {},
+    'gentle': {
+        'forced_progression_scale': 1.5,
+        'heuristic_ranges': {'speed': [3.0, 8.5], 'pattern_complexity': [1.0, 2.5]}
+    },
+    'aggressive': {
+        'forced_progression_scale': 0.6,
+        'heuristic_ranges': {'speed': [3.5, 10.0], 'obstacle_frequency': [50, 15]}
+    }
+}
+
+
+def _configure(model, variant):
+    """Apply a tuning variant to a GameModel"""
+    from model import FORCED_PROGRESSION
+
+    scale = variant.get('forced_progression_scale', 1.0)
+    model.forced_progression = [(min_score * scale, levels, speed, complexity)
+                                for min_score, levels, speed, complexity in FORCED_PROGRESSION]
+    for key, value_range in variant.get('heuristic_ranges', {}).items():
+        model.difficulty_model.heuristic_ranges[key] = tuple(value_range)
+
+
+def run_chunk(chunk):
+    """
+    Play one chunk of games (runs in a worker process)
+
+    Args:
+        chunk: Dictionary with chunk_id, variant name and settings, skill
+               profile name, list of seeds and max_ticks
+
+    Returns:
+        list: One result row per game
+    """
+    from model import GameModel, TICK_SECONDS
+
+    profile = SKILL_PROFILES[chunk['skill']]
+    rows = []
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), \
+            tempfile.TemporaryDirectory() as data_dir:
+        # One model per chunk; an empty data dir keeps every game a first game
+        model = GameModel(persist=False, data_dir=data_dir)
+        _configure(model, chunk['variant_settings'])
+
+        for seed in chunk['seeds']:
+            model.start_game(seed=seed)
+            bot = BotPlayer(profile, seed=seed)
+            while model.game_state == "playing" and model.tick < chunk['max_ticks']:
+                bot.act(model)
+                model.update()
+
+            minutes = max(model.tick * TICK_SECONDS / 60, 1e-9)
+            rows.append({
+                'chunk_id': chunk['chunk_id'],
+                'variant': chunk['variant'],
+                'skill': chunk['skill'],
+                'seed': seed,
+                'ticks': model.tick,
+                'survival_time': model.tick * TICK_SECONDS,
+                'died': model.game_state == "game_over",
+                'score': model.score,
+                'coins_collected': model.player_profiler.coins_collected,
+                'coin_rate': model.player_profiler.coins_collected / minutes,
+                'final_params': dict(model.difficulty_params)
+            })
+            model.game_state = "start"
+
+    return rows
+
+
+def build_chunks(variants, skills, games, chunk_size, max_ticks, base_seed):
+    """Split the sweep into chunks of games with deterministic seeds"""
+    chunks = []
+    for variant_name, settings in variants.items():
+        for skill in skills:
+            for start in range(0, games, chunk_size):
+                count = min(chunk_size, games - start)
+                chunks.append({
+                    'chunk_id': f"{variant_name}/{skill}/{start}",
+                    'variant': variant_name,
+                    'variant_settings': settings,
+                    'skill': skill,
+                    'seeds': [base_seed + start + i for i in range(count)],
+                    'max_ticks': max_ticks
+                })
+    return chunks
+
+
+def load_results(path):
+    """Load the rows already written by a previous (possibly interrupted) run"""
+    rows = []
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A partially written last line from an interrupted run
+                    pass
+    return rows
+
+
+def summarize(rows):
+    """
+    Aggregate result rows into distribution tables
+
+    Returns:
+        list: One summary row per (variant, skill)
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault((row['variant'], row['skill']), []).append(row)
+
+    summary = []
+    for (variant, skill), group in sorted(groups.items()):
+        survival = [row['survival_time'] for row in group]
+        scores = [row['score'] for row in group]
+        coin_rates = [row['coin_rate'] for row in group]
+        summary.append({
+            'variant': variant,
+            'skill': skill,
+            'games': len(group),
+            'death_rate': sum(row['died'] for row in group) / len(group),
+            'survival_mean': sum(survival) / len(group),
+            'survival_p10': percentile(survival, 0.1),
+            'survival_p50': percentile(survival, 0.5),
+            'survival_p90': percentile(survival, 0.9),
+            'score_mean': sum(scores) / len(group),
+            'score_p50': percentile(scores, 0.5),
+            'score_p90': percentile(scores, 0.9),
+            'coin_rate_mean': sum(coin_rates) / len(group)
+        })
+    return summary
+
+
+def print_summary(summary):
+    """Print the distribution table"""
+    print(f"{'variant':<12} {'skill':<8} {'games':>6} {'dead%':>6} "
+          f"{'surv p10':>9} {'p50':>7} {'p90':>7} {'score p50':>10} {'p90':>6} {'coins/min':>10}")
+    for row in summary:
+        print(f"{row['variant']:<12} {row['skill']:<8} {row['games']:>6} {row['death_rate'] * 100:>5.1f}% "
+              f"{row['survival_p10']:>8.1f}s {row['survival_p50']:>6.1f}s {row['survival_p90']:>6.1f}s "
+              f"{row['score_p50']:>10} {row['score_p90']:>6} {row['coin_rate_mean']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo difficulty tuning sweep")
+    parser.add_argument('--games', type=int, default=500,
+                        help="Games per (variant, skill) combination")
+    parser.add_argument('--skills', nargs='+', default=list(SKILL_PROFILES), choices=list(SKILL_PROFILES))
+    parser.add_argument('--variants-file', help="JSON file of tuning variants (defaults to the built-in set)")
+    parser.add_argument('--chunk-size', type=int, default=25, help="Games per worker task")
+    parser.add_argument('--max-ticks', type=int, default=18000, help="Tick limit per game (18000 ≈ 10 minutes)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument('--seed', type=int, default=0, help="Base seed")
+    parser.add_argument('--output', default='sweep_results.jsonl', help="Per-game results (appended)")
+    parser.add_argument('--summary', default='sweep_summary.json', help="Aggregated distribution tables")
+    args = parser.parse_args()
+
+    variants = DEFAULT_VARIANTS
+    if args.variants_file:
+        with open(args.variants_file, 'r') as f:
+            variants = json.load(f)
+
+    chunks = build_chunks(variants, args.skills, args.games, args.chunk_size, args.max_ticks, args.seed)
+    rows = load_results(args.output)
+    done = {row['chunk_id'] for row in rows}
+    pending = [chunk for chunk in chunks if chunk['chunk_id'] not in done]
+    print(f"{len(chunks)} chunks, {len(chunks) - len(pending)} already done, "
+          f"running {len(pending)} on {args.workers} workers")
+
+    with open(args.output, 'a') as out, ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(run_chunk, chunk) for chunk in pending]
+        for completed, future in enumerate(as_completed(futures), 1):
+            chunk_rows = future.result()
+            # Write the whole chunk at once so a resumed run never sees half a chunk
+            out.write(''.join(json.dumps(row) + '\n' for row in chunk_rows))
+            out.flush()
+            rows.extend(chunk_rows)
+            if completed % 10 == 0 or completed == len(futures):
+                print(f"  {completed}/{len(futures)} chunks")
+
+    summary = summarize(rows)
+    print_summary(summary)
+    with open(args.summary, 'w') as f:
+        json.dump(summary, f, indent=2)
+    print(f"Summary written to {args.summary}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+Input latency benchmark: keypress to visible frame
+
+Runs the real Tk game loop (GameModel, GameView and GamePresenter, under
+Xvfb when there is no display and Xvfb is installed) and injects
+synthetic <Left>/<Right> key events with event_generate. For every press
+it records when the model applied the lane change and when Tk redrew
+the GameView frame showing the player in the new lane, and reports
+latency histograms for each entity density.
+
+Entities are frozen in place (speed 0, no spawning) above the player so
+the density stays constant and the game can't end mid-measurement.
+
+Usage:
+    python -m tools.input_latency --densities 0 50 200 800 --presses 100 --output input_latency.json
+"""
+import argparse
+import contextlib
+import io
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from tools.common import (start_virtual_display, stop_virtual_display,
+                          percentile, write_results)
+
+import tkinter as tk
+
+from model import GameModel
+from view import GameView, BG_COLOR
+from presenter import GamePresenter
+from snapshot import SnapshotBuffer, MAX_SNAPSHOT_ENTITIES
+
+# Histogram bucket edges in milliseconds (the last bucket is open-ended)
+HISTOGRAM_EDGES_MS = [0, 5, 10, 20, 33, 50, 67, 100, 150, 250]
+
+
+def populate(model, density, seed=0):
+    """
+    Fill the model with a fixed number of motionless entities
+
+    Args:
+        model: GameModel with a game in progress
+        density: Total obstacles plus coins (two obstacles per coin)
+        seed: Seed for entity placement
+    """
+    rng = np.random.default_rng(seed)
+    n_obstacles = density * 2 // 3
+    n_coins = density - n_obstacles
+
+    model.obstacles.clear()
+    model.coins.clear()
+    # Keep everything well above the player (y=500) so nothing collides or is collected
+    model.obstacles.bulk_insert(np.arange(1, n_obstacles + 1), rng.integers(0, 3, n_obstacles),
+                                rng.uniform(-40, 420, n_obstacles))
+    model.coins.bulk_insert(np.arange(1, n_coins + 1), rng.integers(0, 3, n_coins),
+                            rng.uniform(-40, 420, n_coins))
+
+    # Freeze the scene: no movement, no spawns, no difficulty updates
+    model.difficulty_params['speed'] = 0.0
+    model.difficulty_params['obstacle_frequency'] = 10 ** 9
+    model.difficulty_schedule = {}
+
+
+def histogram(latencies_ms):
+    """Count latencies into HISTOGRAM_EDGES_MS buckets"""
+    buckets = []
+    for i, low in enumerate(HISTOGRAM_EDGES_MS):
+        high = HISTOGRAM_EDGES_MS[i + 1] if i + 1 < len(HISTOGRAM_EDGES_MS) else None
+        label = f"{low}-{high}" if high is not None else f"{low}+"
+        count = sum(1 for value in latencies_ms if value >= low and (high is None or value < high))
+        buckets.append({'bucket_ms': label, 'count': count})
+    return buckets
+
+
+def summarize(latencies_ms):
+    """Mean and percentiles of a list of latencies in milliseconds"""
+    if not latencies_ms:
+        return {'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+    return {
+        'mean_ms': sum(latencies_ms) / len(latencies_ms),
+        'p50_ms': percentile(latencies_ms, 0.5),
+        'p95_ms': percentile(latencies_ms, 0.95),
+        'max_ms': max(latencies_ms)
+    }
+
+
+class LatencyProbe:
+    """Injects key presses into a running game and times their effects
+
+    Each press is generated at the tail of the Tk event queue, exactly as a
+    real key event would arrive, and then polled for every millisecond
+    until GameView reports the player drawn in the target lane. Presses
+    are spaced by a random delay so they land at different points of the
+    33 ms frame cycle.
+    """
+
+    def __init__(self, root, model, view, presses, timeout=1.0, seed=0):
+        self.root = root
+        self.model = model
+        self.view = view
+        self.presses = presses
+        self.timeout = timeout
+        self.rng = random.Random(seed)
+
+        self.samples = []  # (press -> model apply, press -> frame drawn) in seconds
+        self.timeouts = 0
+        self.pressed_at = None
+        self.target_lane = None
+
+    def run(self):
+        """Run every press to completion inside the Tk main loop"""
+        self.root.after(200, self._press)
+        self.root.mainloop()
+
+    def _press(self):
+        """Generate one key press"""
+        if len(self.samples) + self.timeouts >= self.presses:
+            self.root.quit()
+            return
+
+        # Bounce between the center lane and the outer lanes
+        lane = self.model.player_lane
+        direction = 'Left' if lane == 2 or (lane == 1 and self.rng.random() < 0.5) else 'Right'
+        self.target_lane = lane - 1 if direction == 'Left' else lane + 1
+
+        self.pressed_at = time.perf_counter()
+        self.root.event_generate(f'<KeyPress-{direction}>', when='tail')
+        self.root.after(1, self._poll)
+
+    def _poll(self):
+        """Wait for the frame that shows the new lane"""
+        view = self.view
+        drawn = (view.last_drawn_player_lane == self.target_lane and
+                 view.player_drawn_time is not None and view.player_drawn_time >= self.pressed_at)
+        if drawn:
+            applied = self.model.last_lane_change_time
+            self.samples.append((applied - self.pressed_at, view.player_drawn_time - self.pressed_at))
+        elif time.perf_counter() - self.pressed_at > self.timeout:
+            self.timeouts += 1
+        else:
+            self.root.after(1, self._poll)
+            return
+
+        # Land the next press at a random point in the frame cycle
+        self.root.after(self.rng.randint(20, 80), self._press)
+
+
+def run_density(density, presses, seed):
+    """Measure input latency with a given number of entities on screen"""
+    root = tk.Tk()
+    root.title('Swipe Chaser input latency')
+    canvas = tk.Canvas(root, width=400, height=600, bg=BG_COLOR)
+    canvas.pack()
+    # Map the window and give it focus so key events are delivered like real ones
+    root.update()
+    root.focus_force()
+
+    with tempfile.TemporaryDirectory() as data_dir, contextlib.redirect_stdout(io.StringIO()):
+        model = GameModel(seed=seed, persist=False, data_dir=data_dir)
+        # The view draws the snapshot, so size it for every entity up front
+        model.snapshots = SnapshotBuffer(capacity=max(MAX_SNAPSHOT_ENTITIES, density))
+        view = GameView(root, canvas=canvas)
+        presenter = GamePresenter(model, view, root)
+        model.start_game()
+        populate(model, density, seed)
+        model.publish_snapshot()
+
+        probe = LatencyProbe(root, model, view, presses, seed=seed)
+        presenter.update()
+        try:
+            probe.run()
+        finally:
+            if presenter.update_id:
+                root.after_cancel(presenter.update_id)
+            root.destroy()
+
+        # Entities in the snapshot the view drew (the scene is frozen, so every frame had these)
+        snapshot = model.snapshots.acquire()
+        rendered = len(snapshot.obstacle_ys) + len(snapshot.coin_ys)
+        model.snapshots.release()
+
+    apply_ms = [applied * 1000 for applied, _ in probe.samples]
+    frame_ms = [drawn * 1000 for _, drawn in probe.samples]
+    row = {
+        'density': density,
+        'rendered_entities': rendered,
+        'presses': presses,
+        'measured': len(probe.samples),
+        'timeouts': probe.timeouts,
+        'press_to_apply': {**summarize(apply_ms), 'histogram': histogram(apply_ms)},
+        'press_to_frame': {**summarize(frame_ms), 'histogram': histogram(frame_ms)}
+    }
+    print(f"{density:>6} entities: apply p50 {row['press_to_apply']['p50_ms']:6.1f} ms "
+          f"p95 {row['press_to_apply']['p95_ms']:6.1f} ms | frame p50 {row['press_to_frame']['p50_ms']:6.1f} ms "
+          f"p95 {row['press_to_frame']['p95_ms']:6.1f} ms ({probe.timeouts} timeouts)")
+    if rendered != density:
+        print(f"WARNING: only {rendered} of {density} entities were drawn")
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure keypress-to-frame input latency")
+    parser.add_argument('--densities', type=int, nargs='+', default=[0, 50, 200, 800],
+                        help="Entity counts (obstacles + coins) to measure at")
+    parser.add_argument('--presses', type=int, default=100, help="Key presses per density")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for entity placement and press timing")
+    parser.add_argument('--output', default='input_latency.json', help="Path of the JSON results file")
+    args = parser.parse_args()
+
+    xvfb = start_virtual_display()
+    try:
+        results = [run_density(density, args.presses, args.seed) for density in args.densities]
+    finally:
+        stop_virtual_display(xvfb)
+
+    write_results(args.output, 'input_latency', results,
+                  presses=args.presses, histogram_edges_ms=HISTOGRAM_EDGES_MS)
+
+
+if __name__ == '__main__':
+    main()
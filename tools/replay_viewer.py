@@ -0,0 +1,59 @@
+"""
+Replay viewer: watch a saved game
+
+Loads a replay file (by default the newest one the game saved in
+data/replays), re-simulates it with ReplayPlayer and draws it with the
+normal GameView and GamePresenter. Press F to cycle playback between 1x,
+4x and 16x.
+
+Usage:
+    python -m tools.replay_viewer [path/to/replay.scr] [--speed 4]
+"""
+import argparse
+import glob
+import os
+
+from tools.common import REPO_ROOT
+
+import tkinter as tk
+
+from replay import Replay, ReplayPlayer
+from view import GameView, BG_COLOR
+from presenter import GamePresenter
+
+REPLAY_DIR = os.path.join(REPO_ROOT, 'data', 'replays')
+
+
+def latest_replay(replay_dir=REPLAY_DIR):
+    """Path of the most recently saved replay, or None if there are none"""
+    paths = glob.glob(os.path.join(replay_dir, 'replay_*.scr'))
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a saved Swipe Chaser replay")
+    parser.add_argument('path', nargs='?', help="Replay file (defaults to the newest in data/replays)")
+    parser.add_argument('--speed', type=int, choices=[1, 4, 16], default=1,
+                        help="Simulation ticks per frame")
+    args = parser.parse_args()
+
+    path = args.path or latest_replay()
+    if path is None:
+        parser.error(f"no replays in {REPLAY_DIR}; play a game first or pass a file")
+    player = ReplayPlayer(Replay.load(path))
+
+    root = tk.Tk()
+    root.title(f'Swipe Chaser replay - {os.path.basename(path)}')
+    root.resizable(False, False)
+    canvas = tk.Canvas(root, width=400, height=600, bg=BG_COLOR)
+    canvas.pack()
+
+    view = GameView(root, canvas=canvas)
+    presenter = GamePresenter(player.model, view, root)
+    presenter.start_replay(player, speed=args.speed)
+    presenter.start()
+    root.mainloop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Load test for the multi-session game server
+
+Starts a GameServer in-process and connects N stand-in clients over
+localhost TCP (or a Unix socket). Each client rebuilds its session from
+the deltas it receives and plays it with a scripted bot, restarting after
+every game over. Reports aggregate ticks per second, server tick batch
+time, per-session tick latency and bytes per second, and checks that
+every client's copy of its game matches the server's model.
+
+Usage:
+    python -m tools.server_load --clients 8 32 128 --seconds 10 --output server_load.json
+"""
+import argparse
+import asyncio
+import contextlib
+import time
+
+import numpy as np
+
+from tools.common import percentile, write_results
+from tools.bot import BotPlayer, SKILL_PROFILES
+
+from server import GameServer, GameClient
+from model import TICK_SECONDS
+
+
+async def play(client, bot, stop_at):
+    """Play with a bot until stop_at, restarting after each game over"""
+    state = client.state
+    while time.perf_counter() < stop_at:
+        if not await client.receive():
+            return
+        if state.game_state == "playing":
+            bot.act(state)
+        elif state.game_state == "game_over":
+            client.restart()
+
+
+def matches(client, session):
+    """True if a client's copy of its session matches the server model"""
+    state, model = client.state, session.model
+    if model.tick == 0:
+        # Restarted after the last delta was sent - nothing to compare yet
+        return True
+    if (state.tick, state.score, state.player_lane) != (model.tick, model.score, model.player_lane):
+        return False
+    for mirror, store in ((state.obstacles, model.obstacles), (state.coins, model.coins)):
+        n = len(store)
+        if len(mirror) != n:
+            return False
+        if not (np.array_equal(mirror.ids[:n], store.ids[:n]) and
+                np.array_equal(mirror.lanes[:n], store.lanes[:n]) and
+                np.allclose(mirror.ys[:n], store.ys[:n])):
+            return False
+    return True
+
+
+async def run_load(n_clients, seconds, tick_seconds, unix_path=None, profile='skilled'):
+    """Run one load level and return its result row"""
+    server = GameServer(max_sessions=n_clients, tick_seconds=tick_seconds)
+    await server.start('127.0.0.1', 0, unix_path)
+    port = None if unix_path else server.server.sockets[0].getsockname()[1]
+
+    clients = []
+    for i in range(n_clients):
+        client = GameClient()
+        await client.connect('127.0.0.1', port, unix_path)
+        clients.append(client)
+
+    # Measure from when every client is connected
+    server.total_ticks = 0
+    server.started_at = time.perf_counter()
+    stop_at = server.started_at + seconds
+    bots = [BotPlayer(SKILL_PROFILES[profile], seed=i) for i in range(n_clients)]
+    await asyncio.gather(*(play(client, bot, stop_at) for client, bot in zip(clients, bots)))
+    stats = server.get_stats()
+
+    # Stop ticking, then let the clients drain what is already on the wire
+    server.tick_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await server.tick_task
+    for client in clients:
+        session = server.sessions[client.session_id]
+        while client.state.tick < session.model.tick and client.state.game_state == "playing":
+            if not await client.receive():
+                break
+    in_sync = sum(matches(client, server.sessions[client.session_id]) for client in clients)
+
+    for client in clients:
+        await client.close()
+    await server.stop()
+
+    sessions = stats['per_session'].values()
+    mean_latencies = [s['mean_ms'] for s in sessions]
+    p95_latencies = [s['p95_ms'] for s in sessions]
+    bytes_received = sum(client.bytes_received for client in clients)
+    row = {
+        'clients': n_clients,
+        'seconds': seconds,
+        'ticks_per_second': stats['ticks_per_second'],
+        'batch_mean_ms': stats['batch_mean_ms'],
+        'batch_max_ms': stats['batch_max_ms'],
+        'session_tick_mean_ms': sum(mean_latencies) / len(mean_latencies),
+        'session_tick_p95_ms': percentile(p95_latencies, 0.95),
+        'bytes_per_second_per_client': bytes_received / seconds / n_clients,
+        'clients_in_sync': in_sync
+    }
+    print(f"{n_clients:>5} clients: {row['ticks_per_second']:8.0f} ticks/s  "
+          f"batch {row['batch_mean_ms']:6.2f} ms (max {row['batch_max_ms']:6.2f})  "
+          f"session tick {row['session_tick_mean_ms']:.3f} ms  "
+          f"{row['bytes_per_second_per_client']:7.0f} B/s per client  "
+          f"{in_sync}/{n_clients} in sync")
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the multi-session game server")
+    parser.add_argument('--clients', type=int, nargs='+', default=[8, 32, 128],
+                        help="Numbers of concurrent clients to test")
+    parser.add_argument('--seconds', type=float, default=10.0, help="Seconds per load level")
+    parser.add_argument('--tick-seconds', type=float, default=TICK_SECONDS,
+                        help="Server seconds per tick (0 runs ticks back to back)")
+    parser.add_argument('--unix', default=None, help="Use this Unix socket path instead of TCP")
+    parser.add_argument('--profile', default='skilled', choices=sorted(SKILL_PROFILES),
+                        help="Bot skill profile")
+    parser.add_argument('--output', default='server_load.json', help="Path of the JSON results file")
+    args = parser.parse_args()
+
+    results = [asyncio.run(run_load(n, args.seconds, args.tick_seconds, args.unix, args.profile))
+               for n in args.clients]
+    write_results(args.output, 'server_load', results,
+                  tick_seconds=args.tick_seconds, profile=args.profile)
+
+
+if __name__ == '__main__':
+    main()
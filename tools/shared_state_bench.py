@@ -0,0 +1,127 @@
+"""
+Shared-memory state publishing benchmark
+
+Plays a headless bot game as fast as possible with a SharedStateWriter
+attached to the model, while reader processes map the ring and check
+every frame they acquire against itself (entity counts, ids sorted, the
+sequence still valid after use). Reports the writer's cost per tick, how
+many ticks each reader saw, and how many frames were rejected as torn.
+
+Usage:
+    python -m tools.shared_state_bench --ticks 30000 --readers 2 --output shared_state.json
+"""
+import argparse
+import contextlib
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from tools.common import write_results
+from tools.bot import BotPlayer, SKILL_PROFILES
+
+from model import GameModel
+from shared_state import SharedStateWriter, SharedStateReader
+
+
+def consistent(frame):
+    """True if a frame's contents hang together"""
+    return (len(frame.obstacle_ids) == len(frame.obstacle_ys) == len(frame.obstacle_lanes) and
+            bool(np.all(np.diff(frame.obstacle_ids) > 0)) and
+            bool(np.all(np.diff(frame.coin_ids) > 0)))
+
+
+def read_frames(name, ticks, results):
+    """Reader process: acquire the latest frame until the writer reaches the last tick"""
+    reader = SharedStateReader(name)
+    seen = bad = last_written = 0
+    try:
+        while reader.frames_written < ticks:
+            written = reader.frames_written
+            if written == last_written:
+                continue
+            frame = reader.acquire()
+            if frame is None:
+                continue
+            ok = consistent(frame)
+            if not frame.is_valid():
+                # Overwritten while in use - a zero-copy reader throws it away
+                reader.torn += 1
+                continue
+            seen += 1
+            bad += not ok
+            last_written = written
+    finally:
+        results.put({'frames_seen': seen, 'inconsistent': bad, 'torn': reader.torn})
+        reader.close()
+
+
+def run(ticks, n_readers, seed, data_dir):
+    """Play ticks with the writer attached and n_readers reader processes"""
+    model = GameModel(seed=seed, persist=False, data_dir=data_dir)
+    bot = BotPlayer(SKILL_PROFILES['expert'], seed=seed)
+    writer = SharedStateWriter()
+
+    results = multiprocessing.Queue()
+    readers = [multiprocessing.Process(target=read_frames, args=(writer.name, ticks, results))
+               for _ in range(n_readers)]
+    for process in readers:
+        process.start()
+
+    try:
+        model.use_shared_state(writer)
+        # Only time the ticks played below
+        writer.write_times.clear()
+        games = 0
+        start = time.perf_counter()
+        while writer.written < ticks:
+            if model.game_state != "playing":
+                model.start_game(seed + games)
+                games += 1
+            bot.act(model)
+            model.update()
+        elapsed = time.perf_counter() - start
+
+        rows = [results.get() for _ in readers]
+        for process in readers:
+            process.join()
+        stats = writer.get_write_stats()
+    finally:
+        model.use_shared_state(None)
+        writer.close()
+
+    return {
+        'ticks': ticks,
+        'games': games,
+        'ticks_per_second': ticks / elapsed,
+        'write_mean_us': stats['mean_us'],
+        'write_max_us': stats['max_us'],
+        'readers': rows
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shared-memory state publishing")
+    parser.add_argument('--ticks', type=int, default=30000, help="Ticks to publish")
+    parser.add_argument('--readers', type=int, default=2, help="Reader processes")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for games and the bot")
+    parser.add_argument('--output', default='shared_state.json', help="Path of the JSON results file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            row = run(args.ticks, args.readers, args.seed, data_dir)
+
+    print(f"{row['ticks']} ticks at {row['ticks_per_second']:.0f} ticks/s  "
+          f"write {row['write_mean_us']:.1f} us (max {row['write_max_us']:.1f})")
+    for i, reader in enumerate(row['readers']):
+        print(f"  reader {i}: {reader['frames_seen']} frames  {reader['torn']} torn  "
+              f"{reader['inconsistent']} inconsistent")
+
+    write_results(args.output, 'shared_state', [row], readers=args.readers)
+
+
+if __name__ == '__main__':
+    main()
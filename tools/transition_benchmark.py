@@ -0,0 +1,105 @@
+"""
+Screen transition latency benchmark
+
+Cycles the real SwipeChaserGame through main menu -> countdown -> game
+and times each switch two ways:
+
+  reuse   - ScreenManager raising screens that were built once (current)
+  rebuild - destroying and rebuilding the screen on every switch, plus a
+            fresh GameModel, GameView and GamePresenter for the game
+            screen (how transitions used to work)
+
+Runs under Xvfb when there is no display and Xvfb is installed.
+
+Usage:
+    python -m tools.transition_benchmark --cycles 20 --output transition_benchmark.json
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+
+from tools.common import (start_virtual_display, stop_virtual_display,
+                          percentile, write_results)
+
+from model import GameModel
+from view import GameView
+from presenter import GamePresenter
+
+SEQUENCE = ('main_menu', 'countdown', 'game')
+
+
+def summarize(mode, name, times):
+    """Build a result row from a list of transition times in seconds"""
+    times_ms = [t * 1000 for t in times]
+    return {
+        'mode': mode,
+        'screen': name,
+        'transitions': len(times_ms),
+        'mean_ms': sum(times_ms) / len(times_ms),
+        'p50_ms': percentile(times_ms, 0.5),
+        'p95_ms': percentile(times_ms, 0.95),
+        'max_ms': max(times_ms)
+    }
+
+
+def run_reuse(game, cycles):
+    """Time transitions between screens that are built once"""
+    times = {name: [] for name in SEQUENCE}
+    for _ in range(cycles):
+        for name in SEQUENCE:
+            times[name].append(game.screens.show(name))
+            game.root.update()
+    return [summarize('reuse', name, times[name]) for name in SEQUENCE]
+
+
+def run_rebuild(game, cycles, data_dir):
+    """Time transitions that rebuild the screen (and the MVP objects for the game)"""
+    screens = game.screens
+    times = {name: [] for name in SEQUENCE}
+    for _ in range(cycles):
+        for name in SEQUENCE:
+            start = time.perf_counter()
+            screens.rebuild(name)
+            if name == 'game':
+                # The game screen used to come with a new model, view and presenter
+                model = GameModel(persist=False, data_dir=data_dir)
+                view = GameView(game.root, canvas=game.canvas)
+                GamePresenter(model, view, game.root)
+                model.start_game()
+            screens.show(name)
+            times[name].append(time.perf_counter() - start)
+            game.root.update()
+    return [summarize('rebuild', name, times[name]) for name in SEQUENCE]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark screen transition latency")
+    parser.add_argument('--cycles', type=int, default=20, help="Menu -> countdown -> game cycles per mode")
+    parser.add_argument('--output', default='transition_benchmark.json', help="Path of the JSON results file")
+    args = parser.parse_args()
+
+    xvfb = start_virtual_display()
+    try:
+        from main import SwipeChaserGame
+
+        with tempfile.TemporaryDirectory() as data_dir, contextlib.redirect_stdout(io.StringIO()):
+            game = SwipeChaserGame(data_dir=data_dir, persist=False)
+            try:
+                results = run_reuse(game, args.cycles)
+                # Rebuilding replaces the game screen's canvas, so it runs last
+                results.extend(run_rebuild(game, args.cycles, data_dir))
+            finally:
+                game.root.destroy()
+    finally:
+        stop_virtual_display(xvfb)
+
+    for row in results:
+        print(f"{row['mode']:<8} {row['screen']:<10} mean {row['mean_ms']:7.2f} ms  "
+              f"p95 {row['p95_ms']:7.2f} ms  max {row['max_ms']:7.2f} ms")
+    write_results(args.output, 'screen_transitions', results, cycles=args.cycles)
+
+
+if __name__ == '__main__':
+    main()
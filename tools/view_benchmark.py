@@ -0,0 +1,194 @@
+"""
+Off-screen benchmark for GameView draw throughput
+
+Builds a GameView on a withdrawn Tk root (under Xvfb when there is no
+display and Xvfb is installed), feeds it synthetic game states with a
+growing number of obstacles and coins and times each draw method.
+
+Usage:
+    python -m tools.view_benchmark --obstacles 0 25 50 100 200 --output view_benchmark.json
+"""
+import argparse
+import random
+import time
+
+from tools.common import (start_virtual_display, stop_virtual_display,
+                          percentile, write_results)
+
+import tkinter as tk
+
+from quality import QualityController, QUALITY_TIERS
+from view import GameView, BG_COLOR
+
+
+class SyntheticState:
+    """Stand-in for GameModel with only the attributes the views read"""
+
+    def __init__(self, n_obstacles, n_coins, seed=0):
+        rng = random.Random(seed)
+        self.game_state = "playing"
+        self.tick = 0
+        self.score = n_coins
+        self.player_lane = 1
+        self.difficulty_params = {
+            'speed': 5.0,
+            'obstacle_frequency': 30,
+            'pattern_complexity': 1.0,
+            'coin_value': 1
+        }
+        # Spread entities over the visible track
+        self.obstacles = [(i, rng.randint(0, 2), rng.uniform(-50, 600)) for i in range(n_obstacles)]
+        self.coins = [(i, rng.randint(0, 2), rng.uniform(-30, 600)) for i in range(n_coins)]
+
+
+def _fixed_quality(tier_name):
+    """Quality controller pinned to one tier so results are comparable"""
+    names = [tier.name for tier in QUALITY_TIERS]
+    return QualityController(start_tier=names.index(tier_name),
+                             downgrade_frames=float('inf'), upgrade_frames=float('inf'))
+
+
+def _clear(view):
+    """Delete everything except the view's persistent items"""
+    for item in view.canvas.find_all():
+        if item not in view.persistent_items:
+            view.canvas.delete(item)
+
+
+def time_method(view, name, call, frames, reset=None):
+    """
+    Time repeated calls of one draw method
+
+    Args:
+        view: GameView under test
+        name: Method name for the report
+        call: Zero-argument callable that draws one frame
+        frames: Number of timed frames
+        reset: Optional callable run (untimed) before every frame
+
+    Returns:
+        dict: FPS, frame time statistics and canvas item count
+    """
+    times = []
+    for frame in range(frames + 5):
+        if reset:
+            reset()
+        start = time.perf_counter()
+        call()
+        view.canvas.update_idletasks()
+        elapsed = time.perf_counter() - start
+        if frame >= 5:  # Skip warm-up frames
+            times.append(elapsed)
+
+    total = sum(times)
+    return {
+        'method': name,
+        'frames': frames,
+        'fps': frames / total if total > 0 else float('inf'),
+        'mean_ms': (total / frames) * 1000,
+        'p95_ms': percentile(times, 0.95) * 1000,
+        'max_ms': max(times) * 1000,
+        'canvas_items': len(view.canvas.find_all())
+    }
+
+
+def run_tk_benchmark(obstacle_counts, coin_ratio, frames, tier_name):
+    """Benchmark every GameView draw method at each entity count"""
+    root = tk.Tk()
+    root.withdraw()
+    canvas = tk.Canvas(root, width=400, height=600, bg=BG_COLOR)
+    canvas.pack()
+    view = GameView(root, canvas=canvas, quality=_fixed_quality(tier_name))
+
+    results = []
+    try:
+        for n_obstacles in obstacle_counts:
+            n_coins = int(n_obstacles * coin_ratio)
+            state = SyntheticState(n_obstacles, n_coins)
+            print(f"Tk GameView: {n_obstacles} obstacles, {n_coins} coins")
+
+            measurements = [
+                time_method(view, 'draw_game_screen', lambda: view.draw_game_screen(state), frames),
+                time_method(view, '_draw_game_screen', lambda: view._draw_game_screen(state), frames,
+                            reset=lambda: _clear(view)),
+                time_method(view, 'draw_start_screen', view.draw_start_screen, frames),
+                time_method(view, 'draw_game_over_screen', lambda: view.draw_game_over_screen(state.score), frames)
+            ]
+            for row in measurements:
+                row.update(backend='tk', obstacles=n_obstacles, coins=n_coins)
+                print(f"  {row['method']:<24} {row['fps']:9.1f} fps  "
+                      f"{row['mean_ms']:7.2f} ms  {row['canvas_items']:5d} items")
+            results.extend(measurements)
+    finally:
+        root.destroy()
+    return results
+
+
+def run_pygame_benchmark(obstacle_counts, coin_ratio, frames):
+    """Benchmark the headless pygame renderer at each entity count"""
+    from pygame_view import PygameView
+
+    view = PygameView(headless=True)
+    results = []
+    try:
+        for n_obstacles in obstacle_counts:
+            n_coins = int(n_obstacles * coin_ratio)
+            state = SyntheticState(n_obstacles, n_coins)
+
+            times = []
+            for frame in range(frames + 5):
+                start = time.perf_counter()
+                view.draw_game_screen(state)
+                view.present()
+                if frame >= 5:
+                    times.append(time.perf_counter() - start)
+
+            total = sum(times)
+            row = {
+                'backend': 'pygame',
+                'method': 'draw_game_screen',
+                'obstacles': n_obstacles,
+                'coins': n_coins,
+                'frames': frames,
+                'fps': frames / total if total > 0 else float('inf'),
+                'mean_ms': (total / frames) * 1000,
+                'p95_ms': percentile(times, 0.95) * 1000,
+                'max_ms': max(times) * 1000
+            }
+            print(f"pygame: {n_obstacles} obstacles, {n_coins} coins  {row['fps']:9.1f} fps")
+            results.append(row)
+    finally:
+        view.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GameView draw throughput")
+    parser.add_argument('--obstacles', type=int, nargs='+', default=[0, 10, 25, 50, 100, 200],
+                        help="Obstacle counts to benchmark")
+    parser.add_argument('--coin-ratio', type=float, default=0.5,
+                        help="Coins per obstacle in each synthetic state")
+    parser.add_argument('--frames', type=int, default=100,
+                        help="Timed frames per method and entity count")
+    parser.add_argument('--tier', default='High', choices=[tier.name for tier in QUALITY_TIERS],
+                        help="Render quality tier to benchmark")
+    parser.add_argument('--pygame', action='store_true',
+                        help="Also benchmark the headless pygame renderer")
+    parser.add_argument('--output', default='view_benchmark.json',
+                        help="Path of the JSON results file")
+    args = parser.parse_args()
+
+    xvfb = start_virtual_display()
+    try:
+        results = run_tk_benchmark(args.obstacles, args.coin_ratio, args.frames, args.tier)
+        if args.pygame:
+            results.extend(run_pygame_benchmark(args.obstacles, args.coin_ratio, args.frames))
+    finally:
+        stop_virtual_display(xvfb)
+
+    write_results(args.output, 'view_draw_throughput', results,
+                  tier=args.tier, frames=args.frames, coin_ratio=args.coin_ratio)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+import time
+import traceback
+from collections import deque
+
+from effects import TransitionEffect
+
+# Pipeline states
+IDLE = "idle"
+COUNTDOWN = "countdown"
+FADE = "fade"
+DONE = "done"
+
+# Countdown steps as (label text, seconds shown)
+COUNTDOWN_STEPS = [("3", 1.0), ("2", 1.0), ("1", 1.0), ("GO!", 0.5)]
+
+# Seconds the "GO!" label takes to fade out
+FADE_SECONDS = 0.3
+
+# Milliseconds between scheduler ticks (~60 per second)
+TICK_MS = 16
+
+
+def blend_color(start, end, ratio):
+    """Mix two '#RRGGBB' colors (ratio 0 gives start, 1 gives end)"""
+    ratio = max(0.0, min(1.0, ratio))
+    a = [int(start[i:i + 2], 16) for i in (1, 3, 5)]
+    b = [int(end[i:i + 2], 16) for i in (1, 3, 5)]
+    return '#' + ''.join(f'{round(x + (y - x) * ratio):02x}' for x, y in zip(a, b))
+
+
+class TransitionPipeline:
+    """Countdown -> fade -> game start, driven by a single scheduler tick
+
+    One root.after() callback advances a small state machine: it updates
+    the countdown text as time passes, runs at most one preload step per
+    tick (model warm-up, image conversion, drawing the opening frame) so
+    the countdown never stalls, then fades out with a TransitionEffect and
+    calls on_complete. If preloading is not finished when the countdown
+    runs out, "GO!" stays up until it is, so the first playable frame never
+    waits on loading work.
+    """
+
+    def __init__(self, root, on_countdown, on_fade, on_complete, tick_ms=TICK_MS):
+        """
+        Initialize the pipeline
+
+        Args:
+            root: Tk root window used for scheduling
+            on_countdown: Called with the countdown text whenever it changes
+            on_fade: Called with the fade progress (0.0 - 1.0) every fade tick
+            on_complete: Called once the fade has finished
+            tick_ms: Milliseconds between scheduler ticks
+        """
+        self.root = root
+        self.on_countdown = on_countdown
+        self.on_fade = on_fade
+        self.on_complete = on_complete
+        self.tick_ms = tick_ms
+
+        self.state = IDLE
+        self.tick_id = None
+        self.state_started = None
+        self.countdown_text = None
+        self.pending = deque()
+        self.fade = TransitionEffect(0, 0)
+
+        # Seconds spent in each preload step of the last run, and the slowest tick
+        self.step_times = {}
+        self.max_tick_seconds = 0.0
+
+    @property
+    def active(self):
+        """True while a transition is in progress"""
+        return self.state in (COUNTDOWN, FADE)
+
+    def start(self, preload_steps=()):
+        """
+        Start the countdown
+
+        Args:
+            preload_steps: (name, callable) pairs run one per tick during the countdown
+        """
+        self.cancel()
+        self.pending = deque(preload_steps)
+        self.step_times = {}
+        self.max_tick_seconds = 0.0
+        self._enter(COUNTDOWN)
+        self.countdown_text = None
+        self._tick()
+
+    def cancel(self):
+        """Stop the transition without completing it"""
+        if self.tick_id is not None:
+            try:
+                self.root.after_cancel(self.tick_id)
+            except Exception:
+                pass
+            self.tick_id = None
+        self.pending.clear()
+        self.fade.active = False
+        self.state = IDLE
+
+    def _enter(self, state):
+        """Switch state and restart the state clock"""
+        self.state = state
+        self.state_started = time.perf_counter()
+
+    def _tick(self):
+        """Advance the state machine by one scheduler tick"""
+        self.tick_id = None
+        tick_start = time.perf_counter()
+
+        if self.state == COUNTDOWN:
+            # Show the current step first, so a slow preload step can't delay it
+            self._update_countdown(tick_start - self.state_started)
+            if self.state == COUNTDOWN:
+                self._run_next_step()
+        elif self.state == FADE:
+            self.fade.update()
+            if self.state == FADE:
+                self.on_fade(self.fade.progress / self.fade.duration)
+
+        self.max_tick_seconds = max(self.max_tick_seconds, time.perf_counter() - tick_start)
+        if self.active:
+            self.tick_id = self.root.after(self.tick_ms, self._tick)
+
+    def _run_next_step(self):
+        """Run one pending preload step, timing it"""
+        if not self.pending:
+            return
+        name, step = self.pending.popleft()
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            print(f"Error in preload step {name}: {e}")
+            traceback.print_exc()
+        self.step_times[name] = time.perf_counter() - step_start
+
+    def _update_countdown(self, elapsed):
+        """Show the countdown text for the elapsed time, then start the fade"""
+        text = COUNTDOWN_STEPS[-1][0]
+        for step_text, seconds in COUNTDOWN_STEPS:
+            if elapsed < seconds:
+                text = step_text
+                break
+            elapsed -= seconds
+        else:
+            if not self.pending:
+                self._enter(FADE)
+                frames = max(1, round(FADE_SECONDS * 1000 / self.tick_ms))
+                self.fade.start("fade", duration=frames, callback=self._finish)
+                return
+
+        if text != self.countdown_text:
+            self.countdown_text = text
+            self.on_countdown(text)
+
+    def _finish(self):
+        """Fade finished - hand over to the game"""
+        self._enter(DONE)
+        self.on_complete()
@@ -1,250 +1,353 @@
 import tkinter as tk
 from tkinter import ttk
-from ttkthemes import ThemedTk
-from PIL import Image, ImageTk
 import os
+import threading
+
+# Optional dependencies: fall back to plain Tk styling / no images without them
+try:
+    from ttkthemes import ThemedTk
+except ImportError:
+    ThemedTk = None
+
+try:
+    from PIL import Image, ImageTk
+except ImportError:
+    Image = ImageTk = None
+
+IMAGE_EXTENSIONS = ('.png', '.gif', '.jpg', '.jpeg')
 
 class ModernUIManager:
-    """Handles modern UI elements for the game"""
-    
+    """Builds every UI screen for the game
+
+    The ttk styles are configured once when the manager is created, and the
+    create_* builders take a parent widget and return an unplaced frame, so
+    a ScreenManager can build each screen once and raise it as needed.
+    Images are cached as PhotoImages keyed by (path, size); decoding and
+    resampling can be done ahead of time on a background thread with
+    preload_images(), leaving only the PhotoImage conversion (which must
+    happen on the Tk thread) for the first load_image() call.
+    """
+
     def __init__(self, root=None):
         """Initialize the UI manager"""
         if root:
             self.root = root
             self.is_themed_tk = False
-        else:
+        elif ThemedTk is not None:
             # Create a themed Tk window
             self.root = ThemedTk(theme="equilux")  # Dark modern theme
             self.is_themed_tk = True
-            
+        else:
+            self.root = tk.Tk()
+            self.is_themed_tk = False
+
         self.root.title('Swipe Chaser')
-        
+
         # Store UI elements
         self.frames = {}
         self.buttons = {}
         self.labels = {}
         self.images = {}
-        
+
+        # PhotoImages by (path, size), and decoded PIL images waiting to be converted
+        self.image_cache = {}
+        self.decoded_images = {}
+        self.preload_thread = None
+
         # Set up styles
+        self.style = None
         self.setup_styles()
-    
+
     def setup_styles(self):
-        """Set up ttk styles for UI elements"""
-        self.style = ttk.Style()
-        
+        """Set up ttk styles for UI elements (only the first call does anything)"""
+        if self.style is not None:
+            return
+        self.style = ttk.Style(self.root)
+
         if not self.is_themed_tk:
+            # 'clam' honors custom colors on every platform
+            if 'clam' in self.style.theme_names():
+                self.style.theme_use('clam')
+
             # If not using ThemedTk, configure some basic styles
             self.style.configure('TFrame', background='#121212')
-            self.style.configure('TButton', 
-                                background='#333333', 
+            self.style.configure('TButton',
+                                background='#333333',
                                 foreground='#FFD700',
                                 borderwidth=1,
                                 focusthickness=3,
-                                focuscolor='#FFD700')
+                                focuscolor='#FFD700',
+                                font=('Arial', 12, 'bold'))
             self.style.map('TButton',
                         background=[('active', '#444444')],
                         foreground=[('active', '#FFFFFF')])
-            self.style.configure('TLabel', 
-                                background='#121212', 
+            self.style.configure('TLabel',
+                                background='#121212',
                                 foreground='#FFD700',
                                 font=('Arial', 12))
-            self.style.configure('Title.TLabel', 
-                                background='#121212', 
+            self.style.configure('Title.TLabel',
+                                background='#121212',
                                 foreground='#FFD700',
                                 font=('Arial', 24, 'bold'))
-        
+
         # Custom styles for specific elements
-        self.style.configure('Gold.TButton', 
-                            background='#B8860B', 
+        self.style.configure('Gold.TButton',
+                            background='#B8860B',
                             foreground='#000000',
                             font=('Arial', 12, 'bold'))
         self.style.map('Gold.TButton',
                     background=[('active', '#FFD700')],
                     foreground=[('active', '#000000')])
-                    
+
         self.style.configure('Menu.TFrame', background='#1A1A1A', relief='raised', borderwidth=2)
         self.style.configure('Game.TFrame', background='#121212')
-        
-    def load_image(self, name, path, size=None):
-        """Load an image and optionally resize it"""
-        try:
-            image = Image.open(path)
-            if size:
-                image = image.resize(size, Image.LANCZOS)
-            photo_image = ImageTk.PhotoImage(image)
-            self.images[name] = photo_image
-            return photo_image
-        except Exception as e:
-            print(f"Error loading image {path}: {e}")
+        self.style.configure('Menu.TLabel', background='#1A1A1A', foreground='#FFD700', font=('Arial', 12))
+        self.style.configure('MenuTitle.TLabel', background='#1A1A1A', foreground='#FFD700',
+                            font=('Arial', 24, 'bold'))
+        self.style.configure('Countdown.TLabel', background='#121212', foreground='#FFD700',
+                            font=('Arial', 120, 'bold'))
+
+    @staticmethod
+    def _decode_image(path, size):
+        """Open an image file and resize it (no Tk calls, so safe on any thread)"""
+        image = Image.open(path)
+        image.load()
+        if size:
+            image = image.resize(size, Image.LANCZOS)
+        return image
+
+    def preload_images(self, specs):
+        """
+        Decode and resize images on a background thread
+
+        Args:
+            specs: Iterable of (path, size) pairs; size is (width, height) or None
+
+        Returns:
+            threading.Thread: The decoding thread, or None without Pillow
+        """
+        if Image is None:
             return None
-    
-    def create_main_menu(self, start_callback, settings_callback, exit_callback):
-        """Create a modern main menu"""
-        # Clear any existing UI
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
+        specs = [(path, tuple(size) if size else None) for path, size in specs]
+
+        def decode_all():
+            for path, size in specs:
+                key = (path, size)
+                if key in self.image_cache or key in self.decoded_images:
+                    continue
+                try:
+                    self.decoded_images[key] = self._decode_image(path, size)
+                except Exception as e:
+                    print(f"Error preloading image {path}: {e}")
+
+        self.preload_thread = threading.Thread(target=decode_all, daemon=True)
+        self.preload_thread.start()
+        return self.preload_thread
+
+    def preload_directory(self, directory, size=None):
+        """Preload every image in a directory (see preload_images)"""
+        if not os.path.isdir(directory):
+            return None
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                       if name.lower().endswith(IMAGE_EXTENSIONS))
+        return self.preload_images((path, size) for path in paths)
+
+    def finish_preload(self):
+        """
+        Turn every image decoded so far into a cached PhotoImage (Tk thread only)
+
+        Images are registered under their file name without the extension.
+
+        Returns:
+            int: Number of images converted
+        """
+        pending = list(self.decoded_images)
+        for path, size in pending:
+            self.load_image(os.path.splitext(os.path.basename(path))[0], path, size)
+        return len(pending)
+
+    def load_image(self, name, path, size=None):
+        """Load an image and optionally resize it (cached by path and size)"""
+        key = (path, tuple(size) if size else None)
+        photo_image = self.image_cache.get(key)
+        if photo_image is None:
+            if ImageTk is None:
+                print(f"Error loading image {path}: Pillow is not installed")
+                return None
+            try:
+                image = self.decoded_images.pop(key, None)
+                if image is None:
+                    image = self._decode_image(path, key[1])
+                photo_image = ImageTk.PhotoImage(image)
+                self.image_cache[key] = photo_image
+            except Exception as e:
+                print(f"Error loading image {path}: {e}")
+                return None
+        self.images[name] = photo_image
+        return photo_image
+
+    def create_main_menu(self, parent, start_callback, settings_callback=None, exit_callback=None):
+        """Create a modern main menu (the settings button is left out without a callback)"""
         # Create main frame
-        main_frame = ttk.Frame(self.root, style='Menu.TFrame')
-        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        main_frame = ttk.Frame(parent, style='Menu.TFrame', padding=20)
         self.frames['main_menu'] = main_frame
-        
+
         # Title
-        title_label = ttk.Label(main_frame, text="SWIPE CHASER", style='Title.TLabel')
+        title_label = ttk.Label(main_frame, text="SWIPE CHASER", style='MenuTitle.TLabel')
         title_label.pack(pady=(30, 50))
         self.labels['title'] = title_label
-        
+
         # Buttons container
         button_frame = ttk.Frame(main_frame, style='Menu.TFrame')
         button_frame.pack(pady=10)
-        
+
         # Create styled buttons
         start_button = ttk.Button(button_frame, text="START GAME", style='Gold.TButton',
                                 command=start_callback, width=20)
         start_button.pack(pady=10)
         self.buttons['start'] = start_button
-        
-        settings_button = ttk.Button(button_frame, text="SETTINGS", style='TButton',
-                                    command=settings_callback, width=20)
-        settings_button.pack(pady=10)
-        self.buttons['settings'] = settings_button
-        
+
+        if settings_callback:
+            settings_button = ttk.Button(button_frame, text="SETTINGS", style='TButton',
+                                        command=settings_callback, width=20)
+            settings_button.pack(pady=10)
+            self.buttons['settings'] = settings_button
+
         exit_button = ttk.Button(button_frame, text="EXIT", style='TButton',
-                                command=exit_callback, width=20)
+                                command=exit_callback or self.root.quit, width=20)
         exit_button.pack(pady=10)
         self.buttons['exit'] = exit_button
-        
+
         # Version info
-        version_label = ttk.Label(main_frame, text="v1.0.0", style='TLabel')
+        version_label = ttk.Label(main_frame, text="v1.0.0", style='Menu.TLabel')
         version_label.pack(side=tk.BOTTOM, pady=10)
         self.labels['version'] = version_label
-        
+
         return main_frame
-    
-    def create_settings_menu(self, back_callback, save_callback):
+
+    def create_settings_menu(self, parent, back_callback, save_callback):
         """Create a settings menu"""
-        # Clear any existing UI
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
         # Create settings frame
-        settings_frame = ttk.Frame(self.root, style='Menu.TFrame')
-        settings_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        settings_frame = ttk.Frame(parent, style='Menu.TFrame', padding=20)
         self.frames['settings_menu'] = settings_frame
-        
+
         # Title
-        title_label = ttk.Label(settings_frame, text="SETTINGS", style='Title.TLabel')
+        title_label = ttk.Label(settings_frame, text="SETTINGS", style='MenuTitle.TLabel')
         title_label.pack(pady=(30, 50))
-        
+
         # Settings container
         options_frame = ttk.Frame(settings_frame, style='Menu.TFrame')
         options_frame.pack(pady=10, fill=tk.X)
-        
+
         # Example settings
-        difficulty_label = ttk.Label(options_frame, text="Difficulty:", style='TLabel')
+        difficulty_label = ttk.Label(options_frame, text="Difficulty:", style='Menu.TLabel')
         difficulty_label.grid(row=0, column=0, padx=10, pady=10, sticky=tk.W)
-        
+
         difficulty_var = tk.StringVar(value="Medium")
-        difficulty_combo = ttk.Combobox(options_frame, textvariable=difficulty_var, 
+        difficulty_combo = ttk.Combobox(options_frame, textvariable=difficulty_var,
                                       values=["Easy", "Medium", "Hard"], state="readonly", width=15)
         difficulty_combo.grid(row=0, column=1, padx=10, pady=10, sticky=tk.W)
-        
-        sound_label = ttk.Label(options_frame, text="Sound:", style='TLabel')
+
+        sound_label = ttk.Label(options_frame, text="Sound:", style='Menu.TLabel')
         sound_label.grid(row=1, column=0, padx=10, pady=10, sticky=tk.W)
-        
+
         sound_var = tk.BooleanVar(value=True)
         sound_check = ttk.Checkbutton(options_frame, variable=sound_var)
         sound_check.grid(row=1, column=1, padx=10, pady=10, sticky=tk.W)
-        
+
         # Buttons
         button_frame = ttk.Frame(settings_frame, style='Menu.TFrame')
         button_frame.pack(pady=30)
-        
+
         save_button = ttk.Button(button_frame, text="SAVE", style='Gold.TButton',
                                command=lambda: save_callback(difficulty_var.get(), sound_var.get()), width=15)
         save_button.pack(side=tk.LEFT, padx=10)
-        
+
         back_button = ttk.Button(button_frame, text="BACK", style='TButton',
                                command=back_callback, width=15)
         back_button.pack(side=tk.LEFT, padx=10)
-        
+
         return settings_frame
-    
-    def create_game_over_screen(self, score, restart_callback, menu_callback):
-        """Create a game over screen"""
+
+    def create_game_screen(self, parent, width=400, height=600):
+        """
+        Create the game screen around a single canvas
+
+        Returns:
+            tuple: (frame, canvas)
+        """
+        game_frame = ttk.Frame(parent, style='Game.TFrame')
+        self.frames['game'] = game_frame
+
+        canvas = tk.Canvas(game_frame, width=width, height=height, bg='#121212', highlightthickness=0)
+        canvas.pack()
+        return game_frame, canvas
+
+    def create_game_over_screen(self, parent, restart_callback, menu_callback):
+        """Create a game over overlay (update the score with set_game_over_score)"""
         # Create overlay frame
-        overlay_frame = ttk.Frame(self.root, style='Menu.TFrame')
-        overlay_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER, 
-                          relwidth=0.8, relheight=0.6)
+        overlay_frame = ttk.Frame(parent, style='Menu.TFrame')
         self.frames['game_over'] = overlay_frame
-        
+
         # Game over text
-        game_over_label = ttk.Label(overlay_frame, text="GAME OVER", style='Title.TLabel')
+        game_over_label = ttk.Label(overlay_frame, text="GAME OVER", style='MenuTitle.TLabel')
         game_over_label.pack(pady=(30, 20))
-        
+
         # Score
-        score_label = ttk.Label(overlay_frame, text=f"Score: {score}", style='TLabel',
+        score_label = ttk.Label(overlay_frame, text="Score: 0", style='Menu.TLabel',
                               font=('Arial', 18))
         score_label.pack(pady=20)
-        
+        self.labels['game_over_score'] = score_label
+
         # Buttons
         button_frame = ttk.Frame(overlay_frame, style='Menu.TFrame')
         button_frame.pack(pady=30)
-        
+
         restart_button = ttk.Button(button_frame, text="PLAY AGAIN", style='Gold.TButton',
                                   command=restart_callback, width=15)
         restart_button.pack(side=tk.LEFT, padx=10)
-        
+
         menu_button = ttk.Button(button_frame, text="MAIN MENU", style='TButton',
                                command=menu_callback, width=15)
         menu_button.pack(side=tk.LEFT, padx=10)
-        
+
         return overlay_frame
-    
-    def create_pause_menu(self, resume_callback, menu_callback):
-        """Create a pause menu"""
+
+    def set_game_over_score(self, score):
+        """Update the score shown on the game over overlay"""
+        self.labels['game_over_score'].config(text=f"Score: {score}")
+
+    def create_pause_menu(self, parent, resume_callback, menu_callback):
+        """Create a pause menu overlay"""
         # Create overlay frame
-        overlay_frame = ttk.Frame(self.root, style='Menu.TFrame')
-        overlay_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER, 
-                          relwidth=0.8, relheight=0.6)
+        overlay_frame = ttk.Frame(parent, style='Menu.TFrame')
         self.frames['pause'] = overlay_frame
-        
+
         # Pause text
-        pause_label = ttk.Label(overlay_frame, text="PAUSED", style='Title.TLabel')
+        pause_label = ttk.Label(overlay_frame, text="PAUSED", style='MenuTitle.TLabel')
         pause_label.pack(pady=(30, 50))
-        
+
         # Buttons
         button_frame = ttk.Frame(overlay_frame, style='Menu.TFrame')
         button_frame.pack(pady=10)
-        
+
         resume_button = ttk.Button(button_frame, text="RESUME", style='Gold.TButton',
                                  command=resume_callback, width=15)
         resume_button.pack(pady=10)
-        
+
         menu_button = ttk.Button(button_frame, text="MAIN MENU", style='TButton',
                                command=menu_callback, width=15)
         menu_button.pack(pady=10)
-        
+
         return overlay_frame
-    
-    def create_countdown(self, parent, callback):
-        """Create a countdown animation before game starts"""
+
+    def create_countdown(self, parent):
+        """Create the countdown screen (drive it through labels['countdown'])"""
         countdown_frame = ttk.Frame(parent, style='Game.TFrame')
-        countdown_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
         self.frames['countdown'] = countdown_frame
-        
-        countdown_label = ttk.Label(countdown_frame, text="3", style='Title.TLabel',
-                                  font=('Arial', 48, 'bold'))
-        countdown_label.pack()
-        
-        def update_countdown(count):
-            if count > 0:
-                countdown_label.config(text=str(count))
-                self.root.after(1000, update_countdown, count-1)
-            else:
-                countdown_label.config(text="GO!")
-                self.root.after(500, countdown_frame.destroy)
-                self.root.after(500, callback)
-        
-        update_countdown(3)
+
+        countdown_label = ttk.Label(countdown_frame, text="3", style='Countdown.TLabel')
+        countdown_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        self.labels['countdown'] = countdown_label
+
         return countdown_frame
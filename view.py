@@ -1,10 +1,12 @@
 import tkinter as tk
 import os
-import math
 import random
 import time
 import traceback
 
+from render_backend import RenderBackend
+from quality import QualityController
+
 LANE_X = [100, 200, 300]
 PLAYER_Y = 500
 
@@ -17,8 +19,10 @@ PLAYER_COLOR = '#FFD700'  # Gold player
 COIN_COLOR = '#FFD700'  # Gold coins
 OBSTACLE_COLOR = '#FF4444'  # Red obstacles
 
-class GameView:
-    def __init__(self, root, canvas=None):
+class GameView(RenderBackend):
+    """Tk canvas implementation of the render backend"""
+
+    def __init__(self, root, canvas=None, quality=None):
         self.root = root
         
         # Use provided canvas or create a new one
@@ -48,8 +52,13 @@ class GameView:
         self.difficulty_indicator_bg = self.canvas.create_rectangle(100, 270, 300, 330, fill='#333333', outline='#FFD700', width=2, state='hidden')
         self.difficulty_indicator_text = self.canvas.create_text(200, 300, text="", fill='#FFD700', font=("Arial", 24, "bold"), state='hidden')
         
-        # Track current difficulty level to detect changes
-        self.current_difficulty = "Easy"
+        # Track current difficulty level to detect changes (None until the first game frame)
+        self.current_difficulty = None
+        
+        # Lane the player was last drawn in, and when (perf_counter) Tk
+        # redrew the canvas with that frame - used to measure input latency
+        self.last_drawn_player_lane = None
+        self.player_drawn_time = None
         
         # Game state text (start, game over) - centered in the canvas
         center_x = 400 / 2  # Canvas width / 2
@@ -71,7 +80,23 @@ class GameView:
             text="", fill=UI_TEXT_COLOR, font=("Arial", 14),
             width=250, justify=tk.CENTER)  # Center-aligned text
         
-
+        # Adaptive render quality, shown in the bottom-left corner while below the top tier
+        self.quality = quality or QualityController()
+        self.quality_text = self.canvas.create_text(
+            10, 590, anchor=tk.W,
+            text=self._quality_label(), fill='#555555', font=("Arial", 9))
+        # perf_counter time the frame being drawn started, until Tk has redrawn it
+        self.frame_start = None
+        self.frame_player_lane = None
+        
+        # Items that survive the per-frame clear
+        self.persistent_items = {
+            self.score_bg, self.score_text,
+            self.difficulty_bg, self.difficulty_text,
+            self.difficulty_indicator_bg, self.difficulty_indicator_text,
+            self.state_bg, self.state_text, self.instructions_text,
+            self.quality_text
+        }
     
     def draw(self, model):
         """Draw the game state (legacy method)"""
@@ -79,7 +104,7 @@ class GameView:
         try:
             # Clear canvas except for persistent UI elements
             for item in self.canvas.find_all():
-                if item not in [self.score_bg, self.score_text, self.state_bg, self.state_text, self.instructions_text]:
+                if item not in self.persistent_items:
                     self.canvas.delete(item)
         except tk.TclError:
             # Canvas has been destroyed, nothing to draw
@@ -117,7 +142,8 @@ class GameView:
             # Check if difficulty level has changed
             if difficulty_level != self.current_difficulty:
                 # Show notification of difficulty change
-                self._show_difficulty_change_notification(self.current_difficulty, difficulty_level)
+                if self.current_difficulty is not None:
+                    self._show_difficulty_change_notification(self.current_difficulty, difficulty_level)
                 # Update current difficulty
                 self.current_difficulty = difficulty_level
             
@@ -138,84 +164,75 @@ class GameView:
         
     def draw_game_screen(self, model):
         """Public method to draw the game screen"""
+        frame_start = time.perf_counter()
+        
         try:
             # Clear canvas except for persistent UI elements
             for item in self.canvas.find_all():
-                if item not in [self.score_bg, self.score_text, self.state_bg, self.state_text, self.instructions_text]:
+                if item not in self.persistent_items:
                     self.canvas.delete(item)
         except tk.TclError:
             # Canvas has been destroyed
             return
-                
-        # Draw lanes
-        for x in LANE_X:
-            self.canvas.create_line(x, 0, x, 600, fill=LANE_COLOR, width=2)
-            
-        # Draw player
-        player_x = LANE_X[model.player_lane]
-        player_y = PLAYER_Y
         
-        # Draw player as a rectangle with details
-        self.canvas.create_rectangle(
-            player_x - 20, player_y - 20,
-            player_x + 20, player_y + 20,
-            fill=PLAYER_COLOR, outline='#B8860B', width=2)
-        
-        # Add player details
-        self.canvas.create_rectangle(
-            player_x - 10, player_y - 15,
-            player_x + 10, player_y - 5,
-            fill='#B8860B')  # Face
-        self.canvas.create_rectangle(
-            player_x - 5, player_y - 5,
-            player_x + 5, player_y + 10,
-            fill='#B8860B')  # Body
-        
-        # Add player shadow
-        shadow_offset = 5
-        self.canvas.create_oval(
-            player_x - 20, player_y + 20 - shadow_offset,
-            player_x + 20, player_y + 30 - shadow_offset,
-            fill='#000000', outline='', stipple='gray50')
-            
-        # Draw obstacles
-        for obs_id, lane, y in model.obstacles:
-            obstacle_x = LANE_X[lane]
-            
-            # Draw obstacle as a rectangle with details
-            self.canvas.create_rectangle(
-                obstacle_x - 20, y - 20,
-                obstacle_x + 20, y + 20,
-                fill=OBSTACLE_COLOR, outline='#8B0000', width=2)
-            
-            # Add X details to obstacle
-            self.canvas.create_line(
-                obstacle_x - 15, y - 15,
-                obstacle_x + 15, y + 15,
-                fill='#FFFFFF', width=2)
-            self.canvas.create_line(
-                obstacle_x + 15, y - 15,
-                obstacle_x - 15, y + 15,
-                fill='#FFFFFF', width=2)
-            
-        # Draw coins
-        for coin_id, lane, y in model.coins:
-            x = LANE_X[lane]
-            # Draw coin as a circle with details
-            self.canvas.create_oval(x-12, y-12, x+12, y+12, fill=COIN_COLOR, outline='#B8860B', width=2)
-            # Add dollar sign
-            self.canvas.create_text(x, y, text="$", fill='#B8860B', font=("Arial", 10, "bold"))
+        self._draw_game_screen(model)
             
         # Update score and make sure it's on top
         self.canvas.itemconfig(self.score_text, text=f'Score: {model.score}')
         self.canvas.tag_raise(self.score_bg)
         self.canvas.tag_raise(self.score_text)
         
+        # Update difficulty indicator (a tick 0 frame, e.g. the countdown's
+        # first frame, starts a game: show its level without announcing it)
+        if model.tick == 0:
+            self.reset_hud()
+        difficulty_level = self._get_difficulty_level(model.difficulty_params)
+        if difficulty_level != self.current_difficulty:
+            self.canvas.itemconfig(self.difficulty_text, text=f'Difficulty: {difficulty_level}')
+            # Only announce changes during a game, not the starting level
+            if self.current_difficulty is not None:
+                self._show_difficulty_change_notification(self.current_difficulty, difficulty_level)
+            self.current_difficulty = difficulty_level
+        self.canvas.tag_raise(self.difficulty_bg)
+        self.canvas.tag_raise(self.difficulty_text)
+        self.canvas.tag_raise(self.quality_text)
+        
         # Hide instructions during gameplay
         self.canvas.itemconfig(self.state_bg, state='hidden')
         self.canvas.itemconfig(self.state_text, text="")
         self.canvas.itemconfig(self.instructions_text, text="")
         
+        # Finish timing once Tk has redrawn the canvas: its redraw is an idle
+        # callback queued by the first item change, so it runs before ours
+        if self.frame_start is None:
+            self.canvas.after_idle(self._frame_drawn)
+        self.frame_start = frame_start
+        self.frame_player_lane = model.player_lane
+    
+    def reset_hud(self):
+        """Forget the last game's difficulty so a new game doesn't announce a change"""
+        self.current_difficulty = None
+    
+    def _frame_drawn(self):
+        """Record the time of a frame that has reached the screen"""
+        now = time.perf_counter()
+        frame_start, self.frame_start = self.frame_start, None
+        if self.frame_player_lane != self.last_drawn_player_lane:
+            self.last_drawn_player_lane = self.frame_player_lane
+            self.player_drawn_time = now
+        try:
+            if self.quality.record_frame(now - frame_start):
+                self.canvas.itemconfig(self.quality_text, text=self._quality_label())
+        except tk.TclError:
+            # Canvas has been destroyed
+            pass
+    
+    def _quality_label(self):
+        """HUD text for the quality tier (empty at the top tier)"""
+        if self.quality.tier_index == len(self.quality.tiers) - 1:
+            return ""
+        return f"Quality: {self.quality.tier.name}"
+        
     def draw_game_over_screen(self, score):
         """Public method to draw the game over screen"""
         try:
@@ -241,27 +258,6 @@ class GameView:
         
         # No animations on the start screen
     
-    def _get_difficulty_level(self, difficulty_params):
-        """Convert difficulty parameters to a human-readable level"""
-        # Calculate overall difficulty based on speed and pattern complexity
-        speed = difficulty_params.get('speed', 5.0)
-        complexity = difficulty_params.get('pattern_complexity', 1.0)
-        
-        # Calculate a difficulty score (0-100)
-        difficulty_score = ((speed - 3) / 7) * 50 + ((complexity - 1) / 2) * 50
-        
-        # Convert to text
-        if difficulty_score < 20:
-            return "Novice"
-        elif difficulty_score < 40:
-            return "Easy"
-        elif difficulty_score < 60:
-            return "Medium"
-        elif difficulty_score < 80:
-            return "Hard"
-        else:
-            return "Expert"
-    
     def _show_difficulty_change_notification(self, old_level, new_level):
         """Show a simple difficulty level indicator"""
         try:
@@ -371,35 +367,13 @@ class GameView:
         # We don't need to display the score again as it's already in the instructions text
     
     def _draw_game_screen(self, model):
-        """Draw the main game screen with enhanced visuals"""
-        # Draw background with gradient effect
-        for y in range(0, 600, 4):
-            # Calculate gradient color (darker at bottom)
-            color_val = max(18, int(36 - (y / 600) * 18))
-            color = f'#{color_val:02x}{color_val:02x}{color_val:02x}'
-            self.canvas.create_rectangle(0, y, 400, y+4, fill=color, outline='')
+        """Draw lanes, player, obstacles and coins at the current quality tier"""
+        tier = self.quality.tier
         
-        # Draw lanes with perspective effect (narrower at top)
+        # Draw lanes
         for x in LANE_X:
-            # Draw lane segments with perspective
-            for y in range(0, 600, 30):
-                # Calculate width based on y position (perspective)
-                width_factor = 0.5 + (y / 600) * 0.5
-                lane_width = 60 * width_factor
-                
-                self.canvas.create_rectangle(
-                    x - lane_width/2, y, 
-                    x + lane_width/2, y + 30, 
-                    fill=LANE_COLOR, outline='')
-                
-                # Add lane markers
-                if y % 120 == 0:
-                    marker_width = 10 * width_factor
-                    self.canvas.create_rectangle(
-                        x - marker_width/2, y + 10, 
-                        x + marker_width/2, y + 20, 
-                        fill='#555555', outline='')
-        
+            self.canvas.create_line(x, 0, x, 600, fill=LANE_COLOR, width=2)
+            
         # Draw player
         player_x = LANE_X[model.player_lane]
         player_y = PLAYER_Y
@@ -410,25 +384,27 @@ class GameView:
             player_x + 20, player_y + 20,
             fill=PLAYER_COLOR, outline='#B8860B', width=2)
         
-        # Add player details
-        self.canvas.create_rectangle(
-            player_x - 10, player_y - 15,
-            player_x + 10, player_y - 5,
-            fill='#B8860B')  # Face
-        self.canvas.create_rectangle(
-            player_x - 5, player_y - 5,
-            player_x + 5, player_y + 10,
-            fill='#B8860B')  # Body
+        if tier.player_detail:
+            # Add player details
+            self.canvas.create_rectangle(
+                player_x - 10, player_y - 15,
+                player_x + 10, player_y - 5,
+                fill='#B8860B')  # Face
+            self.canvas.create_rectangle(
+                player_x - 5, player_y - 5,
+                player_x + 5, player_y + 10,
+                fill='#B8860B')  # Body
         
-        # Add player shadow
-        shadow_offset = 5
-        self.canvas.create_oval(
-            player_x - 20, player_y + 20 - shadow_offset,
-            player_x + 20, player_y + 30 - shadow_offset,
-            fill='#000000', outline='', stipple='gray50')
+        if tier.shadows:
+            # Add player shadow
+            shadow_offset = 5
+            self.canvas.create_oval(
+                player_x - 20, player_y + 20 - shadow_offset,
+                player_x + 20, player_y + 30 - shadow_offset,
+                fill='#000000', outline='', stipple='gray50')
             
         # Draw obstacles
-        for lane, y in model.obstacles:
+        for obs_id, lane, y in model.obstacles:
             obstacle_x = LANE_X[lane]
             
             # Draw obstacle as a rectangle with details
@@ -437,48 +413,22 @@ class GameView:
                 obstacle_x + 20, y + 20,
                 fill=OBSTACLE_COLOR, outline='#8B0000', width=2)
             
-            # Add X details to obstacle
-            self.canvas.create_line(
-                obstacle_x - 15, y - 15,
-                obstacle_x + 15, y + 15,
-                fill='#8B0000', width=3)
-            self.canvas.create_line(
-                obstacle_x - 15, y + 15,
-                obstacle_x + 15, y - 15,
-                fill='#8B0000', width=3)
-            
-            # Add obstacle shadow
-            self.canvas.create_oval(
-                obstacle_x - 20, y + 20,
-                obstacle_x + 20, y + 30,
-                fill='#000000', outline='', stipple='gray50')
-                
-        # Draw coins with animation
-        for lane, y in model.coins:
-            coin_x = LANE_X[lane]
-            
-            # Calculate coin animation (bobbing and rotating)
-            current_time = time.time() - self.animation_timer
-            bob_offset = 3 * math.sin(current_time * 5 + coin_x * 0.1)
-            
-            # Draw coin
-            coin_radius = 15
-            self.canvas.create_oval(
-                coin_x - coin_radius, (y + bob_offset) - coin_radius,
-                coin_x + coin_radius, (y + bob_offset) + coin_radius,
-                fill=COIN_COLOR, outline='#B8860B', width=2)
+            if tier.obstacle_marks:
+                # Add X details to obstacle
+                self.canvas.create_line(
+                    obstacle_x - 15, y - 15,
+                    obstacle_x + 15, y + 15,
+                    fill='#FFFFFF', width=2)
+                self.canvas.create_line(
+                    obstacle_x + 15, y - 15,
+                    obstacle_x - 15, y + 15,
+                    fill='#FFFFFF', width=2)
             
-            # Inner detail to give 3D effect
-            self.canvas.create_oval(
-                coin_x - coin_radius*0.7, (y + bob_offset) - coin_radius*0.7,
-                coin_x + coin_radius*0.7, (y + bob_offset) + coin_radius*0.7,
-                fill='#F0C000', outline='')
-            
-            # Add coin glow effect
-            glow_size = 5 + 2 * math.sin(current_time * 10 + coin_x * 0.1)
-            self.canvas.create_oval(
-                coin_x - 15 - glow_size, y - 15 - glow_size + bob_offset,
-                coin_x + 15 + glow_size, y + 15 + glow_size + bob_offset,
-                fill='', outline='#FFD700', stipple='gray25')
-    
-
+        # Draw coins
+        for coin_id, lane, y in model.coins:
+            x = LANE_X[lane]
+            # Draw coin as a circle with details
+            self.canvas.create_oval(x-12, y-12, x+12, y+12, fill=COIN_COLOR, outline='#B8860B', width=2)
+            if tier.coin_labels:
+                # Add dollar sign
+                self.canvas.create_text(x, y, text="$", fill='#B8860B', font=("Arial", 10, "bold"))